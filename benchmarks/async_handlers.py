@@ -0,0 +1,104 @@
+''' Benchmark of concurrent I/O-bound requests handled by one worker
+    with WSGI (like a Gunicorn sync worker, one request at a time) and
+    with the ASGI mode of the Application
+
+    Handlers wait on simulated I/O (like a MongoDB query) with `time.sleep()`
+    or `asyncio.sleep()`. Run from the root directory with:
+    ```sh
+    python -m benchmarks.async_handlers
+    ```
+'''
+
+import asyncio
+import logging
+import time
+
+from src.flongo_framework.application import Application
+from src.flongo_framework.api.routing import App_Routes, Route, Route_Handler, Route_Schema
+from src.flongo_framework.api.responses import API_JSON_Response
+from src.flongo_framework.config.settings import App_Settings, Flask_Settings
+
+IO_SECONDS = 0.02
+REQUESTS = 500
+CONCURRENCY = 100
+
+REQUEST_SCHEMA = Route_Schema(GET={'type': 'object', 'properties': {'page': {'type': 'integer'}}})
+
+
+def sync_handler(request):
+    time.sleep(IO_SECONDS)
+    return API_JSON_Response({'page': request.payload.get('page')})
+
+
+async def async_handler(request):
+    await asyncio.sleep(IO_SECONDS)
+    return API_JSON_Response({'page': request.payload.get('page')})
+
+
+def create_application(asgi_max_threads:int) -> Application:
+    routes = App_Routes(
+        Route(url='/sync', handler=Route_Handler(GET=sync_handler), request_schema=REQUEST_SCHEMA),
+        Route(url='/async', handler=Route_Handler(GET=async_handler), request_schema=REQUEST_SCHEMA),
+    )
+
+    return Application(routes, App_Settings(flask=Flask_Settings(
+        env='benchmark',
+        debug_mode=False,
+        log_boot_events=False,
+        asgi_max_threads=asgi_max_threads
+    )))
+
+
+def benchmark_wsgi(application:Application, url:str) -> float:
+    ''' Handle requests one at a time like a sync worker and return requests per second '''
+
+    client = application.app.test_client()
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        assert client.get(f'{url}?page={i}').status_code == 200
+
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def _asgi_request(asgi_app, url:str, page:int) -> int:
+    messages = []
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app({
+        'type': 'http', 'method': 'GET', 'path': url, 'query_string': f'page={page}'.encode(),
+        'headers': [(b'host', b'localhost')], 'http_version': '1.1', 'scheme': 'http', 'server': ('localhost', 80)
+    }, receive, send)
+
+    return messages[0]['status']
+
+
+async def _benchmark_asgi(application:Application, url:str) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    async def request(page:int):
+        async with semaphore:
+            assert await _asgi_request(application.asgi_app, url, page) == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(REQUESTS)))
+
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def benchmark_asgi(application:Application, url:str) -> float:
+    ''' Handle requests with `CONCURRENCY` in flight and return requests per second '''
+
+    return asyncio.run(_benchmark_asgi(application, url))
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    print(f"{REQUESTS} requests waiting on {IO_SECONDS * 1000:.0f}ms of I/O, {CONCURRENCY} concurrent in ASGI mode\n")
+
+    application = create_application(asgi_max_threads=CONCURRENCY)
+    for name, url in (("sync handler", "/sync"), ("async handler", "/async")):
+        wsgi = benchmark_wsgi(application, url)
+        asgi = benchmark_asgi(application, url)
+        print(f"{name:<15} WSGI sync worker: {wsgi:8.1f} req/s   ASGI: {asgi:8.1f} req/s   ({asgi / wsgi:5.1f}x)")
@@ -0,0 +1,64 @@
+''' Benchmark comparing JSON encoding of MongoDB documents with the
+    legacy `json.dumps(cls=JSON_Encoder)`, the standard library JSON_Engine
+    and the JSON_Engine with `orjson` (if it is installed)
+
+    Run from the root directory with:
+    ```sh
+    python -m benchmarks.json_encoding
+    ```
+'''
+
+import json
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from bson import ObjectId
+
+from src.flongo_framework.utils.json import JSON_Encoder, JSON_Engine
+
+
+def create_documents(count:int) -> list[dict]:
+    ''' Create `count` documents like the ones returned by a MongoDB find() '''
+
+    created = datetime(2023, 1, 1, 12, 30)
+    return [
+        {
+            '_id': ObjectId(),
+            'name': f'Document {i}',
+            'price': Decimal(f'{i}.99'),
+            'quantity': i,
+            'active': i % 2 == 0,
+            'created': created + timedelta(minutes=i),
+            'tags': ['one', 'two', 'three'],
+            'owner': {'_id': ObjectId(), 'email': f'user{i}@example.com', 'roles': ['user']},
+        }
+        for i in range(count)
+    ]
+
+
+def benchmark(name:str, documents:list[dict], number:int):
+    encoders = {
+        'json_encoder': lambda: json.dumps(documents, cls=JSON_Encoder).encode(),
+        'stdlib': lambda: JSON_Engine.stdlib_dumps(documents).encode(),
+    }
+    if JSON_Engine.NAME != 'json':
+        encoders[JSON_Engine.NAME] = lambda: JSON_Engine.dumpb(documents)
+
+    results = {
+        encoder_name: min(timeit.repeat(encoder, number=number, repeat=5)) / number * 1000
+        for encoder_name, encoder in encoders.items()
+    }
+
+    baseline = results['json_encoder']
+    timings = "   ".join(f"{encoder_name}: {ms:8.2f}ms ({baseline / ms:4.1f}x)" for encoder_name, ms in results.items())
+    print(f"{name:<22} {timings}")
+
+
+if __name__ == '__main__':
+    if JSON_Engine.NAME == 'json':
+        print("orjson is not installed, only the standard library engine will be benchmarked")
+
+    benchmark("100 documents", create_documents(100), 200)
+    benchmark("10,000 documents", create_documents(10000), 5)
+    benchmark("100,000 documents", create_documents(100000), 1)
@@ -0,0 +1,93 @@
+''' Benchmark comparing the `jsonschema` and `compiled` schema validation engines
+
+    Run from the root directory with:
+    ```sh
+    python -m benchmarks.schema_validation
+    ```
+'''
+
+import timeit
+
+from src.flongo_framework.utils.requests import JSON_Schema_Validator, Compiled_JSON_Schema_Validator
+
+# Schemas used by the demo application
+DEMO_REQUEST_SCHEMA = {
+    'type': 'object',
+    'additionalProperties': False,
+    'properties': {
+        '_id': {'type': 'integer'}
+    },
+    'required': ['_id']
+}
+
+DEMO_RESPONSE_SCHEMA = {
+    'type': 'object',
+    'additionalProperties': False,
+    'properties': {
+        'payload': {'type': 'object'}
+    },
+    'required': ['payload']
+}
+
+
+def create_large_schema(field_count:int=200) -> dict:
+    ''' Create a schema for a POST body with `field_count` mixed fields '''
+
+    properties = {}
+    for i in range(field_count):
+        if i % 4 == 0:
+            properties[f'string_{i}'] = {'type': 'string', 'minLength': 1, 'maxLength': 64}
+        elif i % 4 == 1:
+            properties[f'integer_{i}'] = {'type': 'integer', 'minimum': 0, 'maximum': 1000000}
+        elif i % 4 == 2:
+            properties[f'tags_{i}'] = {'type': 'array', 'items': {'type': 'string'}, 'maxItems': 10}
+        else:
+            properties[f'object_{i}'] = {
+                'type': 'object',
+                'additionalProperties': False,
+                'properties': {'enabled': {'type': 'boolean'}, 'kind': {'enum': ['a', 'b', 'c']}},
+                'required': ['enabled']
+            }
+
+    return {
+        'type': 'object',
+        'additionalProperties': False,
+        'properties': properties,
+        'required': list(properties)
+    }
+
+
+def create_large_payload(schema:dict) -> dict:
+    ''' Create a payload that is valid for a schema from `create_large_schema()` '''
+
+    payload = {}
+    for field in schema['properties']:
+        if field.startswith('string'):
+            payload[field] = 'value'
+        elif field.startswith('integer'):
+            payload[field] = 42
+        elif field.startswith('tags'):
+            payload[field] = ['one', 'two', 'three']
+        else:
+            payload[field] = {'enabled': True, 'kind': 'b'}
+
+    return payload
+
+
+def benchmark(name:str, schema:dict, payload:dict, number:int):
+    results = {}
+    for validator_class in (JSON_Schema_Validator, Compiled_JSON_Schema_Validator):
+        validator = validator_class(schema, '/benchmark', 'POST')
+        seconds = min(timeit.repeat(lambda: validator.validate_request(payload), number=number, repeat=5))
+        results[validator_class.__name__] = seconds / number * 1_000_000
+
+    baseline, compiled = results.values()
+    print(f"{name:<28} jsonschema: {baseline:9.2f}us   compiled: {compiled:9.2f}us   speedup: {baseline / compiled:6.1f}x")
+
+
+if __name__ == '__main__':
+    large_schema = create_large_schema()
+
+    benchmark("Demo request schema", DEMO_REQUEST_SCHEMA, {'_id': 1}, 20000)
+    benchmark("Demo response schema", DEMO_RESPONSE_SCHEMA, {'payload': {'a': 1}}, 20000)
+    benchmark("Synthetic 200 field schema", large_schema, create_large_payload(large_schema), 500)
@@ -6,9 +6,9 @@ export PYTHONPATH=$PYTHONPATH:/app
 
 # Check the current environment. Sandbox or higher uses gunicorn
 if [ "$APP_ENV" = "sandbox" ] || [ "$APP_ENV" = "prod" ] || [ "$APP_ENV" = "production" ]; then
-    # Use Gunicorn for the listed environments
+    # Use Gunicorn for the listed environments. Workers are configured with the GUNICORN_* variables
     # Demo can be interchanged with any Python file name with a get_app() binding defined
-    exec gunicorn "${FLASK_APP}()" -w ${GUNICORN_WORKERS} -b ${APP_HOST}:${APP_PORT} -t ${GUNICORN_TIMEOUT}
+    exec python -m src.flongo_framework.utils.server "${FLASK_APP}"
 else
     # Use Flask's development server
     exec flask run --host=${APP_HOST} --port=${APP_PORT} --reload
@@ -11,6 +11,11 @@ setup(
     package_dir={'': 'src'},
     packages=find_packages(where='src'),
     install_requires=get_requirements(),
+    extras_require={
+        'speedups': ['orjson >= 3.8.0'],
+        'compression': ['brotli >= 1.2.0', 'zstandard >= 0.21.0'],
+        'asgi': ['motor >= 3.3.0', 'uvicorn >= 0.23.0']
+    },
     author='Peter Swanson',
     author_email='pswanson@ucdavis.edu',
     description='Flask framework with out of the box Logging, MongoDB, JWT, CORs, Sentry and Docker support',
@@ -1,2 +1,3 @@
 from .request import App_Request
 from .identity import Request_Identity
+from .uploaded_file import Uploaded_File
\ No newline at end of file
@@ -1,34 +1,137 @@
+import hashlib
+import time
 import traceback
-from typing import Any, Optional
+from contextlib import AbstractContextManager, nullcontext
+from typing import TYPE_CHECKING, Any, Optional
 from bson import ObjectId
+import pymongo
 from pymongo.collection import Collection
 from flask import Request
 
 from .identity import Request_Identity
+from .uploaded_file import Uploaded_File
 from ...api.responses.errors.api_error import API_Error
+from ...utils.json.json_engine import JSON_Engine
+from ...utils.logging.loggers.routing import RoutingLogger
+from ...utils.requests.request_data_parser import RequestDataParser
+
+if TYPE_CHECKING:
+    from ...api.routing.route_pagination import Route_Pagination
+    from ...api.routing.route_payload_limits import Route_Payload_Limits
 
 class App_Request:
     ''' Base class that wraps Flask's request and allows
         some additional data like the passed data, identity
         and MongoDB collection to be injected
+
+        The query string, body and files are only parsed
+        when they are first used
     '''
 
+    # Operations that return documents and accept a projection
+    PROJECTION_OPERATIONS = {'find', 'find_one', 'find_one_and_delete', 'find_one_and_replace', 'find_one_and_update'}
+
     def __init__(self, 
             raw_request:Request,
             identity:Optional[Request_Identity]=None,
             payload:Optional[dict]=None,
-            collection:Optional[Collection]=None
+            collection:Optional[Collection]=None,
+            stream_results:bool=False,
+            batch_size:Optional[int]=None,
+            pagination:Optional["Route_Pagination"]=None,
+            projection:Optional[dict]=None,
+            timeout_ms:Optional[int]=None,
+            logger:Optional[RoutingLogger]=None,
+            payload_limits:Optional["Route_Payload_Limits"]=None
         ) -> None:
         # Raw Flask request
         self.raw_request = raw_request
         # JWT Identity parsed from cookies if available
         self.identity = identity
-        # Data parsed from query string and request body if available
-        self.payload = payload or {}
+        # Data parsed from query string and request body. Parsed when first used
+        self._payload = payload
+        self._query:Optional[dict] = None
+        self._body:Optional[dict] = None
+        self._files:Optional[dict] = None
+        self._logger = logger
+        # Size and nesting limits the request body is checked against when it is parsed
+        self.payload_limits = payload_limits
         # MongoDB collection instance to configured collection if available
         self.collection = collection
-        # Files parsed from the raw request
-        self.files = self.raw_request.files.to_dict(flat=True) if self.raw_request.files else {}
+        # Stream MongoDB results to the client instead of loading them into memory
+        self.stream_results = stream_results
+        # Number of documents fetched from MongoDB per batch by cursors
+        self.batch_size = batch_size
+        # Keyset pagination configured for the route if available
+        self.pagination = pagination
+        # MongoDB projection of the fields to return if available
+        self.projection = projection
+        # Time (from time.monotonic()) the request must be handled by if it has a timeout
+        self.deadline = time.monotonic() + timeout_ms / 1000 if timeout_ms else None
+
+
+    @property
+    def payload(self) -> dict:
+        ''' Data parsed from the query string and request body '''
+
+        if self._payload is None:
+            self._payload = {**self.query, **self.body}
+
+        return self._payload
+
+
+    @payload.setter
+    def payload(self, payload:dict):
+        self.set_payload(payload)
+
+
+    @property
+    def query(self) -> dict:
+        ''' Data parsed from the query string '''
+
+        if self._query is None:
+            self._query = RequestDataParser.parse_query_string(self.raw_request, self._logger)
+
+        return self._query
+
+
+    @property
+    def body(self) -> dict:
+        ''' Data parsed from the request body '''
+
+        if self._body is None:
+            self._body = RequestDataParser.parse_request_body(self.raw_request, self._logger, self.payload_limits)
+
+        return self._body
+
+
+    @property
+    def files(self) -> dict:
+        ''' Files uploaded with the request '''
+
+        if self._files is None:
+            self._files = self.raw_request.files.to_dict(flat=True) if self.is_multipart else {}
+
+        return self._files
+
+
+    @property
+    def uploads(self) -> dict[str, Uploaded_File]:
+        ''' Files uploaded to a route configured with Route_Uploads '''
+
+        return {name: file.stream for name, file in self.files.items() if isinstance(file.stream, Uploaded_File)}
+
+
+    @property
+    def is_multipart(self) -> bool:
+        ''' Returns True if the request body is multipart (like a file upload) '''
+
+        return self.raw_request.mimetype.startswith('multipart/')
+
+
+    @property
+    def is_payload_parsed(self) -> bool:
+        return self._payload is not None
 
 
     def set_identity(self, identity:Request_Identity):
@@ -36,30 +139,99 @@ class App_Request:
 
 
     def set_payload(self, payload:dict):
-        self.payload = payload
+        self._payload = payload
 
 
     def set_collection(self, collection:Collection):
         self.collection = collection
 
 
-    def run_mongo_operation(self, op:str='find', search_payload:Optional[dict]=None, set_payload:bool=False, upsert:bool=False) -> Any:
+    def set_projection(self, projection:Optional[dict]):
+        self.projection = projection
+
+
+    def get_remaining_time(self) -> Optional[float]:
+        ''' Get the seconds left before the request deadline or None if it has no deadline '''
+
+        return self.deadline - time.monotonic() if self.deadline is not None else None
+
+
+    def ensure_deadline(self):
+        ''' Throw a 504 exception if the request deadline passed '''
+
+        if (remaining:=self.get_remaining_time()) is not None and remaining <= 0:
+            raise API_Error(
+                "The request took too long to handle",
+                {'url': self.raw_request.root_url, 'method': self.raw_request.method},
+                status_code=504
+            )
+
+
+    def get_deadline_context(self) -> AbstractContextManager:
+        ''' Get a context where PyMongo operations are sent with the time left
+            before the request deadline as `maxTimeMS` and time out when it passes
+            ```
+            with request.get_deadline_context():
+                request.collection.find_one(query)
+            ```
+        '''
+
+        self.ensure_deadline()
+        if (remaining:=self.get_remaining_time()) is not None:
+            return pymongo.timeout(remaining)
+
+        return nullcontext()
+
+
+    def get_request_key(self, method:str, payload:Any, include_identity:bool=False, include_roles:bool=False) -> bytes:
+        ''' Get a hash identifying the response this request should get based
+            on the method, URL path, Accept header, payload and projection
+            and optionally the identity and its roles
+        '''
+
+        identity = self.identity
+        key = JSON_Engine.stdlib_dumps([
+            method,
+            self.raw_request.path,
+            self.raw_request.headers.get('Accept', ''),
+            payload,
+            self.projection,
+            identity._id if identity and include_identity else None,
+            sorted(identity.roles) if identity and include_roles else None,
+        ], sort_keys=True)
+
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+    def run_mongo_operation(self, op:str='find', search_payload:Optional[dict]=None, set_payload:bool=False, upsert:bool=False, **kwargs) -> Any:
         ''' Runs the specified operation on the stored MongoDB collection with a passed
-            or with the stored payload 
+            or with the stored payload. Additional keyword arguments (like `sort` or 
+            `limit`) are passed to the operation. In the request handler operations
+            are sent with the time left before the request deadline as `maxTimeMS`
         '''
 
         if self.collection != None:
+            # Stop handling the request instead of starting another operation
+            self.ensure_deadline()
+
             func = getattr(self.collection, op)
             if not search_payload:
                 search_payload = self.payload
 
+            if self.projection and op in self.PROJECTION_OPERATIONS:
+                kwargs.setdefault('projection', self.projection)
+
             if set_payload:
                 if upsert:
-                    return func(search_payload, {"$set": self.payload}, upsert=upsert)
+                    return func(search_payload, {"$set": self.payload}, upsert=upsert, **kwargs)
                 else:
-                    return func(search_payload, {"$set": self.payload})
+                    return func(search_payload, {"$set": self.payload}, **kwargs)
             else:
-                return func(search_payload)
+                result = func(search_payload, **kwargs)
+                if self.batch_size and op == 'find':
+                    result.batch_size(self.batch_size)
+
+                return result
 
 
     def ensure_collection(self):
@@ -0,0 +1,184 @@
+import hashlib
+import io
+import tempfile
+from typing import Any, Callable, Optional
+
+from bson import ObjectId
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
+
+class Uploaded_File(io.IOBase):
+    ''' A file uploaded in a multipart request body. It is written
+        while the body is parsed and can be read like a file
+
+        File contents are kept in memory up to `memory_threshold` bytes
+        and are spooled to a temporary file after that. Digests (like
+        `sha256`) of the contents are computed while it is written
+
+        If a GridFS bucket is passed, files larger than `gridfs_threshold`
+        bytes are streamed into GridFS in chunks instead. `gridfs_id` is
+        the ID of the stored file once the upload is complete and reading
+        the file reads it from GridFS. Stored files are deleted when the
+        request closes unless they are kept with `keep()`, which is called
+        for requests that get a successful (2xx) response
+        ```
+        upload = request.uploads['file']
+        upload.filename, upload.size, upload.digests['sha256'], upload.gridfs_id
+        ```
+    '''
+
+    def __init__(self,
+            filename:Optional[str]=None,
+            content_type:Optional[str]=None,
+            memory_threshold:int=1024 * 1024,
+            digests:tuple[str, ...]=('sha256',),
+            get_gridfs_bucket:Optional[Callable[[], GridFSBucket]]=None,
+            gridfs_threshold:int=0
+        ) -> None:
+
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.gridfs_id:Optional[ObjectId] = None
+        self.gridfs_threshold = gridfs_threshold
+        # Stored GridFS files are deleted when the file is closed unless it is kept
+        self.kept = False
+
+        self._hashes = {name: hashlib.new(name) for name in digests}
+        self._file:Any = tempfile.SpooledTemporaryFile(max_size=memory_threshold)
+        self._get_gridfs_bucket = get_gridfs_bucket
+        self._gridfs_bucket:Optional[GridFSBucket] = None
+        self._gridfs_in:Any = None
+        self._gridfs_out:Any = None
+
+
+    @property
+    def digests(self) -> dict[str, str]:
+        ''' Hex digests of the contents written so far '''
+
+        return {name: digest.hexdigest() for name, digest in self._hashes.items()}
+
+
+    @property
+    def in_gridfs(self) -> bool:
+        return self._gridfs_in is not None or self.gridfs_id is not None
+
+
+    def keep(self):
+        ''' Keep the file stored in GridFS after the request '''
+
+        self.kept = True
+
+
+    def readable(self) -> bool:
+        return True
+
+
+    def writable(self) -> bool:
+        return True
+
+
+    def seekable(self) -> bool:
+        return True
+
+
+    def write(self, data:Any) -> int:
+        for digest in self._hashes.values():
+            digest.update(data)
+
+        self.size += len(data)
+        if self._get_gridfs_bucket and not self.in_gridfs and self.size > self.gridfs_threshold:
+            self._move_to_gridfs()
+
+        (self._gridfs_in or self._file).write(data)
+        return len(data)
+
+
+    def seek(self, offset:int, whence:int=io.SEEK_SET) -> int:
+        # Seeking back to the start finishes the upload so the file can be read
+        if self._gridfs_in is not None:
+            self._finish_gridfs_upload()
+
+        return self._get_reader().seek(offset, whence)
+
+
+    def tell(self) -> int:
+        return self.size if self._gridfs_in is not None else self._get_reader().tell()
+
+
+    def read(self, size:Optional[int]=-1) -> bytes:
+        return self._get_reader().read(-1 if size is None else size)
+
+
+    def readline(self, size:Optional[int]=-1) -> bytes:
+        return self._get_reader().readline(-1 if size is None else size)
+
+
+    def readinto(self, buffer:Any) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+    def close(self):
+        ''' Close the file. An unfinished GridFS upload or a
+            stored GridFS file that wasn't kept is deleted
+        '''
+
+        if not self.closed:
+            if self._gridfs_in is not None:
+                self._gridfs_in.abort()
+                self._gridfs_in = None
+            if self._gridfs_out is not None:
+                self._gridfs_out.close()
+            if self.gridfs_id is not None and not self.kept:
+                self._delete_gridfs_file()
+            self._file.close()
+
+        super().close()
+
+
+    def _move_to_gridfs(self):
+        ''' Stream the contents written so far into a new GridFS file
+            and write the rest of the upload straight to it
+        '''
+
+        assert self._get_gridfs_bucket
+        self._gridfs_bucket = self._get_gridfs_bucket()
+        self._gridfs_in = self._gridfs_bucket.open_upload_stream(self.filename or '')
+
+        self._file.seek(0)
+        while chunk:=self._file.read(self._gridfs_in.chunk_size):
+            self._gridfs_in.write(chunk)
+
+        self._file.close()
+        self._file = io.BytesIO()
+
+
+    def _finish_gridfs_upload(self):
+        self._gridfs_in.metadata = {'contentType': self.content_type, 'digests': self.digests}
+        self._gridfs_in.close()
+        self.gridfs_id = self._gridfs_in._id
+        self._gridfs_in = None
+
+
+    def _delete_gridfs_file(self):
+        assert self._gridfs_bucket
+        try:
+            self._gridfs_bucket.delete(self.gridfs_id)
+        # The handler may have deleted it already
+        except NoFile:
+            pass
+
+        self.gridfs_id = None
+
+
+    def _get_reader(self) -> Any:
+        if self.gridfs_id is None:
+            return self._file
+
+        if self._gridfs_out is None:
+            assert self._gridfs_bucket
+            self._gridfs_out = self._gridfs_bucket.open_download_stream(self.gridfs_id)
+
+        return self._gridfs_out
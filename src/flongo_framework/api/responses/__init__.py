@@ -1,2 +1,3 @@
 from .api_json_response import API_JSON_Response
 from .api_message_response import API_Message_Response
+from .api_stream_response import API_Stream_Response
\ No newline at end of file
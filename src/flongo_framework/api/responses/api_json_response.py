@@ -1,19 +1,60 @@
-from json import dumps
 from flask import Response
 from typing import Any
 
-from ...utils.json.json_encoder import JSON_Encoder
+from ...utils.json.json_engine import JSON_Engine
 
 class API_JSON_Response(Response):
     ''' An JSON response that can be returned from
         user defined request handling functions
 
-        If a primitive data type is passed, it will be set in 
+        If a primitive data type is passed, it will be set in
         the response JSON with the key 'data'
+
+        The data is kept as a Python object in `payload` so it can
+        be transformed and validated without re-parsing the body.
+        It is only encoded once, when the response is delivered or
+        its body is first read
     '''
 
     def __init__(self, data:Any, status_code:int=200) -> None:
         if not isinstance(data, dict):
             data = {'data': data}
 
-        super().__init__(dumps(data, cls=JSON_Encoder), status=status_code, mimetype='application/json')
+        super().__init__(status=status_code, mimetype='application/json')
+        self.set_payload(data)
+
+
+    def set_payload(self, payload:Any):
+        ''' Replace the payload. It will be encoded when the response is delivered '''
+
+        self.payload = payload
+        self._is_encoded = False
+
+
+    def encode(self) -> "API_JSON_Response":
+        ''' Encode the payload into the response body if it hasn't been yet '''
+
+        if not self._is_encoded:
+            self.set_data(JSON_Engine.dumpb(self.payload))
+
+        return self
+
+
+    def set_data(self, value:Any) -> None:
+        super().set_data(value)
+        self._is_encoded = True
+
+
+    def get_data(self, as_text:bool=False) -> Any:
+        self.encode()
+        return super().get_data(as_text)
+
+
+    def freeze(self) -> None:
+        self.encode()
+        super().freeze()
+
+
+    def get_wsgi_response(self, environ:Any) -> Any:
+        self.encode()
+        return super().get_wsgi_response(environ)
@@ -1,8 +1,7 @@
-from json import dumps
 from flask import Response
 from typing import Any
 
-from ...utils.json.json_encoder import JSON_Encoder
+from ...utils.json.json_engine import JSON_Engine
 
 
 class API_Message_Response(Response):
@@ -11,4 +10,4 @@ class API_Message_Response(Response):
     '''
 
     def __init__(self, message:Any, status_code:int=200) -> None:
-        super().__init__(dumps(message, cls=JSON_Encoder), status=status_code, mimetype='text/plain')
+        super().__init__(JSON_Engine.dumpb(message), status=status_code, mimetype='text/plain')
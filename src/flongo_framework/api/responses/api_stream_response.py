@@ -0,0 +1,121 @@
+import pymongo
+import time
+from contextlib import AbstractContextManager, nullcontext
+from flask import Response
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from ...utils.json.json_engine import JSON_Engine
+
+class API_Stream_Response(Response):
+    ''' A streamed JSON response that can be returned from
+        user defined request handling functions
+
+        Documents are read from an iterable (like a MongoDB cursor) and
+        encoded and sent to the client in chunks of `chunk_size`
+        documents, so memory use doesn't grow with the result size
+
+        Documents are sent as a JSON array under the key 'data' like
+        an API_JSON_Response, or as newline delimited JSON if `ndjson`
+        is True. The iterable is closed when the response is finished
+
+        If a `deadline` (a `time.monotonic()` timestamp) is set, each chunk
+        is read with the time left as the PyMongo timeout and the stream
+        is cut off with a TimeoutError once the deadline passes
+    '''
+
+    NDJSON_MIMETYPE = 'application/x-ndjson'
+
+    def __init__(self,
+            documents:Iterable[Any],
+            status_code:int=200,
+            ndjson:bool=False,
+            chunk_size:int=100,
+            deadline:Optional[float]=None
+        ) -> None:
+        self.documents = documents
+        self.ndjson = ndjson
+        self.chunk_size = max(chunk_size, 1)
+        self.deadline = deadline
+        self.transformers:list[Callable[[Any], Any]] = []
+
+        super().__init__(
+            self._generate(),
+            status=status_code,
+            mimetype=self.NDJSON_MIMETYPE if ndjson else 'application/json'
+        )
+
+
+    def add_transformer(self, transformer:Callable[[Any], Any]):
+        ''' Add a function that transforms each document before it is encoded '''
+
+        self.transformers.append(transformer)
+
+
+    def _encode(self, document:Any) -> bytes:
+        for transformer in self.transformers:
+            document = transformer(document)
+
+        return JSON_Engine.dumpb(document)
+
+
+    def _generate(self) -> Iterator[bytes]:
+        ''' Encode the documents and yield them in chunks '''
+
+        separator = b'\n' if self.ndjson else b','
+        chunk = [] if self.ndjson else [b'{"data":[']
+        documents = iter(self.documents)
+        count = 0
+        try:
+            while True:
+                # Cursors fetch their next batches while reading a chunk
+                read = 0
+                with self._get_deadline_context():
+                    for document in islice(documents, self.chunk_size):
+                        if count and not self.ndjson:
+                            chunk.append(separator)
+                        chunk.append(self._encode(document))
+                        if self.ndjson:
+                            chunk.append(separator)
+                        count += 1
+                        read += 1
+
+                # The documents ran out before the chunk was filled
+                if read < self.chunk_size:
+                    break
+
+                yield b''.join(chunk)
+                chunk = []
+
+            if not self.ndjson:
+                chunk.append(b']}')
+            if chunk:
+                yield b''.join(chunk)
+        finally:
+            self._close_documents()
+
+
+    def _get_deadline_context(self) -> AbstractContextManager:
+        if self.deadline is None:
+            return nullcontext()
+
+        if (remaining:=self.deadline - time.monotonic()) <= 0:
+            raise TimeoutError("The deadline of the streamed response passed")
+
+        return pymongo.timeout(remaining)
+
+
+    def _close_documents(self):
+        if close:=getattr(self.documents, 'close', None):
+            close()
+
+
+    @classmethod
+    def accepts_ndjson(cls, accept_mimetypes:Optional[Any]) -> bool:
+        ''' Returns True if a request's Accept header prefers NDJSON to JSON '''
+
+        if not accept_mimetypes:
+            return False
+
+        # JSON is listed first so it is used if the client accepts both equally
+        return accept_mimetypes.best_match(['application/json', cls.NDJSON_MIMETYPE]) == cls.NDJSON_MIMETYPE
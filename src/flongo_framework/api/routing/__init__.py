@@ -3,4 +3,12 @@ from .route import Route
 from .route_schema import Route_Schema
 from .utils.tranformers import Route_Transformer, Field_Transformer
 from .route_permissions import Route_Permissions
-from .handlers import Route_Handler, Default_Route_Handler
+from .route_pagination import Route_Pagination
+from .route_projection import Route_Projection
+from .route_cache import Route_Cache
+from .route_etag import Route_ETag
+from .route_coalescing import Route_Coalescing
+from .route_concurrency import Route_Concurrency
+from .route_payload_limits import Route_Payload_Limits
+from .route_uploads import Route_Uploads
+from .handlers import Route_Handler, Default_Route_Handler, File_Route_Handler
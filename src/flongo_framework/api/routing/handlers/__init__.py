@@ -1,2 +1,3 @@
 from .route_handler import Route_Handler
 from .default_route_handler import Default_Route_Handler
+from .file_route_handler import File_Route_Handler
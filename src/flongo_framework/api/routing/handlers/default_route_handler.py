@@ -1,8 +1,10 @@
-from typing import Callable, Optional
+from itertools import chain, islice
+from typing import Callable, Iterable, Optional
 from flask import Response
 from ....api.requests.request import App_Request
 from ....api.responses.api_json_response import API_JSON_Response
 from ....api.responses.api_message_response import API_Message_Response
+from ....api.responses.api_stream_response import API_Stream_Response
 from ....config.enums.http_methods import HTTP_METHODS
 
 from ....api.routing.handlers.route_handler import Route_Handler
@@ -13,7 +15,8 @@ class Default_Route_Handler(Route_Handler):
         methods like GET or POST but uses a default operation 
         if a custom function isn't passed.
 
-        - GET: Gets a record from the MongoDB collection specified using the payload from the request
+        - GET: Gets a record from the MongoDB collection specified using the payload from the request. Results are 
+          paginated if the route has `pagination` or streamed if the route enables `stream_results`
         - POST: Creates a record from the MongoDB collection specified using the payload from the request
         - PUT: Updates a record from the MongoDB collection specified by ID using the payload from the request. Creates it if it does not exist
         - PATCH: Updates a record from the MongoDB collection specified by ID using the payload from the request. Does not create it if it does not exist
@@ -28,6 +31,12 @@ class Default_Route_Handler(Route_Handler):
         request.ensure_collection()
         request.normalize_id(enforce=False)
 
+        if request.pagination:
+            return API_JSON_Response(request.pagination.get_page(request))
+
+        if request.stream_results:
+            return self._stream_results(request, request.run_mongo_operation())
+
         if result:=list(request.run_mongo_operation() or []):
             return API_JSON_Response(result) if len(result) > 1 else API_JSON_Response(result[0])
         else:
@@ -106,6 +115,37 @@ class Default_Route_Handler(Route_Handler):
             return API_JSON_Response({}, 404)
         
 
+    def _stream_results(self, request:App_Request, cursor:Optional[Iterable]) -> Response:
+        ''' Stream the documents from a cursor to the client as a JSON array
+            or as NDJSON if the client accepts it. The first two documents are
+            read so single and missing records are returned like a normal GET
+        '''
+
+        # Limit the server time of the batches read after the request deadline context ends
+        if (remaining:=request.get_remaining_time()) is not None and (max_time_ms:=getattr(cursor, 'max_time_ms', None)):
+            max_time_ms(max(int(remaining * 1000), 1))
+
+        ndjson = API_Stream_Response.accepts_ndjson(request.raw_request.accept_mimetypes)
+        documents = iter(cursor or [])
+        first_documents = list(islice(documents, 2))
+
+        if not first_documents:
+            return API_JSON_Response([], 404)
+        if len(first_documents) == 1 and not ndjson:
+            return API_JSON_Response(first_documents[0])
+
+        response = API_Stream_Response(
+            chain(first_documents, documents),
+            ndjson=ndjson,
+            chunk_size=request.batch_size or 100
+        )
+        # Release the server side cursor even if the client disconnects
+        if close:=getattr(cursor, 'close', None):
+            response.call_on_close(close)
+
+        return response
+
+
     # Holds a reference of all methods for this route
     def __init__(self, **methods:Optional[Callable[[App_Request], Response]]):
         self.methods = {
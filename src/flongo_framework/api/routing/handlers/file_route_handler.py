@@ -0,0 +1,142 @@
+from typing import Any, Callable, Optional
+
+from flask import Response
+from gridfs import GridFSBucket, NoFile
+from pymongo.collection import Collection
+from werkzeug.wsgi import FileWrapper
+
+from ....api.requests.request import App_Request
+from ....api.requests.uploaded_file import Uploaded_File
+from ....api.responses.api_json_response import API_JSON_Response
+from ....api.responses.api_message_response import API_Message_Response
+from ....config.enums.http_methods import HTTP_METHODS
+from ....database.mongodb.connection_manager import MongoDB_Connection_Manager
+
+from ....api.routing.handlers.route_handler import Route_Handler
+
+
+class File_Route_Handler(Route_Handler):
+    ''' Class that allows functions to be bound to specific HTTP
+        methods like GET or POST but stores files in GridFS by default
+        if a custom function isn't passed. Files are stored in the GridFS
+        bucket named after the `collection_name` of the route
+
+        - GET: Downloads the file with the `_id` from the request as a streamed response. Supports `Range`
+          requests (206 Partial Content), ETags and `If-Modified-Since`. Without an `_id`, returns the
+          stored file records (name, length, upload date and metadata) matching the payload from the request
+        - POST: Stores the files uploaded in a multipart request body in chunks. Returns their IDs
+        - DELETE: Deletes the file with the `_id` from the request
+
+        Uploads are written to GridFS while the body is parsed if the route has
+        `uploads=Route_Uploads(gridfs_bucket=<collection_name>)`. Otherwise they
+        are copied into GridFS from the temporary files Werkzeug parsed them into
+    '''
+
+    def GET(self, request:App_Request):
+        ''' Downloads a file from GridFS or gets the file records
+            matching the payload from the request
+        '''
+
+        request.ensure_collection()
+        request.normalize_id(enforce=False)
+
+        if '_id' not in request.payload:
+            if result:=list(self._get_files_collection(request).find(request.payload, projection=request.projection)):
+                return API_JSON_Response(result) if len(result) > 1 else API_JSON_Response(result[0])
+            else:
+                return API_JSON_Response(result, 404)
+
+        try:
+            grid_out = self._get_bucket(request).open_download_stream(request.payload['_id'])
+        except NoFile:
+            return API_JSON_Response({}, 404)
+
+        response = Response(
+            FileWrapper(grid_out, grid_out.chunk_size),
+            mimetype=(grid_out.metadata or {}).get('contentType') or 'application/octet-stream',
+            direct_passthrough=True
+        )
+        response.content_length = grid_out.length
+        response.last_modified = grid_out.upload_date
+        # Stored files never change, so the ID identifies the content
+        response.set_etag(str(grid_out._id))
+        response.headers.set('Content-Disposition', 'inline', filename=grid_out.filename or str(grid_out._id))
+
+        # Send a 206 for Range requests or a 304 if the client has the file
+        return response.make_conditional(request.raw_request, accept_ranges=True, complete_length=grid_out.length)
+
+
+    def POST(self, request:App_Request):
+        ''' Stores the files uploaded with the request in GridFS '''
+
+        request.ensure_collection()
+        if not request.files:
+            return API_Message_Response("No files were uploaded", 400)
+
+        bucket = self._get_bucket(request)
+        files = self._get_files_collection(request)
+        stored = []
+        for field, file in request.files.items():
+            upload = file.stream
+            # Files already streamed into this bucket while the body was parsed
+            if isinstance(upload, Uploaded_File) and upload.gridfs_id and files.find_one({'_id': upload.gridfs_id}, {'_id': 1}):
+                _id = upload.gridfs_id
+            else:
+                metadata:dict[str, Any] = {'contentType': file.mimetype or None}
+                if isinstance(upload, Uploaded_File):
+                    metadata['digests'] = upload.digests
+
+                _id = bucket.upload_from_stream(file.filename or field, file.stream, metadata=metadata)
+
+            stored.append({'_id': str(_id), 'field': field, 'filename': file.filename})
+
+        return API_JSON_Response(stored if len(stored) > 1 else stored[0], 201)
+
+
+    def DELETE(self, request:App_Request):
+        ''' Deletes a file from GridFS '''
+
+        request.ensure_collection()
+        request.normalize_id()
+
+        try:
+            self._get_bucket(request).delete(request.payload['_id'])
+        except NoFile:
+            return API_JSON_Response({}, 404)
+
+        return API_JSON_Response({})
+
+
+    @staticmethod
+    def _get_bucket(request:App_Request) -> GridFSBucket:
+        ''' Get the GridFS bucket named after the route collection '''
+
+        return MongoDB_Connection_Manager.get_gridfs_bucket(request.collection.name, request.collection.database.name)
+
+
+    @staticmethod
+    def _get_files_collection(request:App_Request) -> Collection:
+        ''' Get the collection of the bucket that holds the file records '''
+
+        return request.collection.database[f"{request.collection.name}.files"]
+
+
+    # Holds a reference of all methods for this route
+    def __init__(self, **methods:Optional[Callable[[App_Request], Response]]):
+        self.methods = {
+            "GET": self.GET,
+            "POST": self.POST,
+            "DELETE": self.DELETE
+        }
+
+        for method, func in methods.items():
+            normalized_method = method.upper()
+            # Ensure the method is a valid HTTP method
+            if normalized_method.lower() not in HTTP_METHODS:
+                raise ValueError(f"Routehandler: [{normalized_method}] is not a valid HTTP method.")
+
+            # Create a function on this handler tied
+            # for a method like GET tied to a function
+            # that should run when it is called
+            setattr(self, normalized_method, func)
+            self.methods[normalized_method] = func
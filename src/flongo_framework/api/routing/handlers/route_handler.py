@@ -1,8 +1,19 @@
+import concurrent.futures
+import copy
 from flask_cors import cross_origin
 from jwt import ExpiredSignatureError
+from pymongo.errors import PyMongoError, ServerSelectionTimeoutError
 
 from ....api.requests.request import App_Request
 from ....api.routing.route_permissions import Route_Permissions
+from ....api.routing.route_pagination import Route_Pagination
+from ....api.routing.route_projection import Route_Projection
+from ....api.routing.route_cache import Route_Cache
+from ....api.routing.route_etag import Route_ETag
+from ....api.routing.route_coalescing import Route_Coalescing
+from ....api.routing.route_concurrency import Route_Concurrency
+from ....api.routing.route_payload_limits import Route_Payload_Limits
+from ....api.routing.route_uploads import Route_Uploads
 from ....api.routing.route_schema import Route_Schema
 from ..utils.tranformers import Route_Transformer
 from ....config.enums.http_methods import HTTP_METHODS
@@ -10,16 +21,20 @@ from ....config.settings.app_settings import App_Settings
 from ....api.errors.schema_validation_error import SchemaValidationError
 
 from ....api.responses.errors.api_error import API_Error
-from ....database.mongodb.database import MongoDB_Database
+from ....api.responses.api_json_response import API_JSON_Response
+from ....api.responses.api_stream_response import API_Stream_Response
+from ....config.enums.logs.log_levels import LOG_LEVELS
+from ....database.mongodb.connection_manager import MongoDB_Connection_Manager
 from ..utils.authentication_util import Authentication_Util
 from ....utils.logging.loggers.routing import RoutingLogger
-from ....utils.requests import RequestDataParser
+from ....utils.asynchronous import App_Event_Loop
 from ....api.errors.request_handling_error import RequestHandlingError
 
+import inspect
 import traceback
-from flask import Flask, Response, jsonify, request
-from werkzeug.exceptions import HTTPException
-from typing import Callable, Optional
+from flask import Flask, Response, current_app, jsonify, request
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from typing import Any, Callable, Optional
 from sentry_sdk import start_span
 
 
@@ -31,6 +46,9 @@ class Route_Handler:
         object that contains a URL and supported methods
         that can be executed. This route can be "bound"
         to a Flask server
+
+        Functions can be `async def`. They are run on the
+        App_Event_Loop of the worker process
     '''
 
     # Holds a reference of all methods for this route
@@ -75,7 +93,20 @@ class Route_Handler:
             request_transformer:Route_Transformer,
             response_transformer:Route_Transformer,
             request_schema:Route_Schema,
-            response_schema:Route_Schema
+            response_schema:Route_Schema,
+            stream_results:bool=False,
+            batch_size:Optional[int]=None,
+            pagination:Optional[Route_Pagination]=None,
+            projection:Optional[Route_Projection]=None,
+            cache:Optional[Route_Cache]=None,
+            etag:Optional[Route_ETag]=None,
+            cache_control:Optional[str]=None,
+            async_collection:bool=False,
+            coalescing:Optional[Route_Coalescing]=None,
+            concurrency:Optional[Route_Concurrency]=None,
+            request_timeout_ms:Optional[int]=None,
+            payload_limits:Optional[Route_Payload_Limits]=None,
+            uploads:Optional[Route_Uploads]=None
         ) -> Callable:
         ''' Delegates a request recieved by Flask to one
             of the methods registered to an instance of
@@ -83,62 +114,162 @@ class Route_Handler:
         '''
         
         logger = RoutingLogger(url, method)
+        # The route timeout overrides the application timeout. 0 disables it
+        timeout_ms = settings.flask.request_timeout_ms if request_timeout_ms is None else request_timeout_ms
         def handler(**kwargs) -> Optional[Response]:
             logger.info(f"* Recieved HTTP {method} request *")
-            wrapped_request = App_Request(request)
+            wrapped_request = App_Request(request, stream_results=stream_results, batch_size=batch_size, pagination=pagination, timeout_ms=timeout_ms, logger=logger, payload_limits=payload_limits)
 
-            # Get the data from the request body or query params
-            with start_span(op="parse_request_data", description="Parse data from the query string or request body"):
-                payload = RequestDataParser.get_request_data(wrapped_request.raw_request, logger)
-            
             try:
-                # Validate JIT roles
+                # Reject bodies that are too large before they are read
+                if payload_limits:
+                    payload_limits.limit_request(wrapped_request.raw_request)
+                # Stream uploaded files to disk or GridFS when the body is parsed
+                if uploads:
+                    uploads.configure_request(wrapped_request.raw_request, settings.mongodb)
+
+                # Validate JIT roles before the request body is parsed
                 if required_roles:=getattr(permissions, method, []):
                     with start_span(op="validate_jwt", description="Validate the passed JWT token"):
                         wrapped_request.set_identity(Authentication_Util.validate_identity_cookie_role(required_roles))
                         logger.info("* Validated request JWT IDENTITY successfully *")
 
-                # Validate the payload passed to this route agains the request JSONSchema if configured
-                with start_span(op="validate_request_schema", description="Validate the passed request data against the configured JSONSchema"):
-                    if request_schema.validate_schema(wrapped_request.raw_request, payload):
-                        logger.info("* Validated request SCHEMA successfully")
+                # Get the data from the request body or query params
+                with start_span(op="parse_request_data", description="Parse data from the query string or request body"):
+                    payload = wrapped_request.payload
+
+                # Get the fields MongoDB should return for this request
+                if projection:
+                    wrapped_request.set_projection(projection.get_request_projection(method, payload))
+
+                # Send the cached response if this request was cached
+                cache_key, cache_generation = None, None
+                if cache:
+                    with start_span(op="read_response_cache", description="Get a cached response for the request"):
+                        cache_generation = cache.generation
+                        if (cache_key:=cache.get_key(wrapped_request, method, payload)) and (cached_response:=cache.get(cache_key)):
+                            if etag:
+                                cached_response.make_conditional(wrapped_request.raw_request)
+                            logger.info(f"* Sending CACHED HTTP {method} response: ({cached_response.status_code}) *")
+                            return cached_response
+
+                # Send a 304 without handling the request if the collection didn't change
+                etag_value = None
+                if etag and etag.uses_version(method):
+                    with start_span(op="check_etag", description="Check the ETag sent by the client against the collection version"):
+                        # The version is read from MongoDB so fail fast while it is down
+                        if not MongoDB_Connection_Manager.get_health_monitor(settings.mongodb).allow_request():
+                            raise RequestHandlingError(f"[{method}] The database for URL [{url}] is unavailable!", status_code=503)
+
+                        with wrapped_request.get_deadline_context():
+                            etag_value = etag.get_version_etag(wrapped_request, method, payload, collection_name, settings.mongodb)
+                        if etag.is_not_modified(wrapped_request.raw_request, etag_value):
+                            logger.info(f"* Sending NOT MODIFIED HTTP {method} response: (304) *")
+                            return etag.get_not_modified_response(etag_value or '', cache_control)
+
+                def get_response() -> Response:
+                    # Validate the payload passed to this route agains the request JSONSchema if configured
+                    with start_span(op="validate_request_schema", description="Validate the passed request data against the configured JSONSchema"):
+                        if request_schema.validate_schema(wrapped_request.raw_request, payload):
+                            logger.info("* Validated request SCHEMA successfully")
 
-                with start_span(op="transform_request_data", description="Transform data from the query string or request body"):
-                    wrapped_request.set_payload(request_transformer.transform(wrapped_request.raw_request, payload, logger))
+                    with start_span(op="transform_request_data", description="Transform data from the query string or request body"):
+                        wrapped_request.set_payload(request_transformer.transform(wrapped_request.raw_request, payload, logger))
 
-                # Execute the function configured for this route if one is configured
-                # If there is a MongoDB collection specified, grab it and pass it too
-                if collection_name:
-                    with start_span(op="open_database", description="Open a configured MongoDB collection"):
-                        with MongoDB_Database(collection_name, settings=settings.mongodb, connection_must_be_valid=True) as db:
+                    # Execute the function configured for this route if one is configured
+                    # If there is a MongoDB collection specified, grab it and pass it too
+                    if collection_name:
+                        with start_span(op="open_database", description="Open a configured MongoDB collection"):
+                            # Fail fast instead of waiting for the server selection timeout while MongoDB is down
+                            if not MongoDB_Connection_Manager.get_health_monitor(settings.mongodb).allow_request():
+                                raise RequestHandlingError(f"[{method}] The database for URL [{url}] is unavailable!", status_code=503)
+
+                            if async_collection:
+                                wrapped_request.set_collection(MongoDB_Connection_Manager.get_async_collection(collection_name, settings=settings.mongodb))
+                            else:
+                                wrapped_request.set_collection(MongoDB_Connection_Manager.get_collection(collection_name, settings=settings.mongodb))
                             logger.debug(f"* Opened DATABASE CONNECTION to MongoDB collection [{collection_name}] for request")
-                            wrapped_request.set_collection(db)
 
-                with start_span(op="handle_request", description="Run user configured request handling logic"):
-                    response = action(wrapped_request)
+                    with start_span(op="handle_request", description="Run user configured request handling logic"):
+                        wrapped_request.ensure_deadline()
+                        response = action(wrapped_request)
+                        # Async handlers run on the event loop of the worker
+                        if inspect.isawaitable(response):
+                            response = App_Event_Loop.run(response, wrapped_request.get_remaining_time())
+
+                    with start_span(op="create_response", description="Create the final Flask response"):
+                        if not isinstance(response, Response):
+                            with start_span(op="convert_response", description="Convert a non-Response object to a Flask response"):
+                                logger.warn(f"* HTTP {method} response was forced to a Response! Type: {type(response)}")
+                                response = API_JSON_Response(response) if isinstance(response, dict) else jsonify(response)
 
-                with start_span(op="create_response", description="Create the final Flask response"):
-                    if not isinstance(response, Response):
-                        with start_span(op="convert_response", description="Convert a non-Response object to a Flask response"):
-                            logger.warn(f"* HTTP {method} response was forced to a Response! Type: {type(response)}")
-                            response = jsonify(response)
+                        # Work on the Python payload so the body is only encoded once on delivery
+                        response_payload = self._get_response_payload(response)
+                        # Streams are sent after the deadline context ends so they keep the request deadline
+                        if isinstance(response, API_Stream_Response) and response.deadline is None:
+                            response.deadline = wrapped_request.deadline
 
-                    with start_span(op="transform_response_data", description="Transform data from the response"):
-                        if isinstance(response.json, dict) and response_transformer:
-                            response.set_data(jsonify(response_transformer.transform(request, response.json, logger)).get_data())
+                        with start_span(op="transform_response_data", description="Transform data from the response"):
+                            if isinstance(response_payload, dict) and response_transformer.get_field_transformers(method):
+                                # Transform a copy since the action may return data it keeps (like a module-level dict)
+                                response_payload = response_transformer.transform(request, copy.deepcopy(response_payload), logger)
+                                self._set_response_payload(response, response_payload)
+                            elif isinstance(response, API_Stream_Response) and response_transformer.get_field_transformers(method):
+                                # Streamed documents are transformed one at a time as they are sent
+                                response.add_transformer(self._get_document_transformer(response_transformer, wrapped_request.raw_request))
 
-                    # Validate the payload passed to this route agains the request JSONSchema if configured    
-                    with start_span(op="validate_response_schema", description="Validate the passed response data against the configured JSONSchema"):
-                        if isinstance(response.json, dict) and response_schema.validate_schema(wrapped_request.raw_request, response.json, is_response_schema=True):
-                            logger.info("* Validated response SCHEMA successfully")
+                        # Validate the payload passed to this route agains the request JSONSchema if configured    
+                        with start_span(op="validate_response_schema", description="Validate the passed response data against the configured JSONSchema"):
+                            if isinstance(response_payload, dict) and response_schema.validate_schema(wrapped_request.raw_request, response_payload, is_response_schema=True):
+                                logger.info("* Validated response SCHEMA successfully")
                             
-                    with start_span(op="deliver_response", description="Send the response"):
-                        if response.json:
-                            logger.debug(f"* Attached RESPONSE BODY [{response.json}]")
-                        
-                        logger.info(f"* Sending HTTP {method} response: ({response.status_code}) *")
-                        return response
+                        with start_span(op="deliver_response", description="Send the response"):
+                            if isinstance(response, API_JSON_Response):
+                                response.encode()
+
+                            if etag:
+                                etag.set_etag(method, response, etag_value)
+                            if cache_control and method == 'GET' and response.status_code < 400:
+                                response.headers['Cache-Control'] = cache_control
+
+                            if cache and cache_key:
+                                cache.set(cache_key, response, cache_generation)
+                            # Clear cached responses and change the collection version after writes
+                            if method in Route_Cache.WRITE_METHODS and response.status_code < 400:
+                                Route_Cache.invalidate(collection_name, cache)
+                                Route_ETag.increment_version(collection_name, settings.mongodb, logger)
+
+                            if response_payload and logger.is_enabled_for(LOG_LEVELS.DEBUG):
+                                logger.debug(f"* Attached RESPONSE BODY [{response_payload}]")
+
+                            return response
+
+                # MongoDB operations time out when the request deadline passes
+                with wrapped_request.get_deadline_context():
+                    # Wait for an identical request that is being handled and send a copy of its response
+                    if coalescing and (coalescing_key:=coalescing.get_key(wrapped_request, method, payload)):
+                        with start_span(op="coalesce_request", description="Share the response of an identical request"):
+                            response = coalescing.run(coalescing_key, get_response)
+                    else:
+                        response = get_response()
+
+                # Send a 304 without the body if the client has the same ETag
+                if etag and 'ETag' in response.headers:
+                    response = response.make_conditional(wrapped_request.raw_request)
+
+                # Keep files stored in GridFS for successful requests. Others are deleted when the request closes
+                if uploads and 200 <= response.status_code < 300:
+                    for upload in wrapped_request.uploads.values():
+                        upload.keep()
+
+                logger.info(f"* Sending HTTP {method} response: ({response.status_code}) *")
+                return response
                     
+            except RequestEntityTooLarge as e:
+                # Handle request bodies over the route payload limits
+                self._log_and_raise_exception(wrapped_request, method,
+                    RequestHandlingError(e.description or f"[{method}] Request body on URL [{url}] is too large!", status_code=413), settings, logger
+                )
             except HTTPException as e:
                 # Handle and log Flask generated errors
                 self._log_and_raise_exception(wrapped_request, method,
@@ -164,22 +295,106 @@ class Route_Handler:
                 self._log_and_raise_exception(wrapped_request, method,
                     RequestHandlingError(f"JWT cookie is expired!", status_code=401), settings, logger
                 )
+            except (PyMongoError, TimeoutError, concurrent.futures.TimeoutError) as e:
+                # Handle requests that passed their deadline. Async handlers raise
+                # `concurrent.futures.TimeoutError`, which is only the builtin one from Python 3.11
+                if wrapped_request.deadline is not None and (isinstance(e, (TimeoutError, concurrent.futures.TimeoutError)) or e.timeout):
+                    self._log_and_raise_exception(wrapped_request, method,
+                        RequestHandlingError(f"[{method}] Request on URL [{url}] timed out after [{timeout_ms}ms]!", status_code=504), settings, logger
+                    )
+
+                # Open the circuit so the next requests fail fast
+                if isinstance(e, ServerSelectionTimeoutError):
+                    MongoDB_Connection_Manager.get_health_monitor(settings.mongodb).record_failure(e)
+
+                self._log_and_raise_exception(wrapped_request, method,
+                    RequestHandlingError(str(e), status_code=500), settings, logger
+                )
             except Exception as e:
                 # Handle unknown exceptions
                 self._log_and_raise_exception(wrapped_request, method,
                     RequestHandlingError(str(e), status_code=500), settings, logger
                 )
-            
+
+        if concurrency:
+            return self._limit_concurrency(handler, concurrency, method, logger)
+
         return handler
     
 
+    @staticmethod
+    def _limit_concurrency(handler:Callable, concurrency:Route_Concurrency, method:str, logger:RoutingLogger) -> Callable:
+        ''' Reject requests with a 503 before they are parsed if
+            the route is handling too many requests. Streamed responses
+            hold their slot until the body is sent
+        '''
+
+        def limited_handler(**kwargs) -> Optional[Response]:
+            if not concurrency.acquire():
+                logger.info(f"* Sending SHED HTTP {method} response: (503) *")
+                return concurrency.get_shed_response()
+
+            try:
+                response = handler(**kwargs)
+            except BaseException:
+                concurrency.release()
+                raise
+
+            # Streamed bodies (like MongoDB cursors) are read after the handler returns
+            if isinstance(response, Response) and response.is_streamed:
+                response.call_on_close(concurrency.release)
+            else:
+                concurrency.release()
+
+            return response
+
+        return limited_handler
+
+
+    @staticmethod
+    def _get_response_payload(response:Response) -> Any:
+        ''' Get the Python payload of a response. Only parses the
+            body if the response wasn't an API_JSON_Response
+        '''
+
+        if isinstance(response, API_JSON_Response):
+            return response.payload
+
+        if response.is_json and not response.is_streamed:
+            return response.get_json(silent=True)
+
+
+    @staticmethod
+    def _set_response_payload(response:Response, payload:Any):
+        ''' Replace the payload of a response '''
+
+        if isinstance(response, API_JSON_Response):
+            response.set_payload(payload)
+        else:
+            response.set_data(current_app.json.dumps(payload))
+
+
+    @staticmethod
+    def _get_document_transformer(response_transformer:Route_Transformer, raw_request:Any) -> Callable[[Any], Any]:
+        ''' Get a function that transforms each document of a streamed response.
+            Streams are sent after the request context ends, so the function
+            holds the request object instead of Flask's request proxy
+        '''
+
+        raw_request = raw_request._get_current_object() if hasattr(raw_request, "_get_current_object") else raw_request
+        def transform(document:Any) -> Any:
+            return response_transformer.transform(raw_request, document) if isinstance(document, dict) else document
+
+        return transform
+
+
     def _log_and_raise_exception(self, wrapped_request:App_Request, method:str, error:API_Error, settings:App_Settings, logger:RoutingLogger):
         ''' Log and raise an exception '''
 
         tb = traceback.format_exc()
         if settings.flask.debug_mode:
             error.update_payload_data("request_headers", list(wrapped_request.raw_request.headers))
-            error.update_payload_data("request_data", wrapped_request.payload)
+            error.update_payload_data("request_data", wrapped_request.payload if wrapped_request.is_payload_parsed else None)
             error.set_stack_trace(tb)
         
         logger.error(f"* Error: {error}")
@@ -200,7 +415,21 @@ class Route_Handler:
             response_transformer:Route_Transformer,
             request_schema:Route_Schema,
             response_schema:Route_Schema, 
-            log_level:str
+            log_level:str,
+            stream_results:bool=False,
+            batch_size:Optional[int]=None,
+            pagination:Optional[Route_Pagination]=None,
+            projection:Optional[Route_Projection]=None,
+            cache:Optional[Route_Cache]=None,
+            etag:Optional[Route_ETag]=None,
+            cache_control:Optional[str]=None,
+            async_collection:bool=False,
+            coalescing:Optional[Route_Coalescing]=None,
+            concurrency:Optional[Route_Concurrency]=None,
+            request_timeout_ms:Optional[int]=None,
+            payload_limits:Optional[Route_Payload_Limits]=None,
+            uploads:Optional[Route_Uploads]=None,
+            compress:bool=True
         ):
         ''' Register the functions for all methods (like GET or POST)
             that are supported for a specified URL with Flask
@@ -220,7 +449,20 @@ class Route_Handler:
                     request_transformer,
                     response_transformer,
                     request_schema,
-                    response_schema
+                    response_schema,
+                    stream_results,
+                    batch_size,
+                    pagination,
+                    projection,
+                    cache,
+                    etag,
+                    cache_control,
+                    async_collection,
+                    coalescing,
+                    concurrency,
+                    request_timeout_ms,
+                    payload_limits,
+                    uploads
                 )
 
                 # Enable CORS for the route if it is specified
@@ -230,6 +472,8 @@ class Route_Handler:
                         supports_credentials=True
                     )(method_handler)
 
+                # Read by HTTP_Compression to skip compressing the responses of the route
+                method_handler.compress = compress # type: ignore
                 flask_app.add_url_rule(url, f"{url}_{method}", method_handler, methods=[method])
                 RoutingLogger(url, method).debug(f"Function [{action.__name__}] bound to HTTP method")
 
@@ -1,6 +1,14 @@
 from typing import Optional
 from flask import Flask
 from ...api.routing.route_permissions import Route_Permissions
+from ...api.routing.route_pagination import Route_Pagination
+from ...api.routing.route_projection import Route_Projection
+from ...api.routing.route_cache import Route_Cache
+from ...api.routing.route_etag import Route_ETag
+from ...api.routing.route_coalescing import Route_Coalescing
+from ...api.routing.route_concurrency import Route_Concurrency
+from ...api.routing.route_payload_limits import Route_Payload_Limits
+from ...api.routing.route_uploads import Route_Uploads
 from ...config.enums.logs.log_levels import LOG_LEVELS
 from ...config.settings.app_settings import App_Settings
 from ...utils.logging.loggers.routing import RoutingLogger
@@ -25,7 +33,21 @@ class Route:
             response_transformer:Optional[Route_Transformer]=None,
             request_schema:Optional[Route_Schema]=None,
             response_schema:Optional[Route_Schema]=None,
-            log_level:str=LOG_LEVELS.WARN
+            log_level:str=LOG_LEVELS.WARN,
+            stream_results:bool=False,
+            batch_size:Optional[int]=None,
+            pagination:Optional[Route_Pagination]=None,
+            projection:Optional[Route_Projection]=None,
+            cache:Optional[Route_Cache]=None,
+            etag:Optional[Route_ETag]=None,
+            cache_control:Optional[str]=None,
+            async_collection:bool=False,
+            coalescing:Optional[Route_Coalescing]=None,
+            concurrency:Optional[Route_Concurrency]=None,
+            request_timeout_ms:Optional[int]=None,
+            payload_limits:Optional[Route_Payload_Limits]=None,
+            uploads:Optional[Route_Uploads]=None,
+            compress:bool=True
         ):
 
         self.url = url
@@ -38,6 +60,39 @@ class Route:
         self.request_schema = request_schema or Route_Schema()
         self.response_schema = response_schema or Route_Schema()
         self.log_level = log_level
+        # Stream default GET results to the client in chunks instead of loading them into memory
+        self.stream_results = stream_results
+        # Number of documents fetched per batch from MongoDB cursors
+        self.batch_size = batch_size
+        # Keyset pagination for default GET requests
+        self.pagination = pagination
+        # Fields MongoDB returns for this route. Routes without one ignore the `fields` parameter
+        self.projection = projection
+        # In-memory cache of encoded responses
+        self.cache = cache
+        # ETags for conditional GET requests
+        self.etag = etag
+        # Cache-Control header for successful GET responses
+        self.cache_control = cache_control
+        # Pass an async (Motor) collection to handlers instead of a PyMongo collection
+        self.async_collection = async_collection
+        # Share the response of a request with identical requests handled at the same time
+        self.coalescing = coalescing
+        # Limit the requests handled at the same time and reject the rest with a 503
+        self.concurrency = concurrency
+        # Milliseconds a request can take before it gets a 504. Defaults to the application timeout
+        self.request_timeout_ms = request_timeout_ms
+        # Size and nesting limits for request bodies
+        self.payload_limits = payload_limits
+        # Stream uploaded files to temporary files or GridFS instead of memory
+        self.uploads = uploads
+        # Compress responses with an encoding the client accepts
+        self.compress = compress
+
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"Route: [{url}] batch_size must be greater than 0.")
+        if request_timeout_ms is not None and request_timeout_ms < 0:
+            raise ValueError(f"Route: [{url}] request_timeout_ms can't be negative.")
 
         self._configure_logger()
     
@@ -47,6 +102,17 @@ class Route:
             methods (e.g. GET or POST) specified in the passed RouteHandler
         '''
 
+        # Check and compile JSONSchemas once so they are re-used for every request
+        engine = settings.flask.schema_validation_engine
+        self.request_schema.compile(self.url, engine=engine)
+        self.response_schema.compile(self.url, is_response_schema=True, engine=engine)
+
+        # Clear the response cache when any route on the same collection writes to it
+        if self.cache:
+            self.cache.register(self.collection_name)
+        if self.etag:
+            self.etag.register(self.url, self.collection_name)
+
         self.handler.register_url_methods(
             self.url,
             self.collection_name,
@@ -58,7 +124,21 @@ class Route:
             self.response_transformer,
             self.request_schema,
             self.response_schema,
-            self.log_level
+            self.log_level,
+            self.stream_results,
+            self.batch_size,
+            self.pagination,
+            self.projection,
+            self.cache,
+            self.etag,
+            self.cache_control,
+            self.async_collection,
+            self.coalescing,
+            self.concurrency,
+            self.request_timeout_ms,
+            self.payload_limits,
+            self.uploads,
+            self.compress
         )
 
         RoutingLogger(self.url).info(f"* Created application route: [{self.url}] *")
@@ -0,0 +1,156 @@
+from typing import Any, Hashable, Optional
+
+from flask import Response
+
+from ...api.requests.request import App_Request
+from ...config.enums.http_methods import HTTP_METHODS
+from ...utils.cache import TTL_Cache
+from .utils.authentication_util import Authentication_Util
+
+class Route_Cache:
+    ''' Configures an in-memory cache of encoded responses for a Route
+
+        Responses are cached per method, URL path, request payload and
+        Accept header, and per identity for requests with a JWT (unless
+        `vary_on_identity` is False) and optionally per role set. Cached
+        responses are returned right after JWT validation, skipping the rest
+        of the request pipeline. Only successful, non-streamed responses
+        without cookies are cached
+
+        Entries expire after `ttl_seconds` and the least recently used ones
+        are evicted to keep the cache under `max_bytes`. Bodies compressed
+        for cached responses (see HTTP_Compression) are kept in the entry so
+        hits are sent without compressing the body again
+
+        A successful POST, PUT, PATCH or DELETE on the route, or on any route
+        with the same `collection_name`, clears the cache. The cache is per
+        worker process, so other workers may serve stale responses until
+        their entries expire
+    '''
+
+    WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+    CACHE_HEADER = 'X-Cache'
+
+    # Collection name -> caches of routes that use the collection
+    _COLLECTION_CACHES:dict[str, list["Route_Cache"]] = {}
+
+    def __init__(self,
+            ttl_seconds:float=60,
+            max_bytes:int=32 * 1024 * 1024,
+            max_entries:int=10000,
+            methods:Optional[list[str]]=None,
+            vary_on_identity:Optional[bool]=None,
+            vary_on_roles:bool=False
+        ) -> None:
+
+        self.methods = [method.upper() for method in methods or ['GET']]
+        for method in self.methods:
+            if method.lower() not in HTTP_METHODS:
+                raise ValueError(f"Cache: [{method}] is not a valid HTTP method.")
+
+        self.vary_on_identity = vary_on_identity
+        self.vary_on_roles = vary_on_roles
+        # Incremented when the cache is cleared so responses created before aren't stored
+        self.generation = 0
+        self.responses = TTL_Cache(ttl_seconds, max_entries, max_bytes, self._get_response_size)
+
+
+    def register(self, collection_name:str=''):
+        ''' Clear this cache when routes on the collection write to it '''
+
+        if collection_name and self not in (caches:=self._COLLECTION_CACHES.setdefault(collection_name, [])):
+            caches.append(self)
+
+
+    def get_key(self, request:App_Request, method:str, payload:Any) -> Optional[Hashable]:
+        ''' Get the cache key for a request or None if it can't be cached '''
+
+        if method not in self.methods or request.is_multipart:
+            return None
+
+        if not request.identity:
+            try:
+                if identity:=Authentication_Util.get_current_identity():
+                    request.set_identity(identity)
+            except Exception:
+                # Requests with an invalid JWT aren't cached
+                return None
+
+        # Responses are only shared between identities if the route opts in with `vary_on_identity=False`
+        vary_on_identity = bool(request.identity) if self.vary_on_identity is None else self.vary_on_identity
+        return request.get_request_key(method, payload, vary_on_identity, self.vary_on_roles)
+
+
+    def get(self, key:Hashable) -> Optional[Response]:
+        ''' Get a copy of a cached response '''
+
+        if cached:=self.responses.get(key):
+            status, headers, body, compressed_bodies = cached
+            response = Response(body, status=status, headers=headers)
+            response.headers[self.CACHE_HEADER] = 'HIT'
+            response.compressed_bodies = compressed_bodies # type: ignore
+            return response
+
+
+    def set(self, key:Hashable, response:Response, generation:Optional[int]=None):
+        ''' Cache a response if it can be cached '''
+
+        if response.status_code != 200 or response.is_streamed or 'Set-Cookie' in response.headers:
+            return
+        # The cache was cleared by a write while this response was created
+        if generation is not None and generation != self.generation:
+            return
+
+        # Encoding -> body compressed with it, filled in when the response is compressed
+        compressed_bodies = _Compressed_Bodies(self.responses, key)
+        self.responses.set(key, (response.status_code, list(response.headers.items()), response.get_data(), compressed_bodies))
+        response.headers[self.CACHE_HEADER] = 'MISS'
+        response.compressed_bodies = compressed_bodies # type: ignore
+
+
+    def clear(self):
+        self.generation += 1
+        self.responses.clear()
+
+
+    def get_stats(self) -> dict[str, int]:
+        ''' Get hit, miss and eviction counters and the size of the cache '''
+
+        return self.responses.get_stats()
+
+
+    @classmethod
+    def invalidate(cls, collection_name:str='', cache:Optional["Route_Cache"]=None):
+        ''' Clear a route cache and the caches of all routes on its collection '''
+
+        if cache:
+            cache.clear()
+
+        for collection_cache in cls._COLLECTION_CACHES.get(collection_name, []) if collection_name else []:
+            if collection_cache is not cache:
+                collection_cache.clear()
+
+
+    @staticmethod
+    def _get_response_size(cached:tuple[int, list, bytes, dict[str, bytes]]) -> int:
+        _, headers, body, compressed_bodies = cached
+        return (
+            len(body) + sum(len(compressed_body) for compressed_body in compressed_bodies.values())
+            + sum(len(name) + len(value) for name, value in headers) + 100
+        )
+
+
+class _Compressed_Bodies(dict):
+    ''' Encoding -> compressed body of a cached response. The
+        size of the cache entry is updated when a body is added
+    '''
+
+    def __init__(self, cache:TTL_Cache, key:Hashable) -> None:
+        super().__init__()
+        self.cache = cache
+        self.key = key
+
+
+    def __setitem__(self, encoding:str, body:bytes):
+        super().__setitem__(encoding, body)
+        self.cache.resize(self.key)
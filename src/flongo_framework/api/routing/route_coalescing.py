@@ -0,0 +1,99 @@
+from typing import Any, Callable, Hashable, Optional
+
+from flask import Response
+
+from ...api.requests.request import App_Request
+from ...config.enums.http_methods import HTTP_METHODS
+from ...utils.cache import Single_Flight
+from .utils.authentication_util import Authentication_Util
+
+class Route_Coalescing:
+    ''' Coalesces identical requests to a Route that are handled at the
+        same time so MongoDB is queried and the handler is run only once
+
+        Requests are identical if they have the same method, URL path,
+        Accept header, payload, projection and roles and the same identity
+        (unless `vary_on_identity` is False, so requests from different users
+        with the same roles are coalesced). While one is handled, the others
+        wait up to `timeout_seconds` for it and send a copy of its response
+
+        Waiting requests are handled on their own if the first one times out,
+        raises an error or sends a response that can't be shared (like a
+        streamed response or a response that sets cookies). Only requests
+        that don't write data (GET and HEAD) can be coalesced
+    '''
+
+    SAFE_METHODS = {'GET', 'HEAD'}
+
+    def __init__(self,
+            timeout_seconds:float=5,
+            methods:Optional[list[str]]=None,
+            vary_on_identity:Optional[bool]=None,
+            vary_on_roles:bool=True
+        ) -> None:
+
+        self.methods = [method.upper() for method in methods or ['GET']]
+        for method in self.methods:
+            if method.lower() not in HTTP_METHODS:
+                raise ValueError(f"Coalescing: [{method}] is not a valid HTTP method.")
+            if method not in self.SAFE_METHODS:
+                raise ValueError(f"Coalescing: [{method}] requests can't be coalesced. Use one of {sorted(self.SAFE_METHODS)}")
+
+        self.timeout_seconds = timeout_seconds
+        self.vary_on_identity = vary_on_identity
+        self.vary_on_roles = vary_on_roles
+        self.calls = Single_Flight()
+
+
+    def get_key(self, request:App_Request, method:str, payload:Any) -> Optional[Hashable]:
+        ''' Get the key identical requests share or None if the request can't be coalesced '''
+
+        if method not in self.methods or request.is_multipart:
+            return None
+
+        if not request.identity:
+            try:
+                if identity:=Authentication_Util.get_current_identity():
+                    request.set_identity(identity)
+            except Exception:
+                # Requests with an invalid JWT aren't coalesced
+                return None
+
+        # Responses are only shared between identities if the route opts in with `vary_on_identity=False`
+        vary_on_identity = bool(request.identity) if self.vary_on_identity is None else self.vary_on_identity
+        return request.get_request_key(method, payload, vary_on_identity, self.vary_on_roles)
+
+
+    def run(self, key:Hashable, get_response:Callable[[], Response]) -> Response:
+        ''' Get a response or a copy of the response of an identical request '''
+
+        def handle() -> tuple[Response, Optional[tuple[int, list, bytes]]]:
+            response = get_response()
+            return response, self._get_shared_response(response)
+
+        (response, shared_response), shared = self.calls.do(key, handle, self.timeout_seconds)
+        if not shared:
+            return response
+
+        # The response of the identical request couldn't be shared
+        if shared_response is None:
+            return get_response()
+
+        status, headers, body = shared_response
+        return Response(body, status=status, headers=headers)
+
+
+    def get_stats(self) -> dict[str, int]:
+        ''' Get the number of handled, coalesced and timed out requests '''
+
+        return self.calls.get_stats()
+
+
+    @staticmethod
+    def _get_shared_response(response:Response) -> Optional[tuple[int, list, bytes]]:
+        ''' Get the status, headers and body of a response if it can be sent to other requests '''
+
+        if response.is_streamed or 'Set-Cookie' in response.headers:
+            return None
+
+        return response.status_code, list(response.headers.items()), response.get_data()
@@ -0,0 +1,116 @@
+import threading
+import time
+
+from flask import Response
+
+from ...api.responses.api_json_response import API_JSON_Response
+
+class Route_Concurrency:
+    ''' Limits the number of requests to a Route that are handled at
+        the same time in a worker process so a slow route can't use all
+        of its threads
+
+        At most `max_in_flight` requests are handled at once and at most
+        `max_queued` more wait up to `queue_timeout_seconds` for one to
+        finish. Other requests are rejected right away with a
+        `503 Service Unavailable` and a `Retry-After` header, before the
+        payload is parsed or MongoDB is queried
+
+        Limits apply per worker process and are shared by all methods of
+        the Route. They only matter for workers that handle requests in
+        several threads (like gthread workers or the ASGI mode)
+    '''
+
+    def __init__(self,
+            max_in_flight:int,
+            max_queued:int=0,
+            queue_timeout_seconds:float=1,
+            retry_after_seconds:int=1
+        ) -> None:
+
+        if max_in_flight < 1:
+            raise ValueError("Concurrency: max_in_flight must be greater than 0.")
+        if max_queued < 0:
+            raise ValueError("Concurrency: max_queued can't be negative.")
+
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timeouts = 0
+
+
+    def acquire(self) -> bool:
+        ''' Reserve a slot to handle a request. Returns False if the request should be rejected '''
+
+        with self._condition:
+            if self.in_flight < self.max_in_flight:
+                return self._admit()
+
+            if self.queued >= self.max_queued:
+                self.shed += 1
+                return False
+
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+            deadline = time.monotonic() + self.queue_timeout_seconds
+            try:
+                while self.in_flight >= self.max_in_flight:
+                    if (remaining:=deadline - time.monotonic()) <= 0 or not self._condition.wait(remaining):
+                        if self.in_flight < self.max_in_flight:
+                            break
+                        self.timeouts += 1
+                        self.shed += 1
+                        return False
+            finally:
+                self.queued -= 1
+
+            return self._admit()
+
+
+    def release(self):
+        ''' Free the slot of a handled request '''
+
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+
+    def get_shed_response(self) -> Response:
+        ''' Get the response sent to rejected requests '''
+
+        response = API_JSON_Response({
+            'error': "The server is handling too many requests on this route. Try again later.",
+            'traceback': None,
+            'additional_data': {}
+        }, status_code=503)
+        response.headers['Retry-After'] = str(self.retry_after_seconds)
+
+        return response
+
+
+    def get_stats(self) -> dict[str, int]:
+        ''' Get the number of requests being handled, queued, admitted and rejected '''
+
+        with self._condition:
+            return {
+                'in_flight': self.in_flight,
+                'queued': self.queued,
+                'max_queue_depth': self.max_queue_depth,
+                'admitted': self.admitted,
+                'shed': self.shed,
+                'timeouts': self.timeouts
+            }
+
+
+    def _admit(self) -> bool:
+        self.in_flight += 1
+        self.admitted += 1
+        return True
@@ -0,0 +1,126 @@
+import hashlib
+from typing import Any, Optional
+
+from flask import Request, Response
+
+from ...api.requests.request import App_Request
+from ...config.enums.etag_modes import ETAG_MODES
+from ...config.enums.http_methods import HTTP_METHODS
+from ...config.settings.mongodb_settings import MongoDB_Settings
+from ...database.mongodb.collection_versions import MongoDB_Collection_Versions
+from ...utils.logging.loggers.routing import RoutingLogger
+from .utils.authentication_util import Authentication_Util
+
+class Route_ETag:
+    ''' Configures ETags for the responses of a Route so clients can
+        send `If-None-Match` and get a `304 Not Modified` response if
+        the data they have didn't change
+
+        - body: A strong ETag is a hash of the encoded response body.
+          The request is still handled but the body isn't sent
+        - version: A weak ETag is created from the version of the route
+          collection and the request (URL, payload, projection and optionally
+          the identity). The version is stored in MongoDB and incremented by
+          every successful write through a route on the collection, so a 304
+          is sent before the request is handled or MongoDB is queried
+    '''
+
+    # Collections with routes that use version ETags
+    _VERSIONED_COLLECTIONS:set[str] = set()
+
+    def __init__(self,
+            mode:str=ETAG_MODES.BODY,
+            methods:Optional[list[str]]=None,
+            vary_on_identity:bool=False
+        ) -> None:
+
+        if mode not in ETAG_MODES:
+            raise ValueError(f"ETag: [{mode}] is not a valid ETag mode. Use one of {ETAG_MODES.ALL}")
+
+        self.mode = mode
+        self.methods = [method.upper() for method in methods or ['GET']]
+        for method in self.methods:
+            if method.lower() not in HTTP_METHODS:
+                raise ValueError(f"ETag: [{method}] is not a valid HTTP method.")
+
+        self.vary_on_identity = vary_on_identity
+
+
+    def register(self, url:str, collection_name:str=''):
+        ''' Track the version of the route collection if version ETags are used '''
+
+        if self.mode == ETAG_MODES.VERSION:
+            if not collection_name:
+                raise ValueError(f"ETag: Route [{url}] needs a collection_name to use [{ETAG_MODES.VERSION}] ETags.")
+
+            self._VERSIONED_COLLECTIONS.add(collection_name)
+
+
+    def uses_version(self, method:str) -> bool:
+        ''' Returns True if requests of a method read the collection version from MongoDB '''
+
+        return self.mode == ETAG_MODES.VERSION and method in self.methods
+
+
+    def get_version_etag(self, request:App_Request, method:str, payload:Any, collection_name:str, settings:Optional[MongoDB_Settings]=None) -> Optional[str]:
+        ''' Get the ETag for a request from the version of the collection '''
+
+        if not self.uses_version(method):
+            return None
+
+        if self.vary_on_identity and not request.identity:
+            if identity:=Authentication_Util.get_current_identity():
+                request.set_identity(identity)
+
+        version = MongoDB_Collection_Versions.get_version(collection_name, settings)
+        request_key = request.get_request_key(method, payload, self.vary_on_identity, self.vary_on_identity)
+
+        return f"{version}-{request_key.hex()}"
+
+
+    @staticmethod
+    def is_not_modified(raw_request:Request, etag:Optional[str]) -> bool:
+        ''' Returns True if the client already has the response with an ETag '''
+
+        return bool(etag) and raw_request.if_none_match.contains_weak(etag)
+
+
+    @staticmethod
+    def get_not_modified_response(etag:str, cache_control:Optional[str]=None) -> Response:
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        if cache_control:
+            response.headers['Cache-Control'] = cache_control
+
+        return response
+
+
+    def set_etag(self, method:str, response:Response, etag:Optional[str]=None) -> bool:
+        ''' Set the ETag of a successful response. Returns True if it was set '''
+
+        if method not in self.methods or response.status_code != 200:
+            return False
+
+        if etag:
+            response.set_etag(etag, weak=True)
+        elif self.mode == ETAG_MODES.BODY and not response.is_streamed:
+            response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+        else:
+            return False
+
+        return True
+
+
+    @classmethod
+    def increment_version(cls, collection_name:str, settings:Optional[MongoDB_Settings]=None, logger:Optional[RoutingLogger]=None):
+        ''' Increment the version of a collection if routes use version ETags for it '''
+
+        if collection_name not in cls._VERSIONED_COLLECTIONS:
+            return
+
+        try:
+            MongoDB_Collection_Versions.increment(collection_name, settings)
+        except Exception as e:
+            # The write already succeeded so don't fail the request
+            if logger:
+                logger.error(f"* Failed to increment the version of collection [{collection_name}]: {e}")
@@ -0,0 +1,245 @@
+import base64
+import hashlib
+import traceback
+from typing import Any, Optional
+
+from bson import json_util
+from bson.json_util import CANONICAL_JSON_OPTIONS
+
+from ...api.requests.request import App_Request
+from ...api.responses.errors.api_error import API_Error
+from ...config.enums.pagination_totals import PAGINATION_TOTALS
+from ...utils.cache import TTL_Cache
+
+class Route_Pagination:
+    ''' Configures keyset pagination for the default GET of a Route
+
+        Clients pass `limit`, `sort` (comma separated fields, prefixed with
+        `-` for descending) and the `page_token` returned by the previous page.
+        Pages are found by querying past the sort keys of the last record
+        instead of skipping records, so every page costs the same as the
+        first. `_id` is always added as the final sort key to break ties
+
+        Only `sort_fields` can be sorted on. Each should be backed by an
+        index (compound with `_id`) and be present in every document
+
+        If `total` is set, the number of matching records is included.
+        `estimated` uses the collection metadata when there is no filter
+        and `exact` always counts. Counts are cached for `total_cache_seconds`
+    '''
+
+    LIMIT_FIELD = 'limit'
+    SORT_FIELD = 'sort'
+    PAGE_TOKEN_FIELD = 'page_token'
+    # Prefixed so the query string parser doesn't decode the base64 token itself
+    PAGE_TOKEN_PREFIX = 'p1.'
+
+    def __init__(self,
+            default_limit:int=50,
+            max_limit:int=500,
+            sort_fields:Optional[list[str]]=None,
+            default_sort:str='_id',
+            total:Optional[str]=None,
+            total_cache_seconds:float=60
+        ) -> None:
+
+        if default_limit < 1 or max_limit < default_limit:
+            raise ValueError(f"Pagination: [{default_limit}] must be greater than 0 and less than max_limit [{max_limit}].")
+        if total and total not in PAGINATION_TOTALS:
+            raise ValueError(f"Pagination: [{total}] is not a valid total. Use one of {PAGINATION_TOTALS.ALL}")
+
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.sort_fields = set(sort_fields or []) | {'_id'} | {f.strip().lstrip('+-') for f in default_sort.split(',')}
+        self.default_sort = self._parse_sort(default_sort)
+        self.total = total
+        self._totals = TTL_Cache(total_cache_seconds)
+
+
+    def get_page(self, request:App_Request) -> dict[str, Any]:
+        ''' Get a page of records from the request collection. Pagination
+            options are removed from the request payload and the rest of it
+            is used as the query. Returns the records with the token for the
+            next page and the total if configured
+        '''
+
+        payload = request.payload
+        limit = self._parse_limit(payload.pop(self.LIMIT_FIELD, None))
+        sort = self._parse_sort(payload.pop(self.SORT_FIELD, None)) or self.default_sort
+        page_token = payload.pop(self.PAGE_TOKEN_FIELD, None)
+
+        query = dict(payload)
+        query_hash = self._hash_query(query)
+        if page_token:
+            query = self._after_page_token(query, page_token, sort, query_hash)
+
+        # The sort keys are needed to create the next page token even if they weren't requested
+        projection, hidden_fields = self._with_sort_fields(request.projection, sort)
+
+        # Fetch one extra record to know if there is a next page
+        records = list(request.run_mongo_operation(search_payload=query or {}, sort=sort, limit=limit + 1, projection=projection) or [])
+        next_page_token = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_page_token = self._create_page_token(records[-1], sort, query_hash)
+
+        for record in records if hidden_fields else []:
+            for field in hidden_fields:
+                self._remove_field(record, field)
+
+        page = {'data': records, 'next_page_token': next_page_token}
+        if self.total:
+            page['total'] = self._get_total(request, payload, query_hash)
+
+        return page
+
+
+    def _parse_limit(self, limit:Any) -> int:
+        if limit in (None, ''):
+            return self.default_limit
+
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise API_Error(f"Pagination: [{self.LIMIT_FIELD}] must be an integer", {'limit': limit}, 400, traceback.format_exc())
+
+        return min(max(limit, 1), self.max_limit)
+
+
+    def _parse_sort(self, sort:Any) -> list[tuple[str, int]]:
+        ''' Parse a sort like `-created,name` into a MongoDB sort ending with `_id` '''
+
+        if not sort:
+            return []
+
+        fields = sort if isinstance(sort, list) else str(sort).split(',')
+        parsed = []
+        for field in fields:
+            field = str(field).strip()
+            direction = -1 if field.startswith('-') else 1
+            field = field.lstrip('+-')
+            if field not in self.sort_fields:
+                raise API_Error(
+                    f"Pagination: Sorting by [{field}] is not allowed",
+                    {'allowed_sort_fields': sorted(self.sort_fields)},
+                    400
+                )
+            if field and field not in (f for f, _ in parsed):
+                parsed.append((field, direction))
+
+        if not parsed:
+            return []
+
+        if parsed[-1][0] != '_id':
+            parsed = [(f, d) for f, d in parsed if f != '_id'] + [('_id', parsed[-1][1])]
+
+        return parsed
+
+
+    def _after_page_token(self, query:dict, page_token:Any, sort:list[tuple[str, int]], query_hash:str) -> dict:
+        ''' Add the condition that finds records after the last record of the previous page '''
+
+        token = self._decode_page_token(page_token)
+        if token.get('s') != [list(s) for s in sort] or token.get('q') != query_hash or len(token.get('v', [])) != len(sort):
+            raise API_Error("Pagination: The page token does not match the requested query or sort", status_code=400)
+
+        # (a > x) OR (a == x AND b > y) OR ...
+        conditions = []
+        for i, (field, direction) in enumerate(sort):
+            condition = {f: value for (f, _), value in zip(sort[:i], token['v'])}
+            condition[field] = {'$gt' if direction == 1 else '$lt': token['v'][i]}
+            conditions.append(condition)
+
+        keyset = {'$or': conditions}
+        return {'$and': [query, keyset]} if query else keyset
+
+
+    def _create_page_token(self, record:dict, sort:list[tuple[str, int]], query_hash:str) -> str:
+        ''' Encode the sort keys of a record into an opaque page token '''
+
+        token = {'s': [list(s) for s in sort], 'q': query_hash, 'v': [self._get_field(record, f) for f, _ in sort]}
+        encoded = json_util.dumps(token, json_options=CANONICAL_JSON_OPTIONS).encode()
+
+        return self.PAGE_TOKEN_PREFIX + base64.urlsafe_b64encode(encoded).decode().rstrip('=')
+
+
+    def _decode_page_token(self, page_token:Any) -> dict:
+        page_token = str(page_token)
+        if page_token.startswith(self.PAGE_TOKEN_PREFIX):
+            encoded = page_token[len(self.PAGE_TOKEN_PREFIX):]
+            try:
+                token = json_util.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+                if isinstance(token, dict):
+                    return token
+            except Exception:
+                pass
+
+        raise API_Error("Pagination: The page token is invalid", {'page_token': page_token}, 400)
+
+
+    def _get_total(self, request:App_Request, query:dict, query_hash:str) -> Optional[int]:
+        ''' Count the records matching the query, using cached counts if possible '''
+
+        if request.collection is None:
+            return None
+
+        collection = request.collection
+        if self.total == PAGINATION_TOTALS.ESTIMATED and not query:
+            return self._totals.get_or_set((collection.full_name, None), collection.estimated_document_count)
+
+        return self._totals.get_or_set((collection.full_name, query_hash), lambda: collection.count_documents(query))
+
+
+    @staticmethod
+    def _with_sort_fields(projection:Optional[dict], sort:list[tuple[str, int]]) -> tuple[Optional[dict], list[str]]:
+        ''' Add the sort keys to a projection. Returns the projection and
+            the fields that were added and should be removed from records
+        '''
+
+        if not projection:
+            return projection, []
+
+        projection = dict(projection)
+        is_inclusion = any(value for field, value in projection.items() if field != '_id')
+        hidden_fields = []
+        for field, _ in sort:
+            if projection.get(field) == 0:
+                del projection[field]
+                hidden_fields.append(field)
+            elif is_inclusion and field != '_id' and not projection.get(field) and \
+                not any(field.startswith(f'{f}.') for f, v in projection.items() if v):
+                projection[field] = 1
+                hidden_fields.append(field)
+
+        return projection, hidden_fields
+
+
+    @staticmethod
+    def _remove_field(record:dict, field:str):
+        ''' Remove a field from a record that may be nested with dot notation '''
+
+        *parents, key = field.split('.')
+        for parent in parents:
+            record = record.get(parent) if isinstance(record, dict) else None
+
+        if isinstance(record, dict):
+            record.pop(key, None)
+
+
+    @staticmethod
+    def _get_field(record:dict, field:str) -> Any:
+        ''' Get a field from a record that may be nested with dot notation '''
+
+        value = record
+        for key in field.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+
+        return value
+
+
+    @staticmethod
+    def _hash_query(query:dict) -> str:
+        ''' Hash a query so a page token can only be used with the query that created it '''
+
+        encoded = json_util.dumps(query, sort_keys=True, json_options=CANONICAL_JSON_OPTIONS).encode()
+        return hashlib.blake2b(encoded, digest_size=8).hexdigest()
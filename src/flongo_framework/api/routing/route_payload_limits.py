@@ -0,0 +1,139 @@
+import io
+import re
+from typing import IO, Any, Callable, Optional
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+class Route_Payload_Limits:
+    ''' Limits the size and shape of request bodies a Route accepts so
+        large or deeply nested payloads are rejected with a
+        `413 Content Too Large` instead of being parsed into memory
+
+        - max_content_length: Bytes in the body. Checked against the
+          `Content-Length` header before anything is read. Bodies without
+          one (chunked uploads) are cut off once they pass the limit
+        - max_depth: Nesting of JSON arrays and objects or XML elements
+        - max_array_length: Items in any JSON array
+        - max_xml_elements: Elements and attributes in an XML body
+        - max_form_fields: Fields and files in a form body
+
+        JSON bodies are scanned before they are decoded and XML bodies
+        are checked while they are parsed, stopping at the first limit hit
+    '''
+
+    # JSON strings (skipped so brackets inside them aren't counted) and structural characters
+    JSON_TOKENS = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},]')
+
+    def __init__(self,
+            max_content_length:Optional[int]=None,
+            max_depth:Optional[int]=None,
+            max_array_length:Optional[int]=None,
+            max_xml_elements:Optional[int]=None,
+            max_form_fields:Optional[int]=None
+        ) -> None:
+
+        for name, limit in (
+            ("max_content_length", max_content_length), ("max_depth", max_depth), ("max_array_length", max_array_length),
+            ("max_xml_elements", max_xml_elements), ("max_form_fields", max_form_fields)
+        ):
+            if limit is not None and limit < 0:
+                raise ValueError(f"Payload limits: {name} can't be negative.")
+
+        self.max_content_length = max_content_length
+        self.max_depth = max_depth
+        self.max_array_length = max_array_length
+        self.max_xml_elements = max_xml_elements
+        self.max_form_fields = max_form_fields
+
+
+    def limit_request(self, request:Request):
+        ''' Reject a request if its body is too large or cut it off
+            once it passes the limit. Must be called before the body is read
+        '''
+
+        if self.max_content_length is not None:
+            content_length = request.content_length
+            if content_length is not None and content_length > self.max_content_length:
+                raise RequestEntityTooLarge(f"The request body must be at most [{self.max_content_length}] bytes")
+
+            # Chunked bodies have no length so stop reading them at the limit
+            if content_length is None and "wsgi.input_terminated" in request.environ:
+                request.environ["wsgi.input"] = _Max_Length_Stream(request.environ["wsgi.input"], self.max_content_length)
+
+            request.max_form_memory_size = self.max_content_length
+
+        if self.max_form_fields is not None:
+            request.max_form_parts = self.max_form_fields
+
+
+    def check_json(self, data:bytes):
+        ''' Check the nesting and array lengths of an encoded JSON body '''
+
+        if self.max_depth is None and self.max_array_length is None:
+            return
+
+        max_depth = self.max_depth if self.max_depth is not None else float('inf')
+        max_items = self.max_array_length if self.max_array_length is not None else float('inf')
+        # Number of commas in each open container or -1 for objects
+        commas:list[int] = []
+        for match in self.JSON_TOKENS.finditer(data):
+            token = data[match.start()]
+            if token == 0x2C:  # ,
+                if commas and commas[-1] >= 0:
+                    commas[-1] += 1
+                    if commas[-1] >= max_items:
+                        raise RequestEntityTooLarge(f"JSON arrays must have at most [{self.max_array_length}] items")
+            elif token == 0x5B or token == 0x7B:  # [ {
+                commas.append(0 if token == 0x5B else -1)
+                if len(commas) > max_depth:
+                    raise RequestEntityTooLarge(f"JSON must be nested at most [{self.max_depth}] levels deep")
+            elif token == 0x5D or token == 0x7D:  # ] }
+                if commas:
+                    commas.pop()
+
+
+    def get_xml_postprocessor(self) -> Optional[Callable[[list, str, Any], tuple[str, Any]]]:
+        ''' Get a function that `xmltodict` calls for each parsed element
+            which stops parsing once a limit is passed
+        '''
+
+        if self.max_xml_elements is None and self.max_depth is None:
+            return None
+
+        count = 0
+        def postprocessor(path:list, key:str, value:Any) -> tuple[str, Any]:
+            nonlocal count
+            count += 1
+            if self.max_xml_elements is not None and count > self.max_xml_elements:
+                raise RequestEntityTooLarge(f"XML must have at most [{self.max_xml_elements}] elements")
+            if self.max_depth is not None and len(path) > self.max_depth:
+                raise RequestEntityTooLarge(f"XML must be nested at most [{self.max_depth}] levels deep")
+
+            return key, value
+
+        return postprocessor
+
+
+class _Max_Length_Stream(io.RawIOBase):
+    ''' Request body stream that raises a 413 once more than `limit` bytes are read '''
+
+    def __init__(self, stream:IO[bytes], limit:int) -> None:
+        self._stream = stream
+        self._limit = limit
+        self._read = 0
+
+
+    def readable(self) -> bool:
+        return True
+
+
+    def readinto(self, buffer:Any) -> int:
+        # Read one byte past the limit to tell a body at the limit from a larger one
+        data = self._stream.read(min(len(buffer), self._limit - self._read + 1))
+        self._read += len(data)
+        if self._read > self._limit:
+            raise RequestEntityTooLarge(f"The request body must be at most [{self._limit}] bytes")
+
+        buffer[:len(data)] = data
+        return len(data)
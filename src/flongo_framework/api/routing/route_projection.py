@@ -0,0 +1,89 @@
+from typing import Any, Optional, Union
+
+from ...api.responses.errors.api_error import API_Error
+
+class Route_Projection:
+    ''' Configures which fields MongoDB returns for a Route so
+        unneeded data never leaves the database
+
+        GET requests can pass a `fields` query parameter of comma separated
+        fields to return, or fields prefixed with `-` to leave out. Without
+        it the `default` projection is used. If `allowed` is set, only those
+        fields (and `_id`) can be returned
+
+        The projection is applied to `find`, `find_one` and `find_one_and_*`
+        operations run with `App_Request.run_mongo_operation()`
+    '''
+
+    FIELDS_FIELD = 'fields'
+
+    def __init__(self,
+            default:Optional[Union[list[str], dict[str, Any]]]=None,
+            allowed:Optional[list[str]]=None
+        ) -> None:
+
+        self.allowed = list(allowed) if allowed is not None else None
+        try:
+            self.default = self._parse_fields(default) if default is not None else None
+        except API_Error as e:
+            raise ValueError(f"Projection: {e.message}")
+
+
+    def get_request_projection(self, method:str, payload:dict) -> Optional[dict[str, int]]:
+        ''' Get the projection for a request. The `fields` parameter is
+            removed from the payload of GET requests so it isn't used
+            in the query
+        '''
+
+        fields = payload.pop(self.FIELDS_FIELD, None) if method == 'GET' else None
+        return self.get_projection(fields)
+
+
+    def get_projection(self, fields:Any=None) -> Optional[dict[str, int]]:
+        ''' Get a MongoDB projection for requested fields, the default
+            projection or the allowed fields
+        '''
+
+        if fields not in (None, '', []):
+            return self._parse_fields(fields)
+        if self.default is not None:
+            return self.default
+        if self.allowed is not None:
+            return {field: 1 for field in self.allowed}
+
+
+    def _parse_fields(self, fields:Any) -> dict[str, int]:
+        ''' Parse fields like `name,-tags` or a MongoDB projection into a projection '''
+
+        if isinstance(fields, dict):
+            fields = [field if value else f'-{field}' for field, value in fields.items()]
+        elif not isinstance(fields, (list, tuple, set)):
+            fields = str(fields).split(',')
+
+        included, excluded = [], []
+        for field in fields:
+            field = str(field).strip()
+            name = field.lstrip('+-')
+            if not name or name.startswith('$'):
+                raise API_Error(f"Projection: [{field}] is not a valid field", status_code=400)
+
+            (excluded if field.startswith('-') else included).append(name)
+
+        # MongoDB can't mix included and excluded fields other than _id
+        if included and [field for field in excluded if field != '_id']:
+            raise API_Error("Projection: Fields can't be both included and excluded", {'fields': list(fields)}, 400)
+
+        if self.allowed is not None:
+            if not_allowed:=[field for field in included if field != '_id' and not self._is_allowed(field)]:
+                raise API_Error(f"Projection: Fields {not_allowed} are not allowed", {'allowed_fields': self.allowed}, 400)
+            if not included:
+                # Return the allowed fields that weren't excluded
+                included = [field for field in self.allowed if field not in excluded]
+                excluded = [field for field in excluded if field == '_id'] if included else []
+                included = included or ['_id']
+
+        return {**{field: 1 for field in included}, **{field: 0 for field in excluded}}
+
+
+    def _is_allowed(self, field:str) -> bool:
+        return any(field == allowed or field.startswith(f'{allowed}.') for allowed in self.allowed or [])
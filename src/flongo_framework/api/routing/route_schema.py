@@ -1,5 +1,6 @@
 from ...config.enums.http_methods import HTTP_METHODS
-from ...utils.requests import JSON_Schema_Validator
+from ...config.enums.schema_validation_engines import SCHEMA_VALIDATION_ENGINES
+from ...utils.requests import JSON_Schema_Validator, Compiled_JSON_Schema_Validator
 
 from flask import Request
 from typing import Any, Optional
@@ -10,11 +11,20 @@ class Route_Schema:
 
         Used in conjuction with a Route to hold JSONSchemas
         for each method for request or response validation
+
+        The validation `engine` can be set per schema, otherwise the
+        `schema_validation_engine` Flask setting is used. The `compiled`
+        engine compiles schemas into specialized Python functions
     '''
 
     # Holds a reference of all passed schemas
-    def __init__(self, **method_schemas:dict[str, Any]):
+    def __init__(self, engine:Optional[str]=None, **method_schemas:dict[str, Any]):
+        if engine and engine not in SCHEMA_VALIDATION_ENGINES:
+            raise ValueError(f"Schema: [{engine}] is not a valid validation engine. Use one of {SCHEMA_VALIDATION_ENGINES.ALL}")
+
+        self.engine = engine
         self.schemas = {}
+        self.validators:dict[str, JSON_Schema_Validator] = {}
         for method, schema in method_schemas.items():
             normalized_method = method.upper()
             # Ensure the method is a valid HTTP method
@@ -25,33 +35,67 @@ class Route_Schema:
             # with the dictionary containing the schema
             setattr(self, normalized_method, schema)
             self.schemas[normalized_method] = schema
-    
+
+            # Allow other schemas to reference this one by its $id
+            JSON_Schema_Validator.register_schema(schema)
+
 
     def get_schemas(self) -> dict[str, dict[str, Any]]:
         ''' Returns all schemas stored by this class
         '''
 
         return self.schemas
-    
+
 
     def get_schema(self, method:str) -> Optional[dict[str, Any]]:
         ''' Returns a schemas stored by this class
         '''
 
         return self.get_schemas().get(method)
-    
+
+
+    def compile(self, url:str='', is_response_schema:bool=False, engine:Optional[str]=None):
+        ''' Check every stored schema and compile a validator for it
+            so validation on each request can re-use it. Throws an
+            exception if a schema is invalid
+        '''
+
+        validator_class = self._get_validator_class(self.engine or engine)
+        for method, schema in self.get_schemas().items():
+            if schema:
+                self.validators[method] = validator_class(schema, url, method, is_response_schema)
+
+
+    def _get_validator_class(self, engine:Optional[str]=None) -> type[JSON_Schema_Validator]:
+        ''' Get the validator class for a validation engine '''
+
+        if engine == SCHEMA_VALIDATION_ENGINES.COMPILED:
+            return Compiled_JSON_Schema_Validator
+
+        return JSON_Schema_Validator
+
+
+    def get_validator(self, method:str) -> Optional[JSON_Schema_Validator]:
+        ''' Returns the compiled validator for a method, compiling
+            it if this schema was never compiled
+        '''
+
+        if (validator:=self.validators.get(method)) is None and (schema:=self.get_schema(method)):
+            validator = self.validators[method] = self._get_validator_class(self.engine)(schema, method=method)
+
+        return validator
+
 
     def validate_schema(self, request:Request, payload:dict, is_response_schema=False) -> bool:
         ''' Validate the request payload against a JSONSchema if one was supplied
             Returns True if a schema was validated, False if one was not and throws
-            an exception if schema validation failed 
+            an exception if schema validation failed
         '''
 
         method = request.method.upper()
-        if schema:=self.get_schema(method):
-            validator = JSON_Schema_Validator(schema, request.url_root, method, is_response_schema)
-            validator.validate_request(payload)
+        if validator:=self.get_validator(method):
+            validator.validate_request(payload, request.url_root, is_response_schema)
 
             return True
-        
+
         return False
@@ -0,0 +1,63 @@
+import hashlib
+from typing import Optional
+
+from flask import Request
+
+from ...api.requests.uploaded_file import Uploaded_File
+from ...config.settings.mongodb_settings import MongoDB_Settings
+from ...database.mongodb.connection_manager import MongoDB_Connection_Manager
+
+class Route_Uploads:
+    ''' Configures how files uploaded to a Route in multipart request
+        bodies are stored while the body is parsed
+
+        Each file is streamed into an Uploaded_File that keeps at most
+        `memory_threshold` bytes in memory and spools the rest to a
+        temporary file, computing `digests` (any `hashlib` algorithm)
+        as it is written. Handlers get them from `request.uploads`
+
+        If `gridfs_bucket` is set, files larger than `gridfs_threshold`
+        bytes are streamed into that GridFS bucket in chunks instead
+        so memory use doesn't grow with the upload size
+    '''
+
+    def __init__(self,
+            memory_threshold:int=1024 * 1024,
+            digests:Optional[list[str]]=None,
+            gridfs_bucket:Optional[str]=None,
+            gridfs_threshold:int=0
+        ) -> None:
+
+        if memory_threshold < 0:
+            raise ValueError("Uploads: memory_threshold can't be negative.")
+
+        self.memory_threshold = memory_threshold
+        self.digests = tuple(digests if digests is not None else ['sha256'])
+        for digest in self.digests:
+            if digest not in hashlib.algorithms_available:
+                raise ValueError(f"Uploads: [{digest}] is not a valid digest algorithm.")
+
+        self.gridfs_bucket = gridfs_bucket
+        self.gridfs_threshold = gridfs_threshold
+
+
+    def configure_request(self, request:Request, settings:Optional[MongoDB_Settings]=None):
+        ''' Stream files uploaded with a request into Uploaded_Files.
+            Must be called before the request body is parsed
+        '''
+
+        def get_gridfs_bucket():
+            return MongoDB_Connection_Manager.get_gridfs_bucket(self.gridfs_bucket or 'fs', settings=settings)
+
+        def get_file_stream(total_content_length:Optional[int], content_type:Optional[str], filename:Optional[str]=None, content_length:Optional[int]=None) -> Uploaded_File:
+            return Uploaded_File(
+                filename,
+                content_type,
+                self.memory_threshold,
+                self.digests,
+                get_gridfs_bucket if self.gridfs_bucket else None,
+                self.gridfs_threshold
+            )
+
+        # Werkzeug calls this to get the file each uploaded file is written to
+        request._get_file_stream = get_file_stream # type: ignore
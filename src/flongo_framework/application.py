@@ -9,9 +9,12 @@ from .api.responses.errors.api_error import API_Error
 from .database.mongodb.database import MongoDB_Database
 from .database.mongodb.fixture.fixtures import MongoDB_Fixtures
 from .database.mongodb.index.indices import MongoDB_Indices
+from .database.mongodb.index.builder import MongoDB_Index_Builder
 from sentry_sdk.integrations.flask import FlaskIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 from .utils.json import JSON_Provider
+from .utils.asynchronous import ASGI_Adapter
+from .utils.compression import HTTP_Compression, Request_Decompression
 
 from flask import Flask, jsonify
 from typing import Optional
@@ -45,6 +48,10 @@ class Application:
 
         # Create the Flask app
         self.app = Flask(__name__)
+        self.app.extensions['flongo_framework'] = self
+        self._asgi_app:Optional[ASGI_Adapter] = None
+        # Builds the indices and reports if the critical ones exist (see `readiness_path`)
+        self.index_builder:Optional[MongoDB_Index_Builder] = None
 
         # Initialize JWT Util
         self._initialize_jwt()
@@ -52,9 +59,8 @@ class Application:
         # Initialize the application
         self._initialize()
 
-        # Initialize the database and store client for re-use
-        if database:=self._initialize_database():
-            self.app.config['APP_DB_CLIENT'] = database.get_client()
+        # Initialize the database. Clients are pooled per worker by the MongoDB_Connection_Manager
+        self._initialize_database()
 
         if self.settings.flask.log_boot_events:
             ApplicationLogger.critical(f"[App Started Successfully]")
@@ -79,6 +85,39 @@ class Application:
         # Set JSON encoding class
         self.app.json = JSON_Provider(self.app)
 
+        # Compress responses and decompress request bodies
+        self._initialize_compression()
+
+        # Report if the application is ready for traffic
+        self._register_readiness_route()
+
+
+    def _initialize_compression(self):
+        self.compression = HTTP_Compression(
+            self.settings.flask.compression_algorithms,
+            self.settings.flask.compression_min_size or 0
+        )
+        self.app.after_request(self.compression.compress_response)
+        self.app.wsgi_app = Request_Decompression(self.app.wsgi_app, self.settings.flask.max_decompressed_size) # type: ignore
+
+
+    def _register_readiness_route(self):
+        if not self.settings.flask.readiness_path:
+            return
+
+        def readiness():
+            ready = not self.index_builder or self.index_builder.is_ready()
+            state = self.index_builder.state if self.index_builder else None
+            # The route is public so errors and database operations are only sent in debug mode
+            if self.settings.flask.debug_mode:
+                response = jsonify(ready=ready, state=state, indices=self.index_builder.get_progress() if self.index_builder else None)
+            else:
+                response = jsonify(ready=ready, state=state)
+            response.status_code = 200 if ready else 503
+            return response
+
+        self.app.add_url_rule(self.settings.flask.readiness_path, 'readiness', readiness, methods=['GET'])
+
 
     def _initialize_jwt(self):
         App_JWT_Manager(self.app, self.settings.jwt)
@@ -114,6 +153,11 @@ class Application:
         ''' Initialize the database by creating passed fixture and 
             indices. Check if the database can be connected to if the
             application requires it. Return the database if it can be connected to
+
+            If `background_index_builds` is set, indices and then fixtures are
+            created in a background thread so the application can serve requests
+            while they are built. The readiness route reports if the critical
+            indices exist
         ''' 
         requires_mongodb = self.settings.flask.requires_mongodb or False
 
@@ -130,22 +174,31 @@ class Application:
             if self.settings.flask.log_boot_events:
                 ApplicationLogger.critical(f"[Setting up Database]")
 
-            # Create indices
-            if self.indices and len(self.indices):
-                database.create_indices()
-                ApplicationLogger.warn(
-                    f"[Created [{len(self.indices)}] database {'indices' if len(self.indices) > 1 else 'index'}]"
-                )
-
-            # Create fixtures
-            if self.fixtures and len(self.fixtures):
-                database.create_fixtures()
-                ApplicationLogger.warn(
-                    f"[Created [{len(self.fixtures)}] database fixture{'s' if len(self.fixtures) > 1 else ''}]"
-                )
+            self.index_builder = MongoDB_Index_Builder(database, self.indices)
+            if self.settings.flask.background_index_builds:
+                self.index_builder.start(on_finish=lambda results: self._finish_database_setup(database, results))
+                ApplicationLogger.warn(f"[Building database indices in the background]")
+            else:
+                self._finish_database_setup(database, self.index_builder.build())
 
             return database
 
+
+    def _finish_database_setup(self, database:MongoDB_Database, index_results:dict[str, int]):
+        ''' Log the created indices and create fixtures once indices are built '''
+
+        if self.indices and len(self.indices):
+            ApplicationLogger.warn(
+                f"[Created [{index_results['created']}] database {'index' if index_results['created'] == 1 else 'indices'}, [{index_results['unchanged']}] unchanged]"
+            )
+
+        # Create fixtures
+        if self.fixtures and len(self.fixtures):
+            results = database.create_fixtures()
+            ApplicationLogger.warn(
+                f"[Applied [{results['applied']}] database fixture{'s' if results['applied'] != 1 else ''}, [{results['unchanged']}] unchanged]"
+            )
+
     def _register_error_handlers(self):
         ''' Register wrappers to handle specific kinds of errors '''
         
@@ -163,7 +216,35 @@ class Application:
             return response
 
 
+    @property
+    def asgi_app(self) -> ASGI_Adapter:
+        ''' The application as an ASGI app to serve it with an ASGI server like Uvicorn.
+            Async handlers run on the server event loop and the rest of the request
+            pipeline runs in a pool of `asgi_max_threads` threads
+        '''
+
+        if not self._asgi_app:
+            self._asgi_app = ASGI_Adapter(self.app, self.settings.flask.asgi_max_threads or 64)
+
+        return self._asgi_app
+
+
+    def serve(self):
+        ''' Serve the application with Gunicorn for production. The worker
+            class (sync, gthread, gevent or asgi), worker and thread counts,
+            keep-alive, backlog and max requests are read from the Flask settings.
+            Workers are forked from this process after the application is set up
+        '''
+
+        # Imported here since Gunicorn can't be imported on Windows
+        from .utils.server import App_Server
+
+        App_Server(lambda: self, self.settings.flask).run()
+
+
     def run(self):
+        ''' Run the application with the Flask development server '''
+
         self.app.run(
             host=self.settings.flask.host,
             port=self.settings.flask.port,
@@ -1,3 +1,8 @@
 from .environments import ENVIRONMENTS
 from .http_methods import HTTP_METHODS
 from .mongodb_index_types import MONGODB_INDEX_TYPES
+from .schema_validation_engines import SCHEMA_VALIDATION_ENGINES
+from .pagination_totals import PAGINATION_TOTALS
+from .etag_modes import ETAG_MODES
+from .server_worker_classes import SERVER_WORKER_CLASSES
+from .fixture_file_formats import FIXTURE_FILE_FORMATS
\ No newline at end of file
@@ -0,0 +1,7 @@
+from ...config.enums.base.base_str_enum import BaseStrEnum
+
+class ETAG_MODES(BaseStrEnum):
+    """ Ways a Route can create ETags for its responses """
+
+    BODY = "body"
+    VERSION = "version"
@@ -0,0 +1,8 @@
+from ...config.enums.base.base_str_enum import BaseStrEnum
+
+class FIXTURE_FILE_FORMATS(BaseStrEnum):
+    """ File formats fixtures can be streamed from """
+
+    NDJSON = "ndjson"
+    BSON = "bson"
+    JSON = "json"
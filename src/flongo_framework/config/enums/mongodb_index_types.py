@@ -5,4 +5,6 @@ class MONGODB_INDEX_TYPES(BaseStrEnum):
 
     TEXT = "text"
     COMPOUND = "compound"
+    HASHED = "hashed"
+    WILDCARD = "wildcard"
     STANDARD = "standard"
@@ -0,0 +1,7 @@
+from ...config.enums.base.base_str_enum import BaseStrEnum
+
+class PAGINATION_TOTALS(BaseStrEnum):
+    """ Ways a paginated route can count the total number of matching records """
+
+    ESTIMATED = "estimated"
+    EXACT = "exact"
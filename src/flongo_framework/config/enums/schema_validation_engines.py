@@ -0,0 +1,7 @@
+from ...config.enums.base.base_str_enum import BaseStrEnum
+
+class SCHEMA_VALIDATION_ENGINES(BaseStrEnum):
+    """ Engines supported for validating payloads against a JSONSchema """
+
+    JSONSCHEMA = "jsonschema"
+    COMPILED = "compiled"
@@ -0,0 +1,9 @@
+from ...config.enums.base.base_str_enum import BaseStrEnum
+
+class SERVER_WORKER_CLASSES(BaseStrEnum):
+    """ Gunicorn worker models the application can be served with """
+
+    SYNC = "sync"
+    GTHREAD = "gthread"
+    GEVENT = "gevent"
+    ASGI = "asgi"
@@ -33,6 +33,10 @@ class Settings:
         if value is None:
             return None
 
+        # Variables that are set but empty (like unset variables passed through Docker Compose) are unset numbers
+        if value.strip() == '' and data_type in [int, Decimal]:
+            return None
+
         # Cast the data to the proper type
         parsed_value = Settings._normalize_config_value_type(value, data_type)
         return parsed_value
@@ -4,7 +4,7 @@ from ...config.settings.base import Settings
 from dataclasses import dataclass, field
 from typing import Optional
 
-from ...config.enums import ENVIRONMENTS
+from ...config.enums import ENVIRONMENTS, SCHEMA_VALIDATION_ENGINES, SERVER_WORKER_CLASSES
 
 @dataclass
 class Flask_Settings(Settings):
@@ -111,6 +111,168 @@ class Flask_Settings(Settings):
         metadata={"log_level": LOG_LEVELS.WARN}
     ) # type: ignore
 
+    schema_validation_engine: Optional[str] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "APP_SCHEMA_VALIDATION_ENGINE", 
+            data_type=str,
+            default_value=SCHEMA_VALIDATION_ENGINES.JSONSCHEMA
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    asgi_max_threads: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "APP_ASGI_MAX_THREADS", 
+            data_type=int,
+            default_value="64"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    request_timeout_ms: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "APP_REQUEST_TIMEOUT_MS", 
+            data_type=int,
+            default_value=None
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    compression_algorithms: Optional[list] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "APP_COMPRESSION_ALGORITHMS", 
+            data_type=list,
+            default_value="br, zstd, gzip"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    compression_min_size: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "APP_COMPRESSION_MIN_SIZE", 
+            data_type=int,
+            default_value="1024"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    max_decompressed_size: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "APP_MAX_DECOMPRESSED_SIZE", 
+            data_type=int,
+            default_value="10485760"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    background_index_builds: Optional[bool] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "APP_BACKGROUND_INDEX_BUILDS", 
+            data_type=bool,
+            default_value="False"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    readiness_path: Optional[str] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "APP_READINESS_PATH", 
+            data_type=str,
+            default_value="/ready"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    worker_class: Optional[str] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_WORKER_CLASS", 
+            data_type=str,
+            default_value=SERVER_WORKER_CLASSES.SYNC
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    workers: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_WORKERS", 
+            data_type=int,
+            default_value="1"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    threads: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_THREADS", 
+            data_type=int,
+            default_value="1"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    worker_connections: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_WORKER_CONNECTIONS", 
+            data_type=int,
+            default_value="1000"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    worker_timeout: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_TIMEOUT", 
+            data_type=int,
+            default_value="30"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    keep_alive: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_KEEP_ALIVE", 
+            data_type=int,
+            default_value="2"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    backlog: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_BACKLOG", 
+            data_type=int,
+            default_value="2048"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    max_requests: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_MAX_REQUESTS", 
+            data_type=int,
+            default_value="0"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    max_requests_jitter: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_MAX_REQUESTS_JITTER", 
+            data_type=int,
+            default_value="0"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
+    preload_app: Optional[bool] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "GUNICORN_PRELOAD_APP", 
+            data_type=bool,
+            default_value="False"
+        ),
+        metadata={"log_level": LOG_LEVELS.WARN}
+    ) # type: ignore
+
 
     def __post_init__(self):
         if self.config_log_level:
@@ -62,6 +62,102 @@ class MongoDB_Settings(Settings):
         ),
     ) # type: ignore
 
+    max_pool_size: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_MAX_POOL_SIZE", 
+            data_type=int,
+            default_value="100"
+        ),
+    ) # type: ignore
+
+    min_pool_size: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_MIN_POOL_SIZE", 
+            data_type=int,
+            default_value="0"
+        ),
+    ) # type: ignore
+
+    max_idle_time_ms: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_MAX_IDLE_TIME_MS", 
+            data_type=int,
+            default_value=None
+        ),
+    ) # type: ignore
+
+    wait_queue_timeout_ms: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_WAIT_QUEUE_TIMEOUT_MS", 
+            data_type=int,
+            default_value=None
+        ),
+    ) # type: ignore
+
+    compressors: Optional[list] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_COMPRESSORS", 
+            data_type=list,
+            default_value=None
+        ),
+    ) # type: ignore
+
+    appname: Optional[str] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_APPNAME", 
+            data_type=str,
+            default_value=""
+        ),
+    ) # type: ignore
+
+    heartbeat_frequency_ms: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_HEARTBEAT_FREQUENCY_MS", 
+            data_type=int,
+            default_value=None
+        ),
+    ) # type: ignore
+
+    circuit_breaker_retry_ms: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_CIRCUIT_BREAKER_RETRY_MS", 
+            data_type=int,
+            default_value="5000"
+        ),
+    ) # type: ignore
+
+    index_workers: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_INDEX_WORKERS", 
+            data_type=int,
+            default_value="4"
+        ),
+    ) # type: ignore
+
+    drop_undeclared_indices: Optional[bool] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_DROP_UNDECLARED_INDICES", 
+            data_type=bool,
+            default_value="False"
+        ),
+    ) # type: ignore
+
+    fixture_batch_size: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_FIXTURE_BATCH_SIZE", 
+            data_type=int,
+            default_value="1000"
+        ),
+    ) # type: ignore
+
+    fixture_workers: Optional[int] = field(
+        default_factory=lambda: Settings.read_config_from_env_or_default(
+            "MONGODB_FIXTURE_WORKERS", 
+            data_type=int,
+            default_value="4"
+        ),
+    ) # type: ignore
+
     log_level: Optional[str] = field(
         default_factory=lambda: Settings.read_config_from_env_or_default(
             "MONGODB_LOG_LEVEL", 
@@ -1 +1,3 @@
 from .mongodb.database import MongoDB_Database
+from .mongodb.connection_manager import MongoDB_Connection_Manager
+from .mongodb.collection_versions import MongoDB_Collection_Versions
\ No newline at end of file
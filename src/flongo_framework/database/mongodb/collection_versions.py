@@ -0,0 +1,45 @@
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from ...config.settings.mongodb_settings import MongoDB_Settings
+from .connection_manager import MongoDB_Connection_Manager
+
+class MongoDB_Collection_Versions:
+    ''' Version counters for MongoDB collections, stored in MongoDB
+        so every worker and server sees the same version
+
+        A version is incremented each time the framework writes to the
+        collection. Code that writes to a collection some other way should
+        call `increment()` itself
+        ```
+        version = MongoDB_Collection_Versions.get_version("collection")
+        ```
+    '''
+
+    COLLECTION_NAME = 'collection_versions'
+
+    @classmethod
+    def get_version(cls, collection_name:str, settings:Optional[MongoDB_Settings]=None) -> int:
+        ''' Get the current version of a collection. Returns 0 if it was never written to '''
+
+        record = cls._get_collection(settings).find_one({'_id': collection_name}, {'version': 1})
+        return int(record.get('version', 0)) if record else 0
+
+
+    @classmethod
+    def increment(cls, collection_name:str, settings:Optional[MongoDB_Settings]=None) -> int:
+        ''' Increment the version of a collection and return the new version '''
+
+        record = cls._get_collection(settings).find_one_and_update(
+            {'_id': collection_name},
+            {'$inc': {'version': 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return int(record['version'])
+
+
+    @classmethod
+    def _get_collection(cls, settings:Optional[MongoDB_Settings]=None):
+        return MongoDB_Connection_Manager.get_collection(cls.COLLECTION_NAME, settings=settings)
@@ -0,0 +1,287 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from gridfs import GridFSBucket
+from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from ...config.settings.mongodb_settings import MongoDB_Settings
+from .health_monitor import MongoDB_Health_Monitor
+from ...utils.asynchronous.event_loop import App_Event_Loop
+from ...utils.logging.loggers.database import DatabaseLogger
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    AsyncIOMotorClient = None
+
+class MongoDB_Connection_Manager:
+    ''' Per-worker manager for MongoDB connections
+
+        Owns a single pooled MongoClient for each distinct set of
+        connection settings and hands out cached Collection handles
+        per (database, collection) so requests can re-use them
+        ```
+        collection = MongoDB_Connection_Manager.get_collection("collection", settings=settings)
+        ```
+        GridFS buckets for file storage are cached the same way and
+        returned by `get_gridfs_bucket()`
+
+        Each client has a MongoDB_Health_Monitor (`get_health_monitor()`)
+        that tracks if the database is reachable from the driver heartbeats
+        so requests can fail fast while it is down
+
+        Async handlers can get Motor collections with `get_async_collection()`
+        if `motor` is installed. Async clients are bound to the App_Event_Loop
+
+        Clients are never shared across a fork. If the process ID
+        changes (e.g. a Gunicorn worker forked from a preloaded app)
+        the cached clients are dropped and lazily re-created in the child
+    '''
+
+    _lock = threading.RLock()
+    _pid = os.getpid()
+    # Client key -> MongoClient
+    _clients:dict[tuple, MongoClient] = {}
+    # (Client key, database, collection) -> Collection
+    _collections:dict[tuple, Collection] = {}
+    # id(settings) -> (settings, client key) of recently used settings so keys aren't rebuilt per request
+    _settings_keys:OrderedDict[int, tuple[MongoDB_Settings, tuple]] = OrderedDict()
+    # Number of settings objects to keep client keys for
+    MAX_SETTINGS_KEYS = 64
+    # (Client key, database, bucket) -> GridFSBucket
+    _buckets:dict[tuple, GridFSBucket] = {}
+    # (Client key, event loop ID) -> async client
+    _async_clients:dict[tuple, Any] = {}
+    # Client key -> health monitor of the client
+    _monitors:dict[tuple, MongoDB_Health_Monitor] = {}
+
+
+    @staticmethod
+    def get_connection_string(settings:MongoDB_Settings, database_name:str='') -> str:
+        ''' Get the MongoDB connection string for the passed settings '''
+
+        database_name = database_name or settings.default_database or ''
+
+        # If it looks like an Atlas hostname (contains ".mongodb.net"), use the mongodb+srv:// scheme
+        if settings.host and ".mongodb.net" in settings.host:
+            return f"mongodb+srv://{settings.username}:{settings.password}@{settings.host}/{database_name}?retryWrites=true&w=majority"
+
+        # Otherwise connect locally
+        connection_uri = "mongodb://"
+        if settings.username:
+            connection_uri += f"{settings.username}:{settings.password}@"
+
+        connection_uri += f"{settings.host}:{settings.port}/{database_name}"
+
+        return connection_uri
+
+
+    @staticmethod
+    def get_client_options(settings:MongoDB_Settings) -> dict:
+        ''' Get the MongoClient connection pool options for the passed settings '''
+
+        options = {'serverSelectionTimeoutMS': settings.connection_timeout_ms}
+        if settings.max_pool_size is not None:
+            options['maxPoolSize'] = settings.max_pool_size
+        if settings.min_pool_size is not None:
+            options['minPoolSize'] = settings.min_pool_size
+        if settings.max_idle_time_ms is not None:
+            options['maxIdleTimeMS'] = settings.max_idle_time_ms
+        if settings.wait_queue_timeout_ms is not None:
+            options['waitQueueTimeoutMS'] = settings.wait_queue_timeout_ms
+        if compressors:=[c for c in settings.compressors or [] if c]:
+            options['compressors'] = ",".join(compressors)
+        if settings.appname:
+            options['appname'] = settings.appname
+        if settings.heartbeat_frequency_ms is not None:
+            options['heartbeatFrequencyMS'] = settings.heartbeat_frequency_ms
+
+        return options
+
+
+    @classmethod
+    def get_client(cls, settings:Optional[MongoDB_Settings]=None) -> MongoClient:
+        ''' Get the pooled MongoClient for the passed settings, creating it if needed '''
+
+        settings = settings or MongoDB_Settings.get_settings_from_flask() or MongoDB_Settings()
+        cls._ensure_process()
+
+        key = cls._get_client_key(settings)
+        if client:=cls._clients.get(key):
+            return client
+
+        with cls._lock:
+            if not (client:=cls._clients.get(key)):
+                connection_string, options = key[0], dict(key[1])
+                monitor = MongoDB_Health_Monitor((settings.circuit_breaker_retry_ms or 0) / 1000)
+                client = MongoClient(connection_string, event_listeners=[monitor], **options)
+                monitor.client = client
+                cls._monitors[key] = monitor
+                cls._clients[key] = client
+                DatabaseLogger().debug(f"Created MongoDB client for [{connection_string}] with options {options} in process [{cls._pid}]")
+
+            return client
+
+
+    @classmethod
+    def get_health_monitor(cls, settings:Optional[MongoDB_Settings]=None) -> MongoDB_Health_Monitor:
+        ''' Get the health monitor of the pooled MongoClient for the passed settings '''
+
+        settings = settings or MongoDB_Settings.get_settings_from_flask() or MongoDB_Settings()
+        cls._ensure_process()
+
+        key = cls._get_client_key(settings)
+        if not (monitor:=cls._monitors.get(key)):
+            cls.get_client(settings)
+            monitor = cls._monitors[key]
+
+        return monitor
+
+
+    @classmethod
+    def get_collection(cls, collection_name:str, database_name:str='', settings:Optional[MongoDB_Settings]=None) -> Collection:
+        ''' Get a cached Collection handle from the pooled MongoClient '''
+
+        settings = settings or MongoDB_Settings.get_settings_from_flask() or MongoDB_Settings()
+        database_name = database_name or settings.default_database or ''
+        cls._ensure_process()
+
+        key = (cls._get_client_key(settings), database_name, collection_name)
+        if collection:=cls._collections.get(key):
+            return collection
+
+        with cls._lock:
+            if (collection:=cls._collections.get(key)) is None:
+                collection = cls.get_client(settings).get_database(database_name).get_collection(collection_name)
+                cls._collections[key] = collection
+
+            return collection
+
+
+    @classmethod
+    def get_database(cls, database_name:str='', settings:Optional[MongoDB_Settings]=None) -> Database:
+        ''' Get a database from the pooled MongoClient '''
+
+        settings = settings or MongoDB_Settings.get_settings_from_flask() or MongoDB_Settings()
+        database_name = database_name or settings.default_database or ''
+
+        return cls.get_client(settings).get_database(database_name)
+
+
+    @classmethod
+    def get_gridfs_bucket(cls, bucket_name:str='fs', database_name:str='', settings:Optional[MongoDB_Settings]=None) -> GridFSBucket:
+        ''' Get a cached GridFS bucket that stores files in
+            the `<bucket_name>.files` and `<bucket_name>.chunks` collections
+        '''
+
+        settings = settings or MongoDB_Settings.get_settings_from_flask() or MongoDB_Settings()
+        database_name = database_name or settings.default_database or ''
+        cls._ensure_process()
+
+        key = (cls._get_client_key(settings), database_name, bucket_name)
+        if bucket:=cls._buckets.get(key):
+            return bucket
+
+        with cls._lock:
+            if (bucket:=cls._buckets.get(key)) is None:
+                bucket = GridFSBucket(cls.get_database(database_name, settings), bucket_name)
+                cls._buckets[key] = bucket
+
+            return bucket
+
+
+    @classmethod
+    def get_async_client(cls, settings:Optional[MongoDB_Settings]=None) -> Any:
+        ''' Get the pooled async (Motor) client for the passed settings. It is bound
+            to the App_Event_Loop so it should only be used by async handlers
+        '''
+
+        if not AsyncIOMotorClient:
+            raise ImportError("MongoDB_Connection_Manager: Async collections require the `motor` package")
+
+        settings = settings or MongoDB_Settings.get_settings_from_flask() or MongoDB_Settings()
+        cls._ensure_process()
+
+        loop = App_Event_Loop.get_loop()
+        key = (cls._get_client_key(settings), id(loop))
+        if client:=cls._async_clients.get(key):
+            return client
+
+        with cls._lock:
+            if not (client:=cls._async_clients.get(key)):
+                connection_string, options = key[0][0], dict(key[0][1])
+                client = AsyncIOMotorClient(connection_string, io_loop=loop, event_listeners=[cls.get_health_monitor(settings)], **options)
+                cls._async_clients[key] = client
+                DatabaseLogger().debug(f"Created async MongoDB client for [{connection_string}] with options {options} in process [{cls._pid}]")
+
+            return client
+
+
+    @classmethod
+    def get_async_collection(cls, collection_name:str, database_name:str='', settings:Optional[MongoDB_Settings]=None) -> Any:
+        ''' Get an async (Motor) collection from the pooled async client '''
+
+        settings = settings or MongoDB_Settings.get_settings_from_flask() or MongoDB_Settings()
+        database_name = database_name or settings.default_database or ''
+
+        return cls.get_async_client(settings)[database_name][collection_name]
+
+
+    @classmethod
+    def reset(cls, close:bool=False):
+        ''' Drop all cached clients and collections. Clients are only closed
+            if `close` is True since closing a client inherited across a fork
+            is unsafe
+        '''
+
+        clients = list(cls._clients.values())
+
+        cls._lock = threading.RLock()
+        cls._pid = os.getpid()
+        cls._clients = {}
+        cls._collections = {}
+        cls._buckets = {}
+        cls._monitors = {}
+        cls._settings_keys = OrderedDict()
+        clients.extend(cls._async_clients.values())
+        cls._async_clients = {}
+
+        if close:
+            for client in clients:
+                client.close()
+
+
+    @classmethod
+    def _ensure_process(cls):
+        ''' Drop clients created by a parent process '''
+
+        if cls._pid != os.getpid():
+            cls.reset()
+
+
+    @classmethod
+    def _get_client_key(cls, settings:MongoDB_Settings) -> tuple:
+        ''' Get the key identifying the client for a set of settings '''
+
+        with cls._lock:
+            if cached:=cls._settings_keys.get(id(settings)):
+                cls._settings_keys.move_to_end(id(settings))
+                return cached[1]
+
+            options = cls.get_client_options(settings)
+            key = (cls.get_connection_string(settings), tuple(sorted(options.items())))
+            cls._settings_keys[id(settings)] = (settings, key)
+            # Settings created per call (like App_Settings() in a script) aren't kept forever
+            if len(cls._settings_keys) > cls.MAX_SETTINGS_KEYS:
+                cls._settings_keys.popitem(last=False)
+
+        return key
+
+
+# Never re-use a client created before a fork in the child process
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=MongoDB_Connection_Manager.reset)
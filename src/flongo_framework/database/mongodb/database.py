@@ -1,16 +1,19 @@
     
+import itertools
 import json
-from typing import Optional
-
-from flask import current_app, has_app_context
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
 
 from ...config.settings.mongodb_settings import MongoDB_Settings
-from pymongo import TEXT, MongoClient
+from pymongo import IndexModel, MongoClient, UpdateOne
 from pymongo.database import Database
 from pymongo.collection import Collection
-from pymongo.errors import OperationFailure
+from pymongo.errors import BulkWriteError, OperationFailure
 
 from ...database.errors.database_error import DatabaseError
+from ...database.mongodb.connection_manager import MongoDB_Connection_Manager
 from ...database.mongodb.fixture.base import MongoDB_Fixture
 from ...database.mongodb.fixture.fixtures import MongoDB_Fixtures
 from ...database.mongodb.index.base import MongoDB_Index
@@ -63,18 +66,14 @@ class MongoDB_Database:
         
 
     def get_client(self) -> MongoClient:
-        ''' Get the MongoDB connection string '''
+        ''' Get the MongoDB client '''
 
         # If client already exists in instance, return it
         if current_client:=getattr(self, "_client", None):
             return current_client
         
-        # If client already exists in Flask context, return it
-        if flask_client:=self.get_client_from_flask():
-            return flask_client
-        
-        # Otherwise create a new client
-        return MongoClient(self.connection_string, serverSelectionTimeoutMS=self.settings.connection_timeout_ms)
+        # Otherwise get the pooled client for this worker
+        return MongoDB_Connection_Manager.get_client(self.settings)
 
 
     @property
@@ -95,18 +94,7 @@ class MongoDB_Database:
     def connection_string(self) -> str:
         ''' Get the MongoDB connection string '''
         
-        # If it looks like an Atlas hostname (contains ".mongodb.net"), use the mongodb+srv:// scheme
-        if self.settings.host and ".mongodb.net" in self.settings.host:
-            return f"mongodb+srv://{self.settings.username}:{self.settings.password}@{self.settings.host}/{self.database_name}?retryWrites=true&w=majority"
-        
-        # Otherwise connect locally
-        connection_uri = "mongodb://"
-        if self.settings.username:
-            connection_uri += f"{self.settings.username}:{self.settings.password}@"
-        
-        connection_uri += f"{self.settings.host}:{self.settings.port}/{self.database_name}"
-
-        return connection_uri
+        return MongoDB_Connection_Manager.get_connection_string(self.settings, self.database_name)
     
 
     def _get_collection(self, collection_name:str):
@@ -140,15 +128,12 @@ class MongoDB_Database:
 
 
     def validate_connection(self, raise_exception:bool=False) -> bool:
-        ''' Tests if the connection to MongoDB is working '''
+        ''' Tests if the connection to MongoDB is working. The result is
+            cached by the health monitor of the client, which the driver
+            heartbeats keep up to date, so MongoDB is only pinged once
+        '''
 
-        result = False
-        
-        try:
-            if self._client.server_info():
-                result = True 
-        except Exception as e:
-            pass
+        result = MongoDB_Connection_Manager.get_health_monitor(self.settings).is_available()
 
         if not result and raise_exception:
             self._log_and_throw_database_error(DatabaseError(
@@ -181,24 +166,7 @@ class MongoDB_Database:
         
         try:
             index_collection = self._get_collection(index.collection_name)
-            # Create a text index
-            if index.is_text:
-                index_collection.create_index([
-                    (index.field_name, TEXT)
-                ], background=background)
-            
-            # Create a compound index
-            elif index.compound_index:
-                index_collection.create_index([
-                    (index.field_name, index.order), 
-                    (index.compound_index.field_name, index.compound_index.order)
-                ], **index.properties, background=background)
-
-            # Create a standard index
-            else:
-                index_collection.create_index([
-                    (index.field_name, index.order),
-                ], **index.properties, background=background)
+            index_collection.create_index(index.keys, **index.get_options(), background=background)
 
             DatabaseLogger(
                 database=self.database_name,
@@ -245,21 +213,215 @@ class MongoDB_Database:
         raise error
         
 
-    def create_indices(self, background:bool=False):
+    def create_indices(self, background:bool=False) -> dict[str, int]:
         ''' Creates all stored indices on the connected database '''
 
-        # Create all indices
-        for index in self.indices:
-            self.create_index(index, background)
+        return self.reconcile_indices(background=background)
+
+
+    def reconcile_indices(self, 
+            indices:Optional[MongoDB_Indices]=None, 
+            drop_undeclared:Optional[bool]=None, 
+            background:bool=False,
+            on_progress:Optional[Callable[[str, dict[str, int]], Any]]=None
+        ) -> dict[str, int]:
+        ''' Make the indices in the database match the stored indices
+
+            The indices of each collection are compared with `list_indexes()` and the missing
+            ones are created with one `create_indexes()` per collection. Collections are
+            reconciled in parallel. Indices whose TTL or visibility changed are modified in
+            place. If `drop_undeclared` is True (or `drop_undeclared_indices` is set), indices
+            that aren't stored are dropped and indices whose fields or options changed are
+            rebuilt. `on_progress` is called with the name and results of each collection once it
+            is reconciled. Returns the number of indices that were created, unchanged, modified and dropped
+        '''
+
+        indices = indices or self.indices
+        if drop_undeclared is None:
+            drop_undeclared = self.settings.drop_undeclared_indices or False
+
+        collections = indices.get_collection_indices()
+        results = {'created': 0, 'unchanged': 0, 'modified': 0, 'dropped': 0, 'conflicts': 0}
+        start = time.monotonic()
+        def reconcile_collection(collection_name:str, collection_indices:list[MongoDB_Index]) -> dict[str, int]:
+            collection_results = self._reconcile_collection_indices(collection_name, collection_indices, drop_undeclared or False, background)
+            if on_progress:
+                on_progress(collection_name, collection_results)
+            return collection_results
+
+        if collections:
+            workers = max(min(self.settings.index_workers or 1, len(collections)), 1)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="indices") as executor:
+                for collection_results in executor.map(reconcile_collection, collections.keys(), collections.values()):
+                    for name, count in collection_results.items():
+                        results[name] += count
+
+        DatabaseLogger(database=self.database_name).info(
+            f"* Reconciled indices of [{len(collections)}] collections in [{time.monotonic() - start:.2f}s]. Created [{results['created']}], modified [{results['modified']}], dropped [{results['dropped']}] and skipped [{results['unchanged']}] unchanged indices *"
+        )
+
+        return results
+
+
+    def _reconcile_collection_indices(self, collection_name:str, indices:list[MongoDB_Index], drop_undeclared:bool=False, background:bool=False) -> dict[str, int]:
+        ''' Make the indices of a collection match the stored indices for it '''
+
+        logger = DatabaseLogger(database=self.database_name, collection=collection_name)
+        results = {'created': 0, 'unchanged': 0, 'modified': 0, 'dropped': 0, 'conflicts': 0}
+        collection = self._get_collection(collection_name)
+        try:
+            existing = {spec['name']: spec for spec in collection.list_indexes()}
+            # The default index on `_id` is never dropped
+            existing.pop('_id_', None)
+
+            missing:list[MongoDB_Index] = []
+            for index in indices:
+                # Indices are matched by name or by fields if they were created with another name
+                name = index.name if index.name in existing else next((name for name, spec in existing.items() if index.has_same_keys(spec)), None)
+                spec = existing.pop(name) if name else None
+                if not spec:
+                    missing.append(index)
+                elif not (changes:=index.get_changed_options(spec)):
+                    results['unchanged'] += 1
+                elif all(option in index.MODIFIABLE_OPTIONS and value is not None for option, value in changes.items()):
+                    self.database.command({'collMod': collection_name, 'index': {'name': spec['name'], **changes}})
+                    logger.info(f"* Modified {index.index_type} index [{spec['name']}]: {changes} *")
+                    results['modified'] += 1
+                elif drop_undeclared:
+                    collection.drop_index(spec['name'])
+                    logger.info(f"* Dropped {index.index_type} index [{spec['name']}] to rebuild it: {changes} *")
+                    results['dropped'] += 1
+                    missing.append(index)
+                else:
+                    logger.warn(f"{index.index_type.capitalize()} Index [{spec['name']}] doesn't match its definition {changes}. Enable dropping undeclared indices to rebuild it")
+                    results['conflicts'] += 1
+
+            for name in existing:
+                if drop_undeclared:
+                    collection.drop_index(name)
+                    logger.info(f"* Dropped undeclared index [{name}] *")
+                    results['dropped'] += 1
+                else:
+                    logger.debug(f"Index [{name}] isn't declared")
+
+            if missing:
+                options = {'background': True} if background else {}
+                collection.create_indexes([IndexModel(index.keys, **index.get_options(), **options) for index in missing])
+                for index in missing:
+                    logger.info(f"* Created {index.index_type} index [{index.name}] *")
+                results['created'] += len(missing)
+
+        except OperationFailure as e:
+            self._log_and_throw_database_error(DatabaseError(
+                f"Failed to reconcile indices", e.code, data={
+                    "collection_name": collection_name,
+                    "indices": [index.name for index in indices],
+                    "details": e.details
+                }
+            ))
+
+        except Exception as e:
+            self._log_and_throw_database_error(DatabaseError(
+                f"Error reconciling indices: {e}",
+                data={
+                    "collection_name": collection_name,
+                    "indices": [index.name for index in indices]
+                }
+            ))
 
+        return results
 
-    def create_fixtures(self, fixtures:Optional[MongoDB_Fixtures]=None):
-        ''' Create pre-defined database records in the MongoDB database '''
+
+    def create_fixtures(self, fixtures:Optional[MongoDB_Fixtures]=None, force:bool=False) -> dict[str, int]:
+        ''' Create pre-defined database records in the MongoDB database
+
+            Fixtures are upserted with unordered bulk writes per collection and collections
+            are written in parallel. Fixtures of a collection (or fixture files) that didn't
+            change since they were applied are skipped unless `force` is True. Returns the
+            number of fixtures that were applied and that were unchanged
+        '''
         
         fixtures = fixtures or self.fixtures
-        for fixture in fixtures.get_fixtures():
-            collection = self._get_collection(fixture.collection_name)
-            self.create_fixture(fixture, collection)
+        collections = fixtures.get_fixture_sets()
+        results = {'applied': 0, 'unchanged': 0, 'collections': 0}
+        start = time.monotonic()
+        if collections:
+            workers = max(min(self.settings.fixture_workers or 1, len(collections)), 1)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fixtures") as executor:
+                for collection_results in executor.map(lambda fixture_sets: self._create_fixture_sets(fixture_sets, force), collections.values()):
+                    for name, count in collection_results.items():
+                        results[name] += count
+
+        DatabaseLogger(database=self.database_name).info(
+            f"* Applied [{results['applied']}] fixtures to [{results['collections']}] collections and skipped [{results['unchanged']}] unchanged fixtures in [{time.monotonic() - start:.2f}s] *"
+        )
+
+        return results
+
+
+    def _create_fixture_sets(self, fixture_sets:list, force:bool=False) -> dict[str, int]:
+        ''' Apply the sets of fixtures of a collection in order '''
+
+        hashes = self._get_collection(MongoDB_Fixtures.HASH_COLLECTION_NAME)
+        results = {'applied': 0, 'unchanged': 0, 'collections': 0}
+        for fixture_set in fixture_sets:
+            content_hash = fixture_set.get_content_hash()
+            if not force and (applied:=hashes.find_one({'_id': fixture_set.set_id, 'hash': content_hash}, {'count': 1})):
+                results['unchanged'] += applied.get('count', 0)
+                continue
+
+            written, conflicts = self._write_fixtures(self._get_collection(fixture_set.collection_name), fixture_set.get_documents())
+            # Only store the hash if every fixture was written so conflicts are retried
+            if not conflicts:
+                hashes.update_one(
+                    {'_id': fixture_set.set_id},
+                    {'$set': {'hash': content_hash, 'count': written, 'updated_at': datetime.now(timezone.utc)}},
+                    upsert=True
+                )
+
+            results['applied'] += written - conflicts
+            results['collections'] = 1
+
+        return results
+
+
+    def _write_fixtures(self, collection:Collection, documents:Iterable[dict]) -> tuple[int, int]:
+        ''' Upsert fixture data in batches with unordered bulk writes. Only one batch is
+            read from `documents` at a time. Returns the number of fixtures that were
+            written and the number that conflicted with existing records
+        '''
+
+        logger = DatabaseLogger(database=self.database_name, collection=collection.name)
+        batch_size = max(self.settings.fixture_batch_size or 1000, 1)
+        documents = iter(documents)
+        written, conflicts = 0, 0
+        while batch:=list(itertools.islice(documents, batch_size)):
+            written += len(batch)
+            try:
+                collection.bulk_write([UpdateOne({"_id": data["_id"]}, {"$set": data}, upsert=True) for data in batch], ordered=False)
+            except BulkWriteError as e:
+                errors = e.details.get('writeErrors', [])
+                if failures:=[error for error in errors if error.get('code') != 11000]:
+                    self._log_and_throw_database_error(DatabaseError(
+                        f"Failed to create fixtures",
+                        code=failures[0].get('code'), data={
+                            "collection_name": collection.name,
+                            "errors": failures[:10]
+                        }
+                    ))
+
+                conflicts += len(errors)
+            except Exception as e:
+                self._log_and_throw_database_error(DatabaseError(
+                    f"Error creating fixtures: {e}",
+                    data={"collection_name": collection.name}
+                ))
+
+        if conflicts:
+            logger.warn(f"[{conflicts}] fixtures conflict with existing records and were not applied")
+        logger.debug(f"Applied [{written - conflicts}] fixtures")
+
+        return written, conflicts
 
 
     def create_fixture(self, fixture:MongoDB_Fixture, collection:Collection):
@@ -298,5 +460,5 @@ class MongoDB_Database:
     def get_client_from_flask(cls) -> Optional[MongoClient]:
         ''' Get the MongoDB client for the current Flask app '''
 
-        if has_app_context():
-            return current_app.config.get('APP_DB_CLIENT')
+        if settings:=MongoDB_Settings.get_settings_from_flask():
+            return MongoDB_Connection_Manager.get_client(settings)
@@ -1,2 +1,3 @@
 from .base import MongoDB_Fixture
+from .file_fixture import MongoDB_File_Fixture
 from .fixtures import MongoDB_Fixtures
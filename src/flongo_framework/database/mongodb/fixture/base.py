@@ -16,6 +16,13 @@ class MongoDB_Fixture:
     def _validate_fixture_data(self, data:dict) -> dict:
         ''' Validate the fixture is defined properly '''
 
+        return self.validate_data(self.collection_name, data)
+
+
+    @staticmethod
+    def validate_data(collection_name:str, data:dict) -> dict:
+        ''' Validate fixture data for a collection has a valid `_id` and convert it to an ObjectId '''
+
         if data and not isinstance(data, dict):
             raise DatabaseError(
                 f'Error in fixture definitions. The fixture definition must be a dictionary object',
@@ -25,13 +32,13 @@ class MongoDB_Fixture:
         _id = data.get('_id')
         if not _id:
             raise DatabaseError(
-                f'Error in fixture definitions for collection [{self.collection_name}]. The fixture definition:\n{data}\n is missing a MongoDB ObjectId in the _id field',
+                f'Error in fixture definitions for collection [{collection_name}]. The fixture definition:\n{data}\n is missing a MongoDB ObjectId in the _id field',
                 stack_trace=traceback.format_exc()
             )
         
         if not ObjectId.is_valid(_id):
             raise DatabaseError(
-                f'Error in fixture definitions for collection [{self.collection_name}]. The fixture definition:\n{data}\n has an invalid MongoDB ObjectId in the _id field',
+                f'Error in fixture definitions for collection [{collection_name}]. The fixture definition:\n{data}\n has an invalid MongoDB ObjectId in the _id field',
                 stack_trace=traceback.format_exc()
             )
         
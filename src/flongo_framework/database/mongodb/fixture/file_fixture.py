@@ -0,0 +1,141 @@
+import codecs
+import hashlib
+import json
+import os
+import traceback
+from typing import IO, Iterator, Optional
+
+import bson
+from bson import json_util
+
+from ....config.enums import FIXTURE_FILE_FORMATS
+from ....database.errors.database_error import DatabaseError
+from ....database.mongodb.fixture.base import MongoDB_Fixture
+
+
+class MongoDB_File_Fixture:
+    ''' Stores the location of a file of fixtures for a collection
+
+        Records are read from the file one at a time while they are applied
+        so memory use doesn't grow with the size of the file. Each record is
+        validated like a MongoDB_Fixture and needs an ObjectId `_id`
+        ```
+        MongoDB_Fixtures(
+            MongoDB_File_Fixture("countries", "fixtures/countries.ndjson")
+        )
+        ```
+        - ndjson (`.ndjson` or `.jsonl`): One JSON record per line, like the output of `mongoexport`
+        - bson (`.bson`): Concatenated BSON records, like the output of `mongodump`
+        - json (`.json`): A JSON array of records
+
+        JSON records can use MongoDB Extended JSON (like `{"$oid": ...}` or `{"$date": ...}`)
+    '''
+
+    EXTENSION_FORMATS = {
+        '.ndjson': FIXTURE_FILE_FORMATS.NDJSON,
+        '.jsonl': FIXTURE_FILE_FORMATS.NDJSON,
+        '.bson': FIXTURE_FILE_FORMATS.BSON,
+        '.json': FIXTURE_FILE_FORMATS.JSON
+    }
+
+    # Bytes read from the file at a time
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, collection_name:str, path:str, format:Optional[str]=None):
+        self.collection_name = collection_name
+        self.path = path
+        self.format = format or self.EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), '')
+
+        if self.format not in FIXTURE_FILE_FORMATS:
+            raise DatabaseError(
+                f'Error in fixture definitions for collection [{collection_name}]. The format of fixture file [{path}] must be one of {FIXTURE_FILE_FORMATS.ALL}',
+                stack_trace=traceback.format_exc()
+            )
+
+
+    @property
+    def set_id(self) -> str:
+        ''' The ID the hash of the file is stored under '''
+
+        return f"{self.collection_name}:{os.path.basename(self.path)}"
+
+
+    def get_content_hash(self) -> str:
+        ''' Get a hash of the contents of the file '''
+
+        content_hash = hashlib.sha256()
+        with open(self.path, 'rb') as file:
+            while chunk:=file.read(self.CHUNK_SIZE):
+                content_hash.update(chunk)
+
+        return content_hash.hexdigest()
+
+
+    def get_documents(self) -> Iterator[dict]:
+        ''' Read and validate the records in the file one at a time '''
+
+        with open(self.path, 'rb') as file:
+            if self.format == FIXTURE_FILE_FORMATS.BSON:
+                records = bson.decode_file_iter(file)
+            elif self.format == FIXTURE_FILE_FORMATS.NDJSON:
+                records = self._read_ndjson(file)
+            else:
+                records = self._read_json_array(file)
+
+            for record in records:
+                yield MongoDB_Fixture.validate_data(self.collection_name, record)
+
+
+    @staticmethod
+    def _read_ndjson(file:IO[bytes]) -> Iterator[dict]:
+        decoder = json.JSONDecoder(object_hook=json_util.object_hook)
+        for line in file:
+            if line:=line.strip():
+                yield decoder.decode(line.decode())
+
+
+    def _read_json_array(self, file:IO[bytes]) -> Iterator[dict]:
+        ''' Read the records in a JSON array without loading the whole array '''
+
+        decoder = json.JSONDecoder(object_hook=json_util.object_hook)
+        # Decodes characters split across chunks
+        text_decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer, position, opened, finished = '', 0, False, False
+        while True:
+            # Skip whitespace and the commas between records
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+
+            if position < len(buffer):
+                if not opened:
+                    if buffer[position] != '[':
+                        break
+                    opened = True
+                    position += 1
+                    continue
+                if buffer[position] == ']':
+                    return
+
+                try:
+                    record, position = decoder.raw_decode(buffer, position)
+                    yield record
+                    continue
+                except ValueError:
+                    # The record is cut off at the end of the chunk unless the file is finished
+                    if finished:
+                        break
+            elif finished:
+                # An empty file has no records
+                if not opened:
+                    return
+                break
+
+            buffer, position = buffer[position:], 0
+            chunk = file.read(self.CHUNK_SIZE)
+            finished = not chunk
+            buffer += text_decoder.decode(chunk, final=finished)
+
+        raise DatabaseError(
+            f'Error in fixture file [{self.path}]. It must contain a JSON array of records',
+            stack_trace=traceback.format_exc()
+        )
@@ -1,15 +1,31 @@
+import hashlib
 import traceback
+from typing import Iterator, Union
+
+import bson
 
 from ....database.errors.database_error import DatabaseError
 from ....database.mongodb.fixture.base import MongoDB_Fixture
+from ....database.mongodb.fixture.file_fixture import MongoDB_File_Fixture
 
 class MongoDB_Fixtures:
-    ''' Class to facilitate applying database fixtures '''
+    ''' Class to facilitate applying database fixtures
+
+        Fixtures are applied per collection with bulk writes, and collections
+        are applied in parallel. A hash of the fixtures of each collection
+        (and of each MongoDB_File_Fixture) is stored in the `fixture_hashes`
+        collection so fixtures that didn't change aren't written again
+    '''
 
-    def __init__(self, *fixtures:MongoDB_Fixture) -> None:
-        self._fixtures = self._validate_fixtures(list(fixtures))
+    # Collection that stores the hash of the fixtures last applied to each collection
+    HASH_COLLECTION_NAME = 'fixture_hashes'
+
+    def __init__(self, *fixtures:Union[MongoDB_Fixture, MongoDB_File_Fixture]) -> None:
+        fixtures_list = self._validate_fixtures(list(fixtures))
+        self._fixtures = [fixture for fixture in fixtures_list if isinstance(fixture, MongoDB_Fixture)]
+        self._files = [fixture for fixture in fixtures_list if isinstance(fixture, MongoDB_File_Fixture)]
         
-    def _validate_fixtures(self, fixtures:list[MongoDB_Fixture]) -> list[MongoDB_Fixture]:
+    def _validate_fixtures(self, fixtures:list) -> list:
         ''' Validate fixture structure and return fixtures'''
 
         if fixtures and not isinstance(fixtures, list):
@@ -20,9 +36,9 @@ class MongoDB_Fixtures:
 
         if fixtures:
             for fixture in fixtures:
-                if not isinstance(fixture, MongoDB_Fixture):
+                if not isinstance(fixture, (MongoDB_Fixture, MongoDB_File_Fixture)):
                     raise DatabaseError(
-                        f'Error in fixture definitions! The defined fixtures must be a list of MongoDB_Fixture objects to insert in the database. Found a {type(fixture)}',
+                        f'Error in fixture definitions! The defined fixtures must be a list of MongoDB_Fixture or MongoDB_File_Fixture objects to insert in the database. Found a {type(fixture)}',
                         stack_trace=traceback.format_exc()
                     )
             
@@ -33,7 +49,68 @@ class MongoDB_Fixtures:
 
     def get_fixtures(self) -> list[MongoDB_Fixture]:
         return self._fixtures
+
+
+    def get_files(self) -> list[MongoDB_File_Fixture]:
+        return self._files
+
+
+    def get_fixture_sets(self) -> dict[str, list[Union["_Fixture_Set", MongoDB_File_Fixture]]]:
+        ''' Get the sets of fixtures that are hashed and applied together for each collection.
+            The fixtures defined for a collection are one set and each file is another
+        '''
+
+        collections:dict[str, list[Union[_Fixture_Set, MongoDB_File_Fixture]]] = {
+            collection_name: [_Fixture_Set(collection_name, documents)]
+            for collection_name, documents in self.get_collection_fixtures().items()
+        }
+        for file in self._files:
+            collections.setdefault(file.collection_name, []).append(file)
+
+        return collections
+
+
+    def get_collection_fixtures(self) -> dict[str, list[dict]]:
+        ''' Get the fixture data for each collection in the order it was defined '''
+
+        collections:dict[str, list[dict]] = {}
+        for fixture in self._fixtures:
+            collections.setdefault(fixture.collection_name, []).append(fixture.data)
+
+        return collections
+
+
+    @staticmethod
+    def get_content_hash(documents:list[dict]) -> str:
+        ''' Get a hash of the BSON encoding of fixture data '''
+
+        content_hash = hashlib.sha256()
+        for document in documents:
+            content_hash.update(bson.encode(document))
+
+        return content_hash.hexdigest()
     
 
     def __len__(self):
-        return len(self._fixtures)
+        return len(self._fixtures) + len(self._files)
+
+
+class _Fixture_Set:
+    ''' The fixtures defined for a collection '''
+
+    def __init__(self, collection_name:str, documents:list[dict]) -> None:
+        self.collection_name = collection_name
+        self.documents = documents
+
+    
+    @property
+    def set_id(self) -> str:
+        return self.collection_name
+
+
+    def get_content_hash(self) -> str:
+        return MongoDB_Fixtures.get_content_hash(self.documents)
+
+
+    def get_documents(self) -> Iterator[dict]:
+        return iter(self.documents)
@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Any, Optional
+
+from pymongo import ReadPreference
+from pymongo.monitoring import TopologyListener
+
+from ...utils.logging.loggers.database import DatabaseLogger
+
+class MongoDB_Health_Monitor(TopologyListener):
+    ''' Tracks whether a MongoDB client can reach the database so
+        requests don't wait for the server selection timeout to find out
+
+        The state is updated from the topology events the driver sends
+        after each of its background heartbeats, so checking it is free.
+        If the database goes down the circuit opens and `allow_request()`
+        is False until it is reachable again. While it is open the database
+        is pinged in the background every `retry_seconds` and the circuit
+        closes as soon as a ping or a driver heartbeat succeeds
+        ```
+        monitor = MongoDB_Connection_Manager.get_health_monitor(settings)
+        if not monitor.allow_request():
+            # Fail fast
+        ```
+    '''
+
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(self, retry_seconds:float=5) -> None:
+        self.retry_seconds = retry_seconds
+        # Client pinged by probes. Set once the client is created
+        self.client:Any = None
+        # None until the database is pinged or the driver checks it
+        self.available:Optional[bool] = None
+        self.last_error:Optional[str] = None
+
+        self._lock = threading.Lock()
+        # When the circuit opened or was last probed
+        self._checked_at = 0.0
+        self._probing = False
+
+        # Times the circuit opened
+        self.trips = 0
+        self.rejected = 0
+        self.probes = 0
+
+
+    @property
+    def state(self) -> str:
+        return self.OPEN if self.available is False else self.CLOSED
+
+
+    def allow_request(self) -> bool:
+        ''' Check if requests should use the database. Starts a
+            background probe if the circuit is open and one is due
+        '''
+
+        if self.available is not False:
+            return True
+
+        with self._lock:
+            self.rejected += 1
+            if not self._probing and time.monotonic() - self._checked_at >= self.retry_seconds:
+                self._probing = True
+                threading.Thread(target=self.probe, name="mongodb-health-probe", daemon=True).start()
+
+        return False
+
+
+    def is_available(self) -> bool:
+        ''' Check if the database is reachable. It is pinged the
+            first time if the driver hasn't checked it yet
+        '''
+
+        if self.available is None:
+            self.probe()
+
+        return bool(self.available)
+
+
+    def probe(self) -> bool:
+        ''' Ping the database and update the state '''
+
+        self.probes += 1
+        self._checked_at = time.monotonic()
+        try:
+            self.client.admin.command('ping')
+            self.record_success()
+        except Exception as e:
+            self.record_failure(e)
+        finally:
+            self._probing = False
+
+        return bool(self.available)
+
+
+    def record_success(self):
+        with self._lock:
+            if self.available is False:
+                DatabaseLogger().warn("* MongoDB is reachable again. Closed the circuit *")
+
+            self.available = True
+            self.last_error = None
+
+
+    def record_failure(self, error:Any):
+        with self._lock:
+            self.last_error = str(error)
+            if self.available is not False:
+                self._checked_at = time.monotonic()
+                self.trips += 1
+                DatabaseLogger().error(f"* MongoDB is unreachable. Opened the circuit: {error} *")
+
+            self.available = False
+
+
+    def get_stats(self) -> dict[str, Any]:
+        ''' Get the state of the circuit and the number of rejected requests and probes '''
+
+        return {
+            'state': self.state,
+            'available': self.available,
+            'trips': self.trips,
+            'rejected': self.rejected,
+            'probes': self.probes,
+            'last_error': self.last_error
+        }
+
+
+    # Topology events sent by the driver after its heartbeats
+
+    def opened(self, event:Any):
+        pass
+
+
+    def description_changed(self, event:Any):
+        description = event.new_description
+        # Only open the circuit when no data bearing server is reachable. Losing the
+        # primary (like during an election) still leaves secondaries for reads
+        if description.has_readable_server(ReadPreference.NEAREST):
+            self.record_success()
+        # Servers are unknown before the first heartbeat. Only count them once a check failed
+        elif errors:=[server.error for server in description.server_descriptions().values() if server.error]:
+            self.record_failure(errors[0])
+
+
+    def closed(self, event:Any):
+        pass
@@ -1,2 +1,3 @@
 from .base import MongoDB_Index
 from .indices import MongoDB_Indices
+from .builder import MongoDB_Index_Builder
@@ -1,16 +1,47 @@
-from typing import Optional
+import traceback
+from typing import Any, Optional, Union
+
+from pymongo import HASHED, TEXT
+
 from ....config.enums.mongodb_index_types import MONGODB_INDEX_TYPES
+from ....database.errors.database_error import DatabaseError
 
 class MongoDB_Index:
-    ''' Stores MongoDB index information '''
+    ''' Stores MongoDB index information
+
+        Compound indices can have any number of fields. Each index passed
+        as a `compound_index` (or in a list of them) adds its fields after
+        the field of this index
+        ```
+        MongoDB_Index("orders", "customer_id", compound_index=[
+            MongoDB_Index("orders", "status"),
+            MongoDB_Index("orders", "created_at", order=-1)
+        ], partial_filter={"status": "open"})
+
+        MongoDB_Index("sessions", "created_at", expire_after_seconds=3600)
+        MongoDB_Index("events", "user_id", is_hashed=True)
+        MongoDB_Index("products", "attributes.$**")
+        MongoDB_Index("users", "email", properties={"unique": True}, critical=True)
+        ```
+    '''
+
+    # Options compared with the indices in the database. They are false or unset by default
+    COMPARED_OPTIONS = ['unique', 'sparse', 'partialFilterExpression', 'expireAfterSeconds', 'hidden']
+    # Options that can be changed without rebuilding the index
+    MODIFIABLE_OPTIONS = ['expireAfterSeconds', 'hidden']
 
     def __init__(self, 
             collection_name:str, 
             field_name:str, 
             order:int=1, 
             properties:Optional[dict]=None, 
-            compound_index:Optional["MongoDB_Index"]=None, 
-            is_text:bool=False
+            compound_index:Optional[Union["MongoDB_Index", list["MongoDB_Index"]]]=None, 
+            is_text:bool=False,
+            is_hashed:bool=False,
+            partial_filter:Optional[dict]=None,
+            expire_after_seconds:Optional[int]=None,
+            hidden:bool=False,
+            critical:bool=False
         ):
 
         self.collection_name = collection_name
@@ -19,6 +50,28 @@ class MongoDB_Index:
         self.properties = properties or {}
         self.compound_index = compound_index
         self.is_text = is_text
+        self.is_hashed = is_hashed
+        # Only documents that match the filter are indexed
+        self.partial_filter = partial_filter
+        # Documents are deleted this many seconds after the date in the field (TTL index)
+        self.expire_after_seconds = expire_after_seconds
+        # Hidden indices are kept up to date but not used by queries
+        self.hidden = hidden
+        # The application isn't ready for traffic until critical indices exist
+        self.critical = critical
+
+        if is_text and is_hashed:
+            raise DatabaseError(
+                f'Error in index definitions for collection [{collection_name}]. The index on field [{field_name}] cannot be a text and a hashed index',
+                stack_trace=traceback.format_exc()
+            )
+
+        if expire_after_seconds is not None and len(self.keys) > 1:
+            raise DatabaseError(
+                f'Error in index definitions for collection [{collection_name}]. The TTL index on field [{field_name}] cannot be a compound index',
+                stack_trace=traceback.format_exc()
+            )
+
 
     @property
     def index_type(self) -> str:
@@ -28,5 +81,100 @@ class MongoDB_Index:
             return MONGODB_INDEX_TYPES.TEXT
         elif self.compound_index:
             return MONGODB_INDEX_TYPES.COMPOUND
+        elif self.is_hashed:
+            return MONGODB_INDEX_TYPES.HASHED
+        elif '$**' in self.field_name:
+            return MONGODB_INDEX_TYPES.WILDCARD
         else:
             return MONGODB_INDEX_TYPES.STANDARD
+
+
+    @property
+    def compound_indices(self) -> list["MongoDB_Index"]:
+        ''' Get the indices whose fields come after the field of this index '''
+
+        if isinstance(self.compound_index, MongoDB_Index):
+            return [self.compound_index]
+
+        return list(self.compound_index or [])
+
+
+    @property
+    def keys(self) -> list[tuple[str, Union[int, str]]]:
+        ''' Get the fields of the index and their order in the format used by `create_index()` '''
+
+        keys:list[tuple[str, Union[int, str]]] = [(self.field_name, TEXT if self.is_text else HASHED if self.is_hashed else self.order)]
+        for index in self.compound_indices:
+            keys.extend(index.keys)
+
+        return keys
+
+
+    @property
+    def name(self) -> str:
+        ''' Get the name of the index. Defaults to the name MongoDB gives it '''
+
+        return self.properties.get('name') or '_'.join(f"{field}_{order}" for field, order in self.keys)
+
+
+    def get_options(self) -> dict[str, Any]:
+        ''' Get the options to create the index with '''
+
+        options = {**self.properties, 'name': self.name}
+        if self.partial_filter is not None:
+            options['partialFilterExpression'] = self.partial_filter
+        if self.expire_after_seconds is not None:
+            options['expireAfterSeconds'] = self.expire_after_seconds
+        if self.hidden:
+            options['hidden'] = True
+
+        return options
+
+
+    def has_same_keys(self, spec:dict) -> bool:
+        ''' Check if an index from `list_indexes()` has the same fields as this index '''
+
+        key = spec.get('key', {})
+        # Text indices are stored as a single `_fts` field with the weights of the indexed fields
+        if self.is_text and '_fts' in key:
+            return key.get('_fts') == TEXT and set(spec.get('weights', {})) == {field for field, order in self.keys if order == TEXT}
+
+        return [(field, self._normalize_order(order)) for field, order in key.items()] == self.keys
+
+
+    def get_changed_options(self, spec:dict) -> dict[str, Any]:
+        ''' Get the options (and fields) of this index that are different from an
+            index from `list_indexes()`. Options that aren't set are None
+        '''
+
+        changes:dict[str, Any] = {}
+        if not self.has_same_keys(spec):
+            changes['key'] = self.keys
+
+        options = self.get_options()
+        for option in self.COMPARED_OPTIONS + [option for option in self.properties if option not in self.COMPARED_OPTIONS]:
+            if option in ['name', 'background']:
+                continue
+
+            declared, existing = options.get(option), spec.get(option)
+            # Nested options like collations have defaults filled in by the database
+            if isinstance(declared, dict) and isinstance(existing, dict) and option != 'partialFilterExpression':
+                existing = {name: value for name, value in existing.items() if name in declared}
+            if self._is_unset(declared) and self._is_unset(existing):
+                continue
+            if declared != existing:
+                changes[option] = declared
+
+        return changes
+
+
+    @staticmethod
+    def _normalize_order(order:Any) -> Union[int, str]:
+        # The database can return directions as floats or 64-bit integers
+        return order if isinstance(order, str) else int(order)
+
+
+    @staticmethod
+    def _is_unset(value:Any) -> bool:
+        # A TTL of 0 seconds is set
+        return value is None or value is False
@@ -0,0 +1,194 @@
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ....database.mongodb.index.base import MongoDB_Index
+from ....database.mongodb.index.indices import MongoDB_Indices
+from ....utils.logging.loggers.database import DatabaseLogger
+
+if TYPE_CHECKING:
+    from ....database.mongodb.database import MongoDB_Database
+
+
+class MongoDB_Index_Builder:
+    ''' Builds the indices of an application and tracks its progress so
+        they can be built in a background thread while the application
+        serves requests
+
+        Collections with a `critical` index are reconciled first. The
+        application is ready once every critical index exists in the
+        database. Other processes (like Gunicorn workers forked after the
+        build started) check the database since they can't see the build
+        ```
+        builder = MongoDB_Index_Builder(database, indices)
+        builder.start()
+        builder.is_ready()
+        ```
+    '''
+
+    PENDING = "pending"
+    BUILDING = "building"
+    FINISHED = "finished"
+    FAILED = "failed"
+
+    def __init__(self, database:"MongoDB_Database", indices:Optional[MongoDB_Indices]=None) -> None:
+        self.database = database
+        self.indices = indices or database.indices
+        self.state = self.PENDING
+        self.error:Optional[str] = None
+        self.results = {'created': 0, 'unchanged': 0, 'modified': 0, 'dropped': 0, 'conflicts': 0}
+
+        collections = self.indices.get_collection_indices()
+        # Collections with a critical index. All indices of a collection are built together
+        self.critical_collections = {
+            name: indices for name, indices in collections.items() if any(index.critical for index in indices)
+        }
+        self.other_collections = {
+            name: indices for name, indices in collections.items() if name not in self.critical_collections
+        }
+        # Names of the collections that were reconciled
+        self.finished_collections:list[str] = []
+
+        self._lock = threading.Lock()
+        self._thread:Optional[threading.Thread] = None
+        self._critical_ready = not self.critical_collections
+        self._started_at:Optional[float] = None
+        self._finished_at:Optional[float] = None
+
+
+    def start(self, on_finish:Optional[Callable[[dict[str, int]], Any]]=None) -> threading.Thread:
+        ''' Build the indices in a background thread. `on_finish` is
+            called with the results in the thread once they are built
+        '''
+
+        def build():
+            try:
+                results = self.build()
+                if on_finish:
+                    on_finish(results)
+            except Exception as e:
+                DatabaseLogger(database=self.database.database_name).error(f"* Failed to build indices in the background: {e} *")
+
+        self._thread = threading.Thread(target=build, name="mongodb-index-builder", daemon=True)
+        self._thread.start()
+        return self._thread
+
+
+    def build(self) -> dict[str, int]:
+        ''' Build the indices. Critical collections are reconciled first.
+            Returns the number of indices that were created, unchanged, modified and dropped
+        '''
+
+        self.state = self.BUILDING
+        self._started_at = time.monotonic()
+        try:
+            for collections in [self.critical_collections, self.other_collections]:
+                if collections:
+                    self.database.reconcile_indices(
+                        MongoDB_Indices(*[index for indices in collections.values() for index in indices]),
+                        on_progress=self._record_progress
+                    )
+                self._critical_ready = True
+
+            self.state = self.FINISHED
+        except Exception as e:
+            self.state = self.FAILED
+            self.error = str(e)
+            raise
+        finally:
+            self._finished_at = time.monotonic()
+
+        return self.results
+
+
+    def _record_progress(self, collection_name:str, results:dict[str, int]):
+        with self._lock:
+            self.finished_collections.append(collection_name)
+            for name, count in results.items():
+                self.results[name] += count
+
+
+    def is_ready(self) -> bool:
+        ''' Check if every critical index exists '''
+
+        if self._critical_ready:
+            return True
+
+        # The build is running in this process so it is tracked here
+        if self._thread and self._thread.is_alive():
+            return False
+
+        # Critical indices stay ready once they exist
+        self._critical_ready = self._critical_indices_exist()
+        return self._critical_ready
+
+
+    def _critical_indices_exist(self) -> bool:
+        ''' Check the database for the critical indices. Indices that
+            are still being built aren't returned by `list_indexes()`
+        '''
+
+        try:
+            for collection_name, indices in self.critical_collections.items():
+                specs = list(self.database[collection_name].list_indexes())
+                for index in indices:
+                    if index.critical and not self._has_index(index, specs):
+                        return False
+        except Exception as e:
+            DatabaseLogger(database=self.database.database_name).debug(f"Failed to check critical indices: {e}")
+            return False
+
+        return True
+
+
+    @staticmethod
+    def _has_index(index:MongoDB_Index, specs:list[dict]) -> bool:
+        return any(spec['name'] == index.name or index.has_same_keys(spec) for spec in specs)
+
+
+    def get_progress(self) -> dict[str, Any]:
+        ''' Get the state of the build, the number of collections that were
+            reconciled and the progress of index builds running in the database
+        '''
+
+        elapsed = None
+        if self._started_at is not None:
+            elapsed = round((self._finished_at or time.monotonic()) - self._started_at, 2)
+
+        return {
+            'state': self.state,
+            'critical_ready': self._critical_ready,
+            'collections': {
+                'total': len(self.critical_collections) + len(self.other_collections),
+                'finished': len(self.finished_collections)
+            },
+            'results': dict(self.results),
+            'builds': self.get_running_builds() if self.state == self.BUILDING else [],
+            'elapsed_seconds': elapsed,
+            'error': self.error
+        }
+
+
+    def get_running_builds(self) -> list[dict[str, Any]]:
+        ''' Get the progress of the index builds running in the database
+            from `$currentOp`. Empty if the user can't see operations
+        '''
+
+        pattern = f"^{re.escape(self.database.database_name)}\\."
+        try:
+            operations = self.database.get_client().admin.aggregate([
+                {'$currentOp': {'allUsers': True}},
+                {'$match': {'ns': {'$regex': pattern}, 'msg': {'$regex': '^Index Build'}}}
+            ])
+            return [
+                {
+                    'collection': operation['ns'].split('.', 1)[1],
+                    'message': operation.get('msg'),
+                    'done': operation.get('progress', {}).get('done'),
+                    'total': operation.get('progress', {}).get('total')
+                }
+                for operation in operations
+            ]
+        except Exception:
+            return []
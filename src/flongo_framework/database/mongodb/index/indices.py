@@ -15,6 +15,16 @@ class MongoDB_Indices:
         self._indices.append(index)
 
 
+    def get_collection_indices(self) -> dict[str, list[MongoDB_Index]]:
+        ''' Get the stored indices grouped by the collection they are for '''
+
+        collections:dict[str, list[MongoDB_Index]] = {}
+        for index in self._indices:
+            collections.setdefault(index.collection_name, []).append(index)
+
+        return collections
+
+
     def __iter__(self):
         # Return the iterator object (in this case, self)
         return self
@@ -0,0 +1,2 @@
+from .event_loop import App_Event_Loop
+from .asgi_adapter import ASGI_Adapter
\ No newline at end of file
@@ -0,0 +1,189 @@
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+from .event_loop import App_Event_Loop
+from ...utils.logging.loggers.app import ApplicationLogger
+
+class ASGI_Adapter:
+    ''' Serves a WSGI application (like the Flask app) with an ASGI server
+
+        Requests are received on the server's event loop, which becomes the
+        App_Event_Loop so async handlers and async MongoDB clients run on it.
+        The WSGI application runs in a pool of at most `max_threads` threads.
+        Request and response bodies are streamed between the thread and the
+        event loop instead of being buffered
+        ```
+        uvicorn module:application.asgi_app
+        ```
+    '''
+
+    def __init__(self, wsgi_app:Callable, max_threads:int=64) -> None:
+        self.wsgi_app = wsgi_app
+        self.max_threads = max_threads
+        self.executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="asgi-worker")
+
+
+    async def __call__(self, scope:dict, receive:Callable, send:Callable):
+        App_Event_Loop.set_loop(asyncio.get_running_loop())
+
+        if scope['type'] == 'lifespan':
+            return await self._handle_lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f"ASGI_Adapter: Scope type [{scope['type']}] is not supported")
+
+        loop = asyncio.get_running_loop()
+        environ = self.get_environ(scope, _ASGI_Input(receive, loop))
+        await loop.run_in_executor(self.executor, self._run_wsgi_app, environ, send, loop)
+
+
+    @staticmethod
+    def get_environ(scope:dict, body:Any) -> dict:
+        ''' Create a WSGI environ for an ASGI HTTP scope '''
+
+        server_name, server_port = scope.get('server') or ('localhost', 80)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+            'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+            'SERVER_NAME': server_name,
+            'SERVER_PORT': str(server_port),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.input_terminated': True,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+
+        if client:=scope.get('client'):
+            environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = client[0], str(client[1])
+
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin1').upper().replace('-', '_')
+            value = value.decode('latin1')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = f'HTTP_{name}'
+
+            # Join repeated headers like a WSGI server would
+            environ[name] = f"{environ[name]},{value}" if name in environ else value
+
+        return environ
+
+
+    def _run_wsgi_app(self, environ:dict, send:Callable, loop:asyncio.AbstractEventLoop):
+        ''' Run the WSGI application in a worker thread and send its response '''
+
+        def send_message(message:dict):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response_start:dict = {}
+        def start_response(status:str, headers:list, exc_info:Optional[Any]=None):
+            if exc_info and response_start.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+
+            response_start.update({
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers]
+            })
+
+        def send_start():
+            if not response_start.get('sent'):
+                response_start['sent'] = True
+                send_message({'type': 'http.response.start', 'status': response_start['status'], 'headers': response_start['headers']})
+
+        body:Optional[Iterable[bytes]] = None
+        try:
+            body = self.wsgi_app(environ, start_response)
+            for chunk in body:
+                if chunk:
+                    send_start()
+                    send_message({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+            send_start()
+            send_message({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        except Exception as e:
+            ApplicationLogger.error(f"ASGI_Adapter: Error handling request [{environ.get('PATH_INFO')}]: {e}")
+            if not response_start.get('sent'):
+                response_start.update({'status': 500, 'headers': [(b'content-type', b'text/plain')]})
+                send_start()
+                send_message({'type': 'http.response.body', 'body': b'Internal Server Error', 'more_body': False})
+        finally:
+            if close:=getattr(body, 'close', None):
+                close()
+
+
+    async def _handle_lifespan(self, receive:Callable, send:Callable):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+class _ASGI_Input:
+    ''' File-like WSGI input that reads the ASGI request body as it is received '''
+
+    def __init__(self, receive:Callable, loop:asyncio.AbstractEventLoop) -> None:
+        self._receive = receive
+        self._loop = loop
+        self._buffer = bytearray()
+        self._finished = False
+        self._lock = threading.Lock()
+
+
+    def _fill(self, size:int=-1):
+        ''' Receive body chunks until `size` bytes are buffered or the body ends '''
+
+        while not self._finished and (size < 0 or len(self._buffer) < size):
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._finished = True
+                break
+
+            self._buffer.extend(message.get('body', b''))
+            self._finished = not message.get('more_body', False)
+
+
+    def read(self, size:Optional[int]=-1) -> bytes:
+        with self._lock:
+            size = -1 if size is None else size
+            self._fill(size)
+            if size < 0:
+                size = len(self._buffer)
+
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            return data
+
+
+    def readline(self, size:Optional[int]=-1) -> bytes:
+        with self._lock:
+            size = -1 if size is None else size
+            while b'\n' not in self._buffer and not self._finished and (size < 0 or len(self._buffer) < size):
+                self._fill(len(self._buffer) + 1)
+
+            end = self._buffer.find(b'\n') + 1 or len(self._buffer)
+            if size >= 0:
+                end = min(end, size)
+
+            data = bytes(self._buffer[:end])
+            del self._buffer[:end]
+            return data
+
+
+    def readlines(self, hint:int=-1) -> list[bytes]:
+        return list(iter(self.readline, b''))
+
+
+    def __iter__(self):
+        return iter(self.readline, b'')
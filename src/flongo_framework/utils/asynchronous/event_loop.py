@@ -0,0 +1,118 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+class App_Event_Loop:
+    ''' The asyncio event loop of a worker process that async request
+        handlers and async MongoDB clients run on
+
+        When the application is served with ASGI the server's event
+        loop is used. Otherwise a loop is started in a background thread
+        the first time it is needed. Sync code (like the request pipeline
+        running in a thread) can run a coroutine on it and wait for the result
+        ```
+        result = App_Event_Loop.run(handler(request))
+        ```
+        The loop is never shared across a fork. If the process ID changes
+        a new loop is started in the child
+    '''
+
+    _lock = threading.RLock()
+    _pid = os.getpid()
+    _loop:Optional[asyncio.AbstractEventLoop] = None
+    _thread:Optional[threading.Thread] = None
+
+
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        ''' Get the event loop for this process, starting one if needed '''
+
+        if cls._pid != os.getpid():
+            cls.reset()
+
+        if (loop:=cls._loop) and not loop.is_closed():
+            return loop
+
+        with cls._lock:
+            if not cls._loop or cls._loop.is_closed():
+                cls._loop = asyncio.new_event_loop()
+                cls._thread = threading.Thread(target=cls._run_forever, args=(cls._loop,), name="app-event-loop", daemon=True)
+                cls._thread.start()
+
+            return cls._loop
+
+
+    @classmethod
+    def set_loop(cls, loop:asyncio.AbstractEventLoop):
+        ''' Use an event loop that is already running (like the loop of an ASGI server) '''
+
+        with cls._lock:
+            if loop is not cls._loop:
+                cls._stop_background_loop()
+                cls._pid = os.getpid()
+                cls._loop = loop
+
+
+    @classmethod
+    def run(cls, awaitable:Awaitable, timeout:Optional[float]=None) -> Any:
+        ''' Run a coroutine on the event loop from sync code and return its result.
+            Context variables (like the Flask request context) are passed to it.
+            If it doesn't finish within `timeout` seconds it is cancelled and
+            a `concurrent.futures.TimeoutError` is raised (the builtin TimeoutError from Python 3.11)
+        '''
+
+        loop = cls.get_loop()
+        if cls._is_loop_thread(loop):
+            raise RuntimeError("App_Event_Loop.run() can't be called from the event loop thread. Await the coroutine instead")
+
+        future = asyncio.run_coroutine_threadsafe(cls._await(awaitable), loop)
+        try:
+            return future.result(timeout)
+        # Not the builtin TimeoutError before Python 3.11
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+
+    @classmethod
+    def reset(cls):
+        ''' Forget the current loop. Called in a child process after a fork '''
+
+        cls._lock = threading.RLock()
+        cls._pid = os.getpid()
+        cls._loop = None
+        cls._thread = None
+
+
+    @staticmethod
+    async def _await(awaitable:Awaitable) -> Any:
+        return await awaitable
+
+
+    @staticmethod
+    def _run_forever(loop:asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+
+    @staticmethod
+    def _is_loop_thread(loop:asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+
+    @classmethod
+    def _stop_background_loop(cls):
+        if cls._thread and cls._loop and cls._pid == os.getpid():
+            cls._loop.call_soon_threadsafe(cls._loop.stop)
+
+        cls._thread = None
+
+
+# Never re-use a loop started before a fork in the child process
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=App_Event_Loop.reset)
@@ -0,0 +1,2 @@
+from .ttl_cache import TTL_Cache
+from .single_flight import Single_Flight
\ No newline at end of file
@@ -0,0 +1,86 @@
+import threading
+from typing import Any, Callable, Hashable, Optional
+
+class Single_Flight:
+    ''' Thread-safe de-duplication of concurrent calls with the same key
+
+        The first caller of a key runs the function. Callers with the same
+        key that arrive while it is running wait for and share its result
+        instead of running the function again
+        ```
+        calls = Single_Flight()
+        result, shared = calls.do(key, lambda: collection.find_one(query), timeout=5)
+        ```
+        If the first call raises an exception or doesn't finish within
+        `timeout` seconds, waiting callers run the function themselves
+    '''
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls:dict[Hashable, _Call] = {}
+
+        self.leaders = 0
+        self.shared = 0
+        self.timeouts = 0
+        self.failures = 0
+
+
+    def do(self, key:Hashable, func:Callable[[], Any], timeout:Optional[float]=None) -> tuple[Any, bool]:
+        ''' Run a function or wait for the running call with the same key.
+            Returns the result and True if it came from another caller
+        '''
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                is_leader = True
+            else:
+                is_leader = False
+
+        if is_leader:
+            try:
+                call.result = func()
+                call.succeeded = True
+                return call.result, False
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if not call.done.wait(timeout):
+            with self._lock:
+                self.timeouts += 1
+            return func(), False
+
+        if not call.succeeded:
+            with self._lock:
+                self.failures += 1
+            return func(), False
+
+        with self._lock:
+            self.shared += 1
+        return call.result, True
+
+
+    def get_stats(self) -> dict[str, int]:
+        ''' Get the number of calls that ran, were shared, timed out or fell back after an error '''
+
+        with self._lock:
+            return {
+                'leaders': self.leaders,
+                'shared': self.shared,
+                'timeouts': self.timeouts,
+                'failures': self.failures,
+                'in_flight': len(self._calls)
+            }
+
+
+class _Call:
+    ''' A running call and its result '''
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result:Any = None
+        self.succeeded = False
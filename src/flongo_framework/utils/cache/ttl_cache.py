@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+class TTL_Cache:
+    ''' Thread-safe in-memory cache where entries expire `ttl_seconds`
+        after they are set. Holds at most `max_entries` entries and
+        evicts the least recently used entry when it is full
+        ```
+        cache = TTL_Cache(ttl_seconds=30)
+        total = cache.get_or_set(key, lambda: collection.count_documents(query))
+        ```
+        If `max_bytes` is set, entries are also evicted to keep the total
+        size (measured with `get_size`) under it. Values that grow after
+        they are set are measured again with `resize()`. Hits, misses, evictions
+        and expirations are counted and returned by `get_stats()`
+    '''
+
+    def __init__(self,
+            ttl_seconds:float=60,
+            max_entries:int=1024,
+            max_bytes:Optional[int]=None,
+            get_size:Optional[Callable[[Any], int]]=None
+        ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.get_size = get_size or (lambda value: 1)
+        self._lock = threading.Lock()
+        # Key -> (expiration time, value, size)
+        self._entries:OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+    def get(self, key:Hashable, default:Any=None) -> Any:
+        ''' Get a value if it is cached and has not expired '''
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+
+    def set(self, key:Hashable, value:Any, ttl_seconds:Optional[float]=None):
+        ''' Cache a value, evicting the least recently used entries if the cache is full '''
+
+        expires = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        size = self.get_size(value) if self.max_bytes else 0
+        # Never cache a value that could never fit
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+
+    def resize(self, key:Hashable):
+        ''' Measure a cached value again after it grew, evicting the
+            least recently used entries if the cache is over `max_bytes`
+        '''
+
+        if not self.max_bytes:
+            return
+
+        with self._lock:
+            if (entry:=self._entries.get(key)) is None:
+                return
+
+            size = self.get_size(entry[1])
+            self._entries[key] = (entry[0], entry[1], size)
+            self._bytes += size - entry[2]
+            while self._entries and self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+
+    def get_or_set(self, key:Hashable, get_value:Callable[[], Any]) -> Any:
+        ''' Get a cached value or compute and cache it if it is missing '''
+
+        _missing = object()
+        if (value:=self.get(key, _missing)) is _missing:
+            value = get_value()
+            self.set(key, value)
+
+        return value
+
+
+    def delete(self, key:Hashable):
+        with self._lock:
+            self._remove(key)
+
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+    def get_stats(self) -> dict[str, int]:
+        ''' Get the counters and current size of the cache '''
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'entries': len(self._entries),
+            'bytes': self._bytes
+        }
+
+
+    def _remove(self, key:Hashable):
+        if (entry:=self._entries.pop(key, None)) is not None:
+            self._bytes -= entry[2]
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,2 @@
+from .http_compression import HTTP_Compression
+from .request_decompression import Request_Decompression
\ No newline at end of file
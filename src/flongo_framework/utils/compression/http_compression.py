@@ -0,0 +1,272 @@
+import re
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+
+from flask import Response, current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class HTTP_Compression:
+    ''' Compresses response bodies with the best encoding the client
+        accepts (`Accept-Encoding`) out of `algorithms`, in order of preference
+
+        `gzip` is always available. `br` and `zstd` are used when the
+        `brotli` and `zstandard` packages are installed. Responses smaller
+        than `min_size` bytes, responses that aren't text (like images)
+        and file downloads are sent as they are. Streamed responses are
+        compressed chunk by chunk so they are still sent incrementally
+
+        Routes opt out with `Route(compress=False)`. Compressed bodies of
+        cached responses are kept with them so they are compressed once
+    '''
+
+    # Encodings that can be used with the installed libraries
+    ENCODINGS = ['gzip', 'deflate'] + (['br'] if brotli else []) + (['zstd'] if zstandard else [])
+    # Encodings that responses are compressed with. Deflate is left out since clients disagree on its format
+    RESPONSE_ENCODINGS = [encoding for encoding in ENCODINGS if encoding != 'deflate']
+
+    # Levels that trade some compression for speed since responses are compressed on every request
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 4
+    ZSTD_LEVEL = 3
+
+    # Mimetypes of bodies that compress well
+    COMPRESSIBLE_MIMETYPES = re.compile(r'^text/|^application/(.+\+)?(json|xml|javascript|x-ndjson)$')
+    # Statuses without a body or with a body that is part of another one
+    UNCOMPRESSED_STATUSES = {204, 206, 304}
+
+    def __init__(self, algorithms:Optional[list[str]]=None, min_size:int=1024) -> None:
+        self.algorithms = [algorithm.lower() for algorithm in algorithms or [] if algorithm]
+        for algorithm in self.algorithms:
+            if algorithm not in ['br', 'zstd', 'gzip']:
+                raise ValueError(f"Compression: [{algorithm}] is not a valid compression algorithm.")
+
+        # Algorithms whose libraries aren't installed are skipped
+        self.algorithms = [algorithm for algorithm in self.algorithms if algorithm in self.RESPONSE_ENCODINGS]
+        self.min_size = min_size
+
+
+    def negotiate(self, accept_encodings:Any) -> Optional[str]:
+        ''' Get the encoding to compress a response with from the `Accept-Encoding` of a request '''
+
+        best, best_quality = None, 0.0
+        for algorithm in self.algorithms:
+            # Ties go to the algorithm that was listed first
+            if (quality:=accept_encodings[algorithm]) > best_quality:
+                best, best_quality = algorithm, quality
+
+        return best
+
+
+    def compress_response(self, response:Response) -> Response:
+        ''' Compress a response for the current request if it should be compressed.
+            Registered to run after every request
+        '''
+
+        if not self.algorithms or not self._should_compress(response):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if not (encoding:=self.negotiate(request.accept_encodings)):
+            return response
+
+        if response.is_streamed:
+            response.response = self.compress_chunks(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            # Compressed bodies of cached responses (see Route_Cache)
+            compressed_bodies:Optional[dict[str, bytes]] = getattr(response, 'compressed_bodies', None)
+            if compressed_bodies is not None and encoding in compressed_bodies:
+                body = compressed_bodies[encoding]
+            else:
+                data = response.get_data()
+                if len(data) < self.min_size:
+                    return response
+
+                body = self.compress(data, encoding)
+                if compressed_bodies is not None:
+                    compressed_bodies[encoding] = body
+
+            response.set_data(body)
+
+        response.headers['Content-Encoding'] = encoding
+        # The compressed body is not byte for byte the same as the body the ETag was made for
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
+
+
+    def _should_compress(self, response:Response) -> bool:
+        if response.status_code in self.UNCOMPRESSED_STATUSES or response.status_code < 200:
+            return False
+        if 'Content-Encoding' in response.headers or response.direct_passthrough:
+            return False
+        if not response.mimetype or not self.COMPRESSIBLE_MIMETYPES.match(response.mimetype):
+            return False
+
+        # Routes registered with `compress=False`
+        view = current_app.view_functions.get(request.endpoint or '')
+        return getattr(view, 'compress', True)
+
+
+    @classmethod
+    def compress(cls, data:bytes, encoding:str) -> bytes:
+        ''' Compress bytes with an encoding '''
+
+        compressor = cls.get_compressor(encoding)
+        return compressor.compress(data) + compressor.finish()
+
+
+    @classmethod
+    def compress_chunks(cls, chunks:Iterable[bytes], encoding:str) -> Iterator[bytes]:
+        ''' Compress a streamed body, flushing after each chunk so
+            the client can decode it before the stream finishes
+        '''
+
+        compressor = cls.get_compressor(encoding)
+        try:
+            for chunk in chunks:
+                if data:=compressor.compress(chunk, flush=True):
+                    yield data
+
+            yield compressor.finish()
+        finally:
+            if close:=getattr(chunks, 'close', None):
+                close()
+
+
+    @classmethod
+    def get_compressor(cls, encoding:str) -> "_Compressor":
+        if encoding == 'gzip':
+            return _Compressor(zlib.compressobj(cls.GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS))
+        if encoding == 'deflate':
+            return _Compressor(zlib.compressobj(cls.GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS))
+        if encoding == 'br' and brotli:
+            return _Brotli_Compressor(brotli.Compressor(quality=cls.BROTLI_QUALITY))
+        if encoding == 'zstd' and zstandard:
+            return _Zstd_Compressor(zstandard.ZstdCompressor(level=cls.ZSTD_LEVEL).compressobj())
+
+        raise ValueError(f"Compression: [{encoding}] is not a supported encoding.")
+
+
+    @classmethod
+    def get_decompressor(cls, encoding:str) -> Optional["_Decompressor"]:
+        ''' Get a decompressor for an encoding or None if it isn't supported '''
+
+        if encoding in ['gzip', 'x-gzip']:
+            return _Zlib_Decompressor(zlib.decompressobj(16 + zlib.MAX_WBITS))
+        if encoding == 'deflate':
+            return _Zlib_Decompressor(zlib.decompressobj(zlib.MAX_WBITS))
+        # Older versions of brotli can't limit the size of their output
+        if encoding == 'br' and brotli and hasattr(brotli.Decompressor, 'can_accept_more_data'):
+            return _Brotli_Decompressor(brotli.Decompressor())
+        if encoding == 'zstd' and zstandard:
+            return _Decompressor(zstandard.ZstdDecompressor().decompressobj())
+
+        return None
+
+
+class _Compressor:
+    ''' Compresses data incrementally with a `zlib` compression object '''
+
+    def __init__(self, compressor:Any) -> None:
+        self._compressor = compressor
+
+
+    def compress(self, data:bytes, flush:bool=False) -> bytes:
+        data = self._compressor.compress(data)
+        return data + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else data
+
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _Brotli_Compressor(_Compressor):
+    def compress(self, data:bytes, flush:bool=False) -> bytes:
+        data = self._compressor.process(data)
+        return data + self._compressor.flush() if flush else data
+
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd_Compressor(_Compressor):
+    def compress(self, data:bytes, flush:bool=False) -> bytes:
+        data = self._compressor.compress(data)
+        return data + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else data # type: ignore
+
+
+class _Decompressor:
+    ''' Decompresses data incrementally with a `zstandard` decompression object.
+        It can't stop after `max_length` bytes so input is passed to it in pieces
+        that can't decompress to much more than that. The rest is kept for later calls
+    '''
+
+    # Most bytes a byte of zstd input can decompress to (a 128KB RLE block is 4 bytes)
+    MAX_EXPANSION = 32 * 1024
+
+    def __init__(self, decompressor:Any) -> None:
+        self._decompressor = decompressor
+        self._input = b''
+
+
+    @property
+    def needs_input(self) -> bool:
+        ''' True if all the data that was passed has been decompressed '''
+
+        return not self._input
+
+
+    def decompress(self, data:bytes, max_length:int) -> bytes:
+        ''' Decompress data into at most about `max_length` bytes (if it isn't 0) '''
+
+        self._input += data
+        size = max(max_length // self.MAX_EXPANSION, 1) if max_length else len(self._input)
+        data, self._input = self._input[:size], self._input[size:]
+        return self._decompressor.decompress(data)
+
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.eof
+
+
+class _Zlib_Decompressor(_Decompressor):
+    @property
+    def needs_input(self) -> bool:
+        return not self._decompressor.unconsumed_tail
+
+
+    def decompress(self, data:bytes, max_length:int) -> bytes:
+        return self._decompressor.decompress(self._decompressor.unconsumed_tail + data, max_length)
+
+
+class _Brotli_Decompressor(_Decompressor):
+    @property
+    def needs_input(self) -> bool:
+        return self._decompressor.can_accept_more_data()
+
+
+    def decompress(self, data:bytes, max_length:int) -> bytes:
+        if max_length:
+            return self._decompressor.process(data, output_buffer_limit=max_length)
+
+        return self._decompressor.process(data)
+
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.is_finished()
@@ -0,0 +1,101 @@
+import io
+from typing import IO, Any, Callable, Iterable, Optional
+
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge, UnsupportedMediaType
+from werkzeug.wsgi import get_input_stream
+
+from .http_compression import HTTP_Compression, _Decompressor
+from ..json.json_engine import JSON_Engine
+
+class Request_Decompression:
+    ''' WSGI middleware that decompresses request bodies sent with a
+        `Content-Encoding` (gzip, deflate, br or zstd) while they are
+        read so handlers and the RequestDataParser get the decoded body
+
+        Bodies that decompress to more than `max_size` bytes (if it isn't
+        None) are cut off with a `413 Content Too Large` so small compressed
+        bodies can't expand into huge ones (decompression bombs). Bodies with
+        an encoding that isn't supported get a `415 Unsupported Media Type`
+    '''
+
+    def __init__(self, wsgi_app:Callable, max_size:Optional[int]=10 * 1024 * 1024) -> None:
+        self.wsgi_app = wsgi_app
+        self.max_size = max_size
+
+
+    def __call__(self, environ:dict, start_response:Callable) -> Iterable[bytes]:
+        encoding = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding and encoding != 'identity':
+            if not (decompressor:=HTTP_Compression.get_decompressor(encoding)):
+                return self._send_error(
+                    UnsupportedMediaType(f"Content-Encoding [{encoding}] is not supported. Use one of {HTTP_Compression.ENCODINGS}"),
+                    environ,
+                    start_response
+                )
+
+            # The decoded body has no known length so it is read until it ends
+            environ['wsgi.input'] = _Decompressing_Stream(get_input_stream(environ), decompressor, self.max_size)
+            environ['wsgi.input_terminated'] = True
+            environ.pop('CONTENT_LENGTH', None)
+            del environ['HTTP_CONTENT_ENCODING']
+
+        return self.wsgi_app(environ, start_response)
+
+
+    @staticmethod
+    def _send_error(error:Any, environ:dict, start_response:Callable) -> Iterable[bytes]:
+        ''' Send an error in the same format as API_Errors '''
+
+        body = JSON_Engine.dumpb({'error': error.description, 'traceback': None, 'additional_data': {}})
+        start_response(f"{error.code} {error.name}", [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+        return [body]
+
+
+class _Decompressing_Stream(io.RawIOBase):
+    ''' Request body stream that decompresses the body as it is read and
+        raises a 413 once more than `limit` decompressed bytes are read
+    '''
+
+    # Compressed bytes read from the request body at a time
+    CHUNK_SIZE = 1024
+    # Most decompressed bytes produced at a time
+    OUTPUT_SIZE = 1024 * 1024
+
+    def __init__(self, stream:IO[bytes], decompressor:_Decompressor, limit:Optional[int]) -> None:
+        self._stream = stream
+        self._decompressor = decompressor
+        self._limit = limit
+        self._read = 0
+        self._buffer = b''
+
+
+    def readable(self) -> bool:
+        return True
+
+
+    def readinto(self, buffer:Any) -> int:
+        while not self._buffer:
+            # Data after the end of the compressed body is ignored
+            if self._decompressor.eof:
+                return 0
+
+            data = b''
+            # Input left over from the last read is decompressed before more is read
+            if self._decompressor.needs_input and not (data:=self._stream.read(self.CHUNK_SIZE)):
+                raise BadRequest("The compressed request body is incomplete")
+
+            try:
+                # Decompress at most one byte past the limit to tell a body at the limit from a larger one
+                max_length = min(self._limit - self._read + 1, self.OUTPUT_SIZE) if self._limit is not None else self.OUTPUT_SIZE
+                self._buffer = self._decompressor.decompress(data, max_length)
+            except Exception:
+                raise BadRequest("The compressed request body could not be decompressed")
+
+            self._read += len(self._buffer)
+            if self._limit is not None and self._read > self._limit:
+                raise RequestEntityTooLarge(f"The decompressed request body must be at most [{self._limit}] bytes")
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
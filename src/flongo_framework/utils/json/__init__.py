@@ -1,2 +1,3 @@
 from .json_encoder import JSON_Encoder
+from .json_engine import JSON_Engine
 from .json_provider import JSON_Provider
@@ -1,39 +1,60 @@
 
-from datetime import datetime
+from datetime import date
 from json import JSONEncoder
 from decimal import Decimal
+from typing import Any, Callable
 
 from bson import ObjectId
 
 from ...utils.logging.loggers.app import ApplicationLogger
 
 class JSON_Encoder(JSONEncoder):
-    ''' Custom JSON serializer '''
+    ''' Custom JSON serializer 
+
+        Non-JSON types are converted by looking up the type of the
+        object in `TYPE_ENCODERS`. Additional types can be supported
+        with `register_type()`
+    '''
+
+    # Converters from non-JSON types to JSON types
+    TYPE_ENCODERS:dict[type, Callable[[Any], Any]] = {
+        # Dates and datetimes are written in ISO 8601 format
+        date: lambda obj: obj.isoformat(),
+        set: list,
+        frozenset: list,
+        Decimal: str,
+        ObjectId: str,
+        bytes: lambda obj: obj.decode(),
+    }
+
+    # Non-JSON types that are serialized as JSON strings
+    STRING_TYPES = (date, Decimal, ObjectId, bytes)
+
+    @classmethod
+    def register_type(cls, data_type:type, encoder:Callable[[Any], Any]):
+        ''' Register a function that converts a type to a JSON type '''
+
+        cls.TYPE_ENCODERS[data_type] = encoder
+
+
+    @classmethod
+    def encode_type(cls, obj:Any) -> Any:
+        ''' Convert a non-JSON object to a JSON type '''
+
+        if encoder:=cls.TYPE_ENCODERS.get(type(obj)):
+            return encoder(obj)
+
+        # Subclasses of registered types use the encoder of their base
+        for data_type, encoder in list(cls.TYPE_ENCODERS.items()):
+            if isinstance(obj, data_type):
+                cls.TYPE_ENCODERS[type(obj)] = encoder
+                return encoder(obj)
+
+        # Write as string on failure
+        ApplicationLogger.warn(f"JSON_Encoder: Could not serialize type [{type(obj)}]")
+
+        return str(obj)
+
 
     def default(self, obj):
-        try:
-            # Handle dates
-            if isinstance(obj, datetime):
-                return obj.strftime("%c")
-            
-            # Handle sets
-            if isinstance(obj, set):
-                return tuple(obj)
-            
-            # Handle decimals
-            if isinstance(obj, Decimal):
-                return str(obj)
-            
-            # Handle ObjectIds
-            if isinstance(obj, ObjectId):
-                return str(obj)
-            
-            # Handle bytes
-            if isinstance(obj, bytes):
-                return obj.decode()
-                
-            return JSONEncoder.default(self, obj)
-        except TypeError:   # Write as string on failure
-            ApplicationLogger.warn(f"JSON_Encoder: Could not serialize type [{type(obj)}]")
-            
-            return str(obj)
\ No newline at end of file
+        return self.encode_type(obj)
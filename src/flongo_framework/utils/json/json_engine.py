@@ -0,0 +1,80 @@
+import json
+from datetime import date
+from typing import Any, Union
+
+from .json_encoder import JSON_Encoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSON_Engine:
+    ''' Encodes and decodes JSON for the application
+
+        Uses `orjson` when it is installed and falls back to the
+        standard library otherwise. Non-JSON types are converted
+        by the JSON_Encoder type registry in both cases
+    '''
+
+    # Name of the engine that is being used
+    NAME = "orjson" if orjson else "json"
+
+    # Compact separators so output is the same for either engine
+    STDLIB_OPTIONS = {"separators": (",", ":"), "ensure_ascii": False}
+
+    # Default datetime encoder. orjson writes datetimes natively in the same format
+    _DATE_ENCODER = JSON_Encoder.TYPE_ENCODERS[date]
+
+    @classmethod
+    def dumpb(cls, obj:Any) -> bytes:
+        ''' Encode an object to JSON bytes '''
+
+        if orjson:
+            try:
+                return orjson.dumps(obj, default=JSON_Encoder.encode_type, option=cls._get_orjson_options())
+            except TypeError:
+                # Values orjson doesn't support (like integers over 64 bits) use the standard library
+                pass
+
+        return cls.stdlib_dumps(obj).encode()
+
+
+    @classmethod
+    def dumps(cls, obj:Any, **kwargs) -> str:
+        ''' Encode an object to a JSON string. Passing standard library
+            `json.dumps` options like `indent` uses the standard library
+        '''
+
+        if kwargs:
+            return cls.stdlib_dumps(obj, **kwargs)
+
+        return cls.dumpb(obj).decode()
+
+
+    @classmethod
+    def stdlib_dumps(cls, obj:Any, **kwargs) -> str:
+        ''' Encode an object to a JSON string with the standard library '''
+
+        return json.dumps(obj, default=JSON_Encoder.encode_type, **{**cls.STDLIB_OPTIONS, **kwargs})
+
+
+    @classmethod
+    def loads(cls, s:Union[str, bytes, bytearray], **kwargs) -> Any:
+        ''' Decode a JSON string or bytes '''
+
+        if orjson and not kwargs:
+            return orjson.loads(s)
+
+        return json.loads(s, **kwargs)
+
+
+    @classmethod
+    def _get_orjson_options(cls) -> int:
+        options = orjson.OPT_NON_STR_KEYS # type: ignore
+        # Send datetimes to the type registry if a custom encoder was registered
+        if JSON_Encoder.TYPE_ENCODERS.get(date) is not cls._DATE_ENCODER:
+            options |= orjson.OPT_PASSTHROUGH_DATETIME # type: ignore
+
+        return options
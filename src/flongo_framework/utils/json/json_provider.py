@@ -1,12 +1,14 @@
 from typing import Union
 from flask.json.provider import JSONProvider
-from .json_encoder import JSON_Encoder
-import json
+from .json_engine import JSON_Engine
 
 class JSON_Provider(JSONProvider):
+    ''' Flask JSON provider (used by `jsonify` and request
+        body parsing) backed by the JSON_Engine
+    '''
     
     def dumps(self, obj, **kwargs):
-        return json.dumps(obj, **kwargs, cls=JSON_Encoder)
+        return JSON_Engine.dumps(obj, **kwargs)
     
     def loads(self, s: Union[str, bytes], **kwargs):
-        return json.loads(s, **kwargs)
+        return JSON_Engine.loads(s, **kwargs)
@@ -1,5 +1,6 @@
 import logging
 from ...config.enums.logs.log_groups import LOG_GROUPS
+from ...config.enums.logs.log_levels import LOG_LEVELS
 from ...utils.logging.logging_util import LoggingUtil
 
 class StatefulLoggingUtil(LoggingUtil):
@@ -40,6 +41,11 @@ class StatefulLoggingUtil(LoggingUtil):
         self._log(msg, logging.getLogger(self.LOGGER_NAME).critical)
 
 
+    def is_enabled_for(self, log_level:str) -> bool:
+        ''' Returns True if a log at the passed level would be emitted '''
+        return logging.getLogger(self.LOGGER_NAME).isEnabledFor(LOG_LEVELS.level_to_int(log_level))
+
+
     def create_logger(self, log_level:str, format:str=''):
         ''' Create a logger with a built-in color formatter '''
 
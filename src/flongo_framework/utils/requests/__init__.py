@@ -1,2 +1,3 @@
 from .request_data_parser import RequestDataParser
-from .schema_validator import JSON_Schema_Validator
+from .schema_validator import JSON_Schema_Validator, Compiled_JSON_Schema_Validator
+from .schema_compiler import JSON_Schema_Compiler
@@ -1,12 +1,15 @@
 
 
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import xmltodict
 from flask import Request
 from QueryStringManager import QueryStringManager
-from ...config.settings import App_Settings
+from ...config.settings import App_Settings, Flask_Settings
 from ...utils.logging.loggers.routing import RoutingLogger
 
+if TYPE_CHECKING:
+    from ...api.routing.route_payload_limits import Route_Payload_Limits
+
 
 class RequestDataParser:
     ''' Utility class that supports parsing a request query parameters
@@ -40,13 +43,17 @@ class RequestDataParser:
 
 
     @classmethod
-    def parse_request_body(cls, request:Request, logger:Optional[RoutingLogger]=None) -> dict:
-        ''' Parse the request body into a dictionary if one is present '''
+    def parse_request_body(cls, request:Request, logger:Optional[RoutingLogger]=None, limits:Optional["Route_Payload_Limits"]=None) -> dict:
+        ''' Parse the request body into a dictionary if one is present. If
+            `limits` are passed, the body is checked against them before or
+            while it is parsed
+        '''
 
         body = {}
         mimetype_suffix = request.mimetype.split('/')[-1]
-        allowed_extensions = App_Settings().flask.allowed_file_extensions or []
         if request.is_json:
+            if limits:
+                limits.check_json(request.get_data(cache=True))
             body = request.get_json()
         
         elif mimetype_suffix == 'plain' and request.data:
@@ -57,9 +64,9 @@ class RequestDataParser:
             body = request.form.to_dict()
         
         elif mimetype_suffix in ['xml', 'html']:
-            body = xmltodict.parse(request.data.decode())
+            body = xmltodict.parse(request.data.decode(), postprocessor=limits.get_xml_postprocessor() if limits else None)
 
-        elif mimetype_suffix in allowed_extensions:
+        elif mimetype_suffix in cls.get_allowed_file_extensions():
             pass
         
         elif request.mimetype and logger:
@@ -69,3 +76,13 @@ class RequestDataParser:
             logger.debug(f"* Parsed REQUEST BODY with MIME type [{request.mimetype}]: {body}")
         
         return body
+
+
+    @staticmethod
+    def get_allowed_file_extensions() -> list[str]:
+        ''' Get the allowed file extensions from the settings of the Flask
+            app without reading the settings from the environment again
+        '''
+
+        flask_settings = Flask_Settings.get_settings_from_flask() or App_Settings().flask
+        return flask_settings.allowed_file_extensions or []
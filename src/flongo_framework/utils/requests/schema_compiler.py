@@ -0,0 +1,326 @@
+import numbers
+import re
+from typing import Any, Callable, Optional
+
+class JSON_Schema_Compiler:
+    ''' Compiles a JSONSchema into a specialized Python function that
+        returns True if a passed payload is valid
+
+        Only a subset of JSONSchema keywords is supported. If a schema
+        uses anything else, `compile()` returns None so the caller can
+        fall back to the `jsonschema` validator
+    '''
+
+    # Drafts where keywords like `items` and `exclusiveMinimum` share the semantics below
+    SUPPORTED_DRAFTS = (
+        "http://json-schema.org/draft-06/schema",
+        "http://json-schema.org/draft-07/schema",
+        "https://json-schema.org/draft/2019-09/schema",
+        "https://json-schema.org/draft/2020-12/schema",
+    )
+
+    SUPPORTED_KEYWORDS = {
+        "type", "properties", "required", "additionalProperties", "items",
+        "enum", "const", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+        "minLength", "maxLength", "pattern", "minItems", "maxItems",
+        "minProperties", "maxProperties", "allOf", "anyOf", "oneOf", "not"
+    }
+
+    # Keywords that never affect validation (`format` is only an annotation by default)
+    ANNOTATION_KEYWORDS = {
+        "$schema", "$id", "$comment", "title", "description", "default",
+        "examples", "format", "readOnly", "writeOnly", "deprecated",
+        "definitions", "$defs"
+    }
+
+    TYPE_CHECKS = {
+        "object": "isinstance({v}, dict)",
+        "array": "isinstance({v}, _ARRAY_TYPES)",
+        "string": "isinstance({v}, _STRING_TYPES)",
+        "boolean": "isinstance({v}, bool)",
+        "null": "{v} is None",
+        "number": "(isinstance({v}, _NUMBER) and not isinstance({v}, bool))",
+        "integer": "((isinstance({v}, int) and not isinstance({v}, bool)) or (isinstance({v}, float) and {v}.is_integer()))",
+    }
+
+    def __init__(self, 
+            json_schema:Any, 
+            string_types:tuple=(str,), 
+            array_types:tuple=(list,), 
+            to_string:Optional[Callable[[Any], str]]=None
+        ) -> None:
+        ''' `string_types` and `array_types` are the Python types accepted as JSON
+            strings and arrays. Non-str string values are converted with `to_string`
+            before checking string keywords like `pattern`
+        '''
+
+        self.json_schema = json_schema
+        self._lines:list[str] = []
+        self._counter = 0
+        self._string = "_to_string({v})" if to_string else "{v}"
+        self._namespace:dict[str, Any] = {
+            "_NUMBER": numbers.Number,
+            "_STRING_TYPES": string_types,
+            "_ARRAY_TYPES": array_types,
+            "_to_string": to_string,
+            "_equal": _json_equal,
+        }
+
+
+    @classmethod
+    def is_supported(cls, json_schema:Any, is_root:bool=True) -> bool:
+        ''' Returns True if every keyword used in the schema can be compiled '''
+
+        if isinstance(json_schema, bool):
+            return True
+
+        if not isinstance(json_schema, dict):
+            return False
+
+        if is_root and (draft:=json_schema.get("$schema")) and draft.rstrip("#") not in cls.SUPPORTED_DRAFTS:
+            return False
+
+        for keyword, value in json_schema.items():
+            if keyword in cls.ANNOTATION_KEYWORDS:
+                continue
+            if keyword not in cls.SUPPORTED_KEYWORDS:
+                return False
+
+            if keyword == "type":
+                types = value if isinstance(value, list) else [value]
+                if not all(t in cls.TYPE_CHECKS for t in types):
+                    return False
+            elif keyword in ("properties",):
+                if not isinstance(value, dict) or not all(cls.is_supported(s, False) for s in value.values()):
+                    return False
+            elif keyword in ("additionalProperties", "items", "not"):
+                if not cls.is_supported(value, False):
+                    return False
+            elif keyword in ("allOf", "anyOf", "oneOf"):
+                if not isinstance(value, list) or not all(cls.is_supported(s, False) for s in value):
+                    return False
+            elif keyword in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"):
+                if isinstance(value, bool) or not isinstance(value, numbers.Number):
+                    return False
+            elif keyword == "pattern":
+                try:
+                    re.compile(value)
+                except (re.error, TypeError):
+                    return False
+
+        return True
+
+
+    def compile(self) -> Optional[Callable[[Any], bool]]:
+        ''' Compile the schema into a function or return None if it is unsupported '''
+
+        try:
+            if not self.is_supported(self.json_schema):
+                return None
+
+            name = self._compile_function(self.json_schema)
+            exec(compile("\n".join(self._lines), "<compiled JSONSchema>", "exec"), self._namespace)
+        # Deeply nested schemas can go past the nesting limits of the Python compiler
+        except (SyntaxError, RecursionError, MemoryError):
+            return None
+
+        return self._namespace[name]
+
+
+    def get_source(self) -> str:
+        ''' Returns the generated source code (for debugging) '''
+
+        return "\n".join(self._lines)
+
+
+    def _name(self, prefix:str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+
+    def _constant(self, value:Any) -> str:
+        ''' Store a value in the namespace of the generated code and return its name '''
+
+        name = self._name("_c")
+        self._namespace[name] = value
+        return name
+
+
+    def _compile_function(self, schema:Any) -> str:
+        ''' Generate a function that returns True if a value matches the schema '''
+
+        name = self._name("_validate")
+        body = self._compile_schema(schema, "v", 1)
+        self._lines.append(f"def {name}(v):")
+        self._lines.extend(body)
+        self._lines.append("    return True")
+        self._lines.append("")
+
+        return name
+
+
+    def _compile_schema(self, schema:Any, v:str, depth:int) -> list[str]:
+        ''' Generate lines that `return False` if the value in `v` doesn't match the schema '''
+
+        pad = "    " * depth
+        if schema is True:
+            return []
+        if schema is False:
+            return [f"{pad}return False"]
+
+        lines = []
+        known_type = None
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            check = " or ".join(self.TYPE_CHECKS[t].format(v=v) for t in types) or "False"
+            lines.append(f"{pad}if not ({check}):")
+            lines.append(f"{pad}    return False")
+            if len(types) == 1:
+                known_type = types[0]
+
+        if "enum" in schema:
+            lines.append(f"{pad}if not any(_equal({v}, e) for e in {self._constant(list(schema['enum']))}):")
+            lines.append(f"{pad}    return False")
+
+        if "const" in schema:
+            lines.append(f"{pad}if not _equal({v}, {self._constant(schema['const'])}):")
+            lines.append(f"{pad}    return False")
+
+        lines.extend(self._typed_block(schema, v, depth, known_type, "number", self._compile_number))
+        lines.extend(self._typed_block(schema, v, depth, known_type, "string", self._compile_string))
+        lines.extend(self._typed_block(schema, v, depth, known_type, "array", self._compile_array))
+        lines.extend(self._typed_block(schema, v, depth, known_type, "object", self._compile_object))
+
+        for subschema in schema.get("allOf", []):
+            lines.extend(self._compile_schema(subschema, v, depth))
+
+        if "anyOf" in schema:
+            calls = " or ".join(f"{self._compile_function(s)}({v})" for s in schema["anyOf"]) or "False"
+            lines.append(f"{pad}if not ({calls}):")
+            lines.append(f"{pad}    return False")
+
+        if "oneOf" in schema:
+            calls = ", ".join(f"{self._compile_function(s)}({v})" for s in schema["oneOf"])
+            lines.append(f"{pad}if sum(({calls},)) != 1:")
+            lines.append(f"{pad}    return False")
+
+        if "not" in schema:
+            lines.append(f"{pad}if {self._compile_function(schema['not'])}({v}):")
+            lines.append(f"{pad}    return False")
+
+        return lines
+
+
+    def _typed_block(self, schema:dict, v:str, depth:int, known_type:Optional[str], json_type:str, compiler:Callable) -> list[str]:
+        ''' Generate keywords that only apply to one JSON type, guarded by a type check
+            unless the type is already known
+        '''
+
+        if known_type == json_type or (json_type == "number" and known_type == "integer"):
+            return compiler(schema, v, depth)
+
+        if body:=compiler(schema, v, depth + 1):
+            return ["    " * depth + f"if {self.TYPE_CHECKS[json_type].format(v=v)}:", *body]
+
+        return []
+
+
+    def _compile_number(self, schema:dict, v:str, depth:int) -> list[str]:
+        pad = "    " * depth
+        lines = []
+        for keyword, operator in (("minimum", "<"), ("maximum", ">"), ("exclusiveMinimum", "<="), ("exclusiveMaximum", ">=")):
+            if keyword in schema:
+                lines.append(f"{pad}if {v} {operator} {self._constant(schema[keyword])}:")
+                lines.append(f"{pad}    return False")
+
+        return lines
+
+
+    def _compile_string(self, schema:dict, v:str, depth:int) -> list[str]:
+        pad = "    " * depth
+        lines = []
+        if self._string != "{v}" and any(k in schema for k in ("minLength", "maxLength", "pattern")):
+            string = self._name("s")
+            lines.append(f"{pad}{string} = {self._string.format(v=v)}")
+            v = string
+
+        if "minLength" in schema:
+            lines.append(f"{pad}if len({v}) < {int(schema['minLength'])}:")
+            lines.append(f"{pad}    return False")
+        if "maxLength" in schema:
+            lines.append(f"{pad}if len({v}) > {int(schema['maxLength'])}:")
+            lines.append(f"{pad}    return False")
+        if "pattern" in schema:
+            lines.append(f"{pad}if not {self._constant(re.compile(schema['pattern']))}.search({v}):")
+            lines.append(f"{pad}    return False")
+
+        return lines
+
+
+    def _compile_array(self, schema:dict, v:str, depth:int) -> list[str]:
+        pad = "    " * depth
+        lines = []
+        if "minItems" in schema:
+            lines.append(f"{pad}if len({v}) < {int(schema['minItems'])}:")
+            lines.append(f"{pad}    return False")
+        if "maxItems" in schema:
+            lines.append(f"{pad}if len({v}) > {int(schema['maxItems'])}:")
+            lines.append(f"{pad}    return False")
+        if "items" in schema and schema["items"] is not True:
+            item = self._name("v")
+            if body:=self._compile_schema(schema["items"], item, depth + 1):
+                lines.append(f"{pad}for {item} in {v}:")
+                lines.extend(body)
+
+        return lines
+
+
+    def _compile_object(self, schema:dict, v:str, depth:int) -> list[str]:
+        pad = "    " * depth
+        lines = []
+        if "minProperties" in schema:
+            lines.append(f"{pad}if len({v}) < {int(schema['minProperties'])}:")
+            lines.append(f"{pad}    return False")
+        if "maxProperties" in schema:
+            lines.append(f"{pad}if len({v}) > {int(schema['maxProperties'])}:")
+            lines.append(f"{pad}    return False")
+
+        for field in schema.get("required", []):
+            lines.append(f"{pad}if {field!r} not in {v}:")
+            lines.append(f"{pad}    return False")
+
+        properties = schema.get("properties", {})
+        for field, subschema in properties.items():
+            value = self._name("v")
+            if body:=self._compile_schema(subschema, value, depth + 1):
+                lines.append(f"{pad}if {field!r} in {v}:")
+                lines.append(f"{pad}    {value} = {v}[{field!r}]")
+                lines.extend(body)
+
+        additional = schema.get("additionalProperties", True)
+        if additional is not True:
+            known_fields = self._constant(frozenset(properties))
+            if additional is False:
+                lines.append(f"{pad}if not {known_fields}.issuperset({v}):")
+                lines.append(f"{pad}    return False")
+            else:
+                key, value = self._name("k"), self._name("v")
+                if body:=self._compile_schema(additional, value, depth + 2):
+                    lines.append(f"{pad}for {key}, {value} in {v}.items():")
+                    lines.append(f"{pad}    if {key} not in {known_fields}:")
+                    lines.extend(body)
+
+        return lines
+
+
+def _json_equal(one:Any, two:Any) -> bool:
+    ''' Compare two values the way JSONSchema does (e.g. True != 1) '''
+
+    if isinstance(one, bool) or isinstance(two, bool):
+        return isinstance(one, bool) and isinstance(two, bool) and one == two
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(_json_equal(one[k], two[k]) for k in one)
+    if isinstance(one, (list, tuple)) and isinstance(two, (list, tuple)):
+        return len(one) == len(two) and all(_json_equal(a, b) for a, b in zip(one, two))
+
+    return one == two
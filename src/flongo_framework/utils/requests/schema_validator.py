@@ -1,29 +1,160 @@
-from jsonschema import ValidationError, validate
+from typing import Any, Optional
+from jsonschema import SchemaError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import extend, validator_for
+from referencing import Registry, Resource
+from referencing.exceptions import NoSuchResource
+from referencing.jsonschema import DRAFT202012
 
 from ...api.errors.schema_validation_error import SchemaValidationError
+from .schema_compiler import JSON_Schema_Compiler
+from ..json.json_encoder import JSON_Encoder
+
+# Schemas with an `$id` that can be referenced with `$ref` from any route
+_SHARED_SCHEMAS:dict[str, Resource] = {}
+
+def _retrieve_shared_schema(uri:str) -> Resource:
+    if resource:=_SHARED_SCHEMAS.get(uri):
+        return resource
+
+    raise NoSuchResource(ref=uri)
+
+
+# Response payloads are validated before they are encoded, so Python types the
+# JSON_Encoder serializes as strings or arrays are validated as those JSON types
+RESPONSE_STRING_TYPES = (str, *JSON_Encoder.STRING_TYPES)
+RESPONSE_ARRAY_TYPES = (list, tuple)
+
+def _to_json_string(instance:Any) -> Any:
+    return instance if isinstance(instance, str) else JSON_Encoder.encode_type(instance)
+
+
+def _with_json_string(keyword_validator):
+    ''' Wrap a string keyword so it checks values the way they will be encoded '''
+
+    def validate(validator, value, instance, schema):
+        if isinstance(instance, RESPONSE_STRING_TYPES):
+            instance = _to_json_string(instance)
+
+        return keyword_validator(validator, value, instance, schema)
+
+    return validate
+
 
 class JSON_Schema_Validator:
     ''' Base class for validating a JSONSchema against
         a passed request payload
+
+        The schema is checked against its meta-schema and compiled
+        into a validator once when this class is created, so an
+        instance should be created at boot and re-used per request
     '''
 
-    def __init__(self, json_schema:dict[str, dict], url:str='', method:str='', is_response_schema:bool=False) -> None:
+    # Registry shared by all validators to resolve `$ref`s across routes
+    REGISTRY = Registry(retrieve=_retrieve_shared_schema) # type: ignore
+    # Validator classes extended for response payloads by base validator class
+    _RESPONSE_VALIDATOR_CLASSES:dict[type, type] = {}
+
+    def __init__(self, json_schema:dict[str, Any], url:str='', method:str='', is_response_schema:bool=False) -> None:
         self.url = url
         self.method = method
         self.json_schema = json_schema
         self.is_response_schema = is_response_schema
 
+        self.validator = self._compile(json_schema)
+
+
+    @classmethod
+    def register_schema(cls, json_schema:dict[str, Any]):
+        ''' Share a schema with an `$id` so it can be referenced by other schemas '''
+
+        if isinstance(json_schema, dict) and (schema_id:=json_schema.get("$id")):
+            _SHARED_SCHEMAS[schema_id.rstrip("#")] = Resource.from_contents(json_schema, default_specification=DRAFT202012)
 
-    def validate_request(self, payload:dict):
-        ''' Validate a request payload against the provided schema '''
 
+    def _compile(self, json_schema:dict[str, Any]):
+        ''' Check the schema once and create a re-usable validator for it '''
+
+        validator_class = validator_for(json_schema)
         try:
-            validate(payload, self.json_schema)
-        except ValidationError as e:
-            raise SchemaValidationError(
-                self.url,
-                self.method,
-                e.message,
-                self.json_schema,
-                is_response_schema=self.is_response_schema
-            )
+            validator_class.check_schema(json_schema)
+        except SchemaError as e:
+            raise ValueError(f"Schema: [{self.method}] schema for URL [{self.url}] is invalid: {e.message}")
+
+        if self.is_response_schema:
+            validator_class = self._get_response_validator_class(validator_class)
+
+        return validator_class(json_schema, registry=self.REGISTRY)
+
+
+    @classmethod
+    def _get_response_validator_class(cls, validator_class:type) -> type:
+        ''' Extend a validator class to accept un-encoded response payloads '''
+
+        if not (response_validator_class:=cls._RESPONSE_VALIDATOR_CLASSES.get(validator_class)):
+            type_checker = validator_class.TYPE_CHECKER.redefine_many({
+                "string": lambda checker, instance: isinstance(instance, RESPONSE_STRING_TYPES),
+                "array": lambda checker, instance: isinstance(instance, RESPONSE_ARRAY_TYPES),
+            })
+            string_keywords = {
+                keyword: _with_json_string(validator_class.VALIDATORS[keyword])
+                for keyword in ("minLength", "maxLength", "pattern", "format")
+                if keyword in validator_class.VALIDATORS
+            }
+
+            response_validator_class = extend(validator_class, validators=string_keywords, type_checker=type_checker)
+            cls._RESPONSE_VALIDATOR_CLASSES[validator_class] = response_validator_class
+
+        return response_validator_class
+
+
+    def validate_request(self, payload:Any, url:Optional[str]=None, is_response_schema:Optional[bool]=None):
+        ''' Validate a request payload against the provided schema '''
+
+        if self.validator.is_valid(payload):
+            return
+
+        error = best_match(self.validator.iter_errors(payload))
+        raise SchemaValidationError(
+            self.url if url is None else url,
+            self.method,
+            error.message if error else "Payload is invalid",
+            self.json_schema,
+            is_response_schema=self.is_response_schema if is_response_schema is None else is_response_schema
+        )
+
+
+class Compiled_JSON_Schema_Validator(JSON_Schema_Validator):
+    ''' JSON_Schema_Validator that also compiles the schema into a specialized
+        Python function with the JSON_Schema_Compiler
+
+        Valid payloads only run the compiled function. Invalid payloads, and
+        schemas with keywords the compiler doesn't support, are validated by
+        `jsonschema` so the resulting errors are identical
+    '''
+
+    def __init__(self, json_schema:dict[str, Any], url:str='', method:str='', is_response_schema:bool=False) -> None:
+        super().__init__(json_schema, url, method, is_response_schema)
+
+        if is_response_schema:
+            compiler = JSON_Schema_Compiler(json_schema, RESPONSE_STRING_TYPES, RESPONSE_ARRAY_TYPES, _to_json_string)
+        else:
+            compiler = JSON_Schema_Compiler(json_schema)
+
+        self.compiled_validator = compiler.compile()
+
+
+    @property
+    def is_compiled(self) -> bool:
+        ''' Returns True if the schema could be compiled '''
+
+        return self.compiled_validator is not None
+
+
+    def validate_request(self, payload:Any, url:Optional[str]=None, is_response_schema:Optional[bool]=None):
+        ''' Validate a request payload against the provided schema '''
+
+        if self.compiled_validator and self.compiled_validator(payload):
+            return
+
+        super().validate_request(payload, url, is_response_schema)
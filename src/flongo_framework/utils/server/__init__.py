@@ -0,0 +1 @@
+from .app_server import App_Server
\ No newline at end of file
@@ -0,0 +1,12 @@
+import argparse
+
+from .app_server import App_Server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an Application with Gunicorn using the worker settings from the environment")
+    parser.add_argument("application", help="Import path of the Application, like `demo.demo:get_app`")
+    App_Server.from_import_path(parser.parse_args().application).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+
+from ...config.enums import SERVER_WORKER_CLASSES
+from ...config.settings.flask_settings import Flask_Settings
+from ...database.mongodb.connection_manager import MongoDB_Connection_Manager
+from ..asynchronous import App_Event_Loop
+from ..logging.loggers.app import ApplicationLogger
+
+if TYPE_CHECKING:
+    from ...application import Application
+
+
+class App_Server(BaseApplication):
+    ''' Serves an Application with Gunicorn using the worker model and
+        limits from its Flask_Settings instead of command line flags
+
+        - sync: One request at a time per worker
+        - gthread: `threads` requests at a time per worker
+        - gevent: Up to `worker_connections` requests per worker on greenlets (needs `gevent`)
+        - asgi: The `asgi_app` of the application on Uvicorn workers (needs `uvicorn`)
+
+        Each worker drops the MongoDB clients and event loop it inherited
+        from the Gunicorn master and creates its own client when it starts.
+        Clients are closed when the worker exits (like after `max_requests`)
+        ```
+        App_Server(lambda: application, application.settings.flask).run()
+        ```
+    '''
+
+    # Gunicorn worker class for each worker model
+    WORKER_CLASSES = {
+        SERVER_WORKER_CLASSES.SYNC: 'sync',
+        SERVER_WORKER_CLASSES.GTHREAD: 'gthread',
+        SERVER_WORKER_CLASSES.GEVENT: 'gevent',
+        SERVER_WORKER_CLASSES.ASGI: 'uvicorn.workers.UvicornWorker'
+    }
+
+    # Packages the worker models need besides Gunicorn
+    WORKER_PACKAGES = {
+        SERVER_WORKER_CLASSES.GEVENT: 'gevent',
+        SERVER_WORKER_CLASSES.ASGI: 'uvicorn'
+    }
+
+    def __init__(self, get_application:Callable[[], "Application"], settings:Optional[Flask_Settings]=None) -> None:
+        self.get_application = get_application
+        self.settings = settings or Flask_Settings()
+        self.application:Optional["Application"] = None
+
+        worker_class = self.settings.worker_class or SERVER_WORKER_CLASSES.SYNC
+        if worker_class not in SERVER_WORKER_CLASSES:
+            raise ValueError(f"App_Server: [{worker_class}] is not a valid worker class. Use one of {SERVER_WORKER_CLASSES.ALL}")
+        if (package:=self.WORKER_PACKAGES.get(worker_class)) and not importlib.util.find_spec(package):
+            raise ImportError(f"App_Server: The [{worker_class}] worker class requires the `{package}` package")
+
+        self.worker_class = worker_class
+        super().__init__()
+
+
+    @classmethod
+    def from_import_path(cls, import_path:str) -> "App_Server":
+        ''' Create a server for the Application at an import path like `module:name`.
+            The name can be the Application, the Flask app it created or a function
+            that returns either (like the `get_app()` binding of an app for Gunicorn)
+
+            Unless `preload_app` is set in the environment, the Application is
+            imported by each worker and the server is configured from the environment
+        '''
+
+        def get_application() -> "Application":
+            module_name, _, name = import_path.partition(':')
+            target:Any = getattr(importlib.import_module(module_name), name or 'app')
+            if callable(target) and not isinstance(target, Flask):
+                target = target()
+
+            return target.extensions['flongo_framework'] if isinstance(target, Flask) else target
+
+        settings = Flask_Settings()
+        if settings.preload_app:
+            application = get_application()
+            return cls(lambda: application, application.settings.flask)
+
+        return cls(get_application, settings)
+
+
+    def load_config(self):
+        assert self.cfg
+        options = {
+            'bind': f"{self.settings.host}:{self.settings.port}",
+            'worker_class': self.WORKER_CLASSES[self.worker_class],
+            'workers': self.settings.workers,
+            'threads': self.settings.threads,
+            'worker_connections': self.settings.worker_connections,
+            'timeout': self.settings.worker_timeout,
+            'keepalive': self.settings.keep_alive,
+            'backlog': self.settings.backlog,
+            'max_requests': self.settings.max_requests,
+            'max_requests_jitter': self.settings.max_requests_jitter,
+            'preload_app': self.settings.preload_app,
+            'post_fork': self.post_fork,
+            'post_worker_init': self.post_worker_init,
+            'worker_exit': self.worker_exit
+        }
+
+        for name, value in options.items():
+            if value is not None:
+                self.cfg.set(name, value)
+
+
+    def load(self) -> Any:
+        ''' Get the WSGI or ASGI app of the Application that workers serve '''
+
+        if not self.application:
+            self.application = self.get_application()
+
+        return self.application.asgi_app if self.worker_class == SERVER_WORKER_CLASSES.ASGI else self.application.app
+
+
+    def post_fork(self, server:Any, worker:Any):
+        ''' Drop the MongoDB clients and event loop inherited from the master '''
+
+        MongoDB_Connection_Manager.reset()
+        App_Event_Loop.reset()
+
+
+    def post_worker_init(self, worker:Any):
+        ''' Create the MongoDB client of the worker before it handles requests '''
+
+        if self.application:
+            MongoDB_Connection_Manager.get_client(self.application.settings.mongodb)
+
+        if self.settings.log_boot_events:
+            ApplicationLogger.critical(f"[Started [{self.worker_class}] worker [{worker.pid}]]")
+
+
+    def worker_exit(self, server:Any, worker:Any):
+        ''' Close the MongoDB clients of the worker '''
+
+        MongoDB_Connection_Manager.reset(close=True)